@@ -90,6 +90,7 @@ TEMPLATES = [
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
+                "product.context_processors.catalog_categories",
             ],
         },
     },
@@ -106,6 +107,34 @@ DATABASES = {
     }
 }
 
+# ─────────────────────────────────────────────────────────
+#  Caché
+# ─────────────────────────────────────────────────────────
+# LocMemCache alcanza en desarrollo. Con varios procesos (gunicorn) usá una
+# caché compartida (Redis / Memcached) para que la invalidación por versión
+# (`core/cache.py`) llegue a todos los workers.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "tienda-historias",
+    }
+}
+
+# ─────────────────────────────────────────────────────────
+#  Tareas diferidas (outbox, `core/outbox.py`)
+# ─────────────────────────────────────────────────────────
+# Con True las tareas (p. ej. sincronizar `Client`) quedan en la tabla
+# `core_outboxjob` y las ejecuta el worker, un proceso aparte:
+#     python manage.py run_outbox_worker            (servicio: systemd, supervisor…)
+#     python manage.py run_outbox_worker --once     (o desde cron)
+# Con False se ejecutan al confirmar la transacción, en el mismo proceso:
+# cómodo en desarrollo, donde nadie levanta el worker.
+OUTBOX_ASYNC: bool = not DEBUG
+OUTBOX_MAX_ATTEMPTS: int = 5
+OUTBOX_BACKOFF: int = 10  # s; se duplica en cada reintento
+OUTBOX_BACKOFF_MAX: int = 3600  # s
+OUTBOX_LEASE: int = 300  # s; una tarea tomada vuelve a la cola si el worker muere
+
 # ─────────────────────────────────────────────────────────
 #  Validadores de contraseña
 # ─────────────────────────────────────────────────────────
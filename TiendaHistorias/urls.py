@@ -14,7 +14,8 @@ Enruta las URL principales del proyecto:
 Notas
 ─────
 - Mantenemos `django.contrib.auth.urls` para aprovechar vistas predeterminadas
-  (password_reset, logout, etc.).
+  (password_reset, logout, etc.); `password_reset` usa un formulario que
+  busca el correo por índice (`core.forms.EmailPasswordResetForm`).
 - En producción (`DEBUG = False`) delegá la entrega de archivos estáticos
   al servidor (Nginx, Apache) o un CDN.
 """
@@ -22,8 +23,10 @@ Notas
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
+from django.contrib.auth import views as auth_views
 from django.urls import include, path
 
+from core.forms import EmailPasswordResetForm
 from core.views import profile_redirect
 
 urlpatterns = [
@@ -37,6 +40,11 @@ urlpatterns = [
     path("blog/", include("blog.urls")),
 
     # Auth por defecto de Django (password_reset, etc.)
+    path(
+        "accounts/password_reset/",
+        auth_views.PasswordResetView.as_view(form_class=EmailPasswordResetForm),
+        name="password_reset",
+    ),
     path("accounts/", include("django.contrib.auth.urls")),
 
     # Redirección del perfil por defecto → perfil custom
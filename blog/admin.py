@@ -1,5 +1,28 @@
+"""
+blog/admin.py
+─────────────
+Administración del blog con `FastChangeListAdmin` (conteo estimado y
+búsqueda por prefijo sobre `name_norm` / `title_norm` / `author_norm`,
+indexadas) y la categoría precargada en el listado.
+"""
+
 from django.contrib import admin
-from .models import Post, Category
 
-admin.site.register(Category)
-admin.site.register(Post)
+from core.admin import FastChangeListAdmin
+
+from .models import Category, Post
+
+
+@admin.register(Category)
+class CategoryAdmin(FastChangeListAdmin):
+    list_display = ("name",)
+    search_fields = ("name_norm",)
+
+
+@admin.register(Post)
+class PostAdmin(FastChangeListAdmin):
+    list_display = ("title", "author", "category", "created")
+    list_select_related = ("category",)
+    ordering = ("-pk",)
+    search_fields = ("title_norm", "author_norm")
+    autocomplete_fields = ("category",)
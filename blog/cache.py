@@ -0,0 +1,19 @@
+"""
+blog/cache.py
+─────────────
+Etiqueta de caché del blog.
+
+Toda entrada derivada de las publicaciones (los feeds de `blog/feeds.py`)
+incluye en su clave la versión de `BLOG_TAG`; las señales de
+`blog/signals.py` llaman a `invalidate_blog()` ante cualquier cambio de
+`Post` o `Category`.
+"""
+
+from core.cache import bump_version
+
+BLOG_TAG = "blog:posts"
+
+
+def invalidate_blog() -> None:
+    """Marca como obsoletas todas las entradas dependientes del blog."""
+    bump_version(BLOG_TAG)
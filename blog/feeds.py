@@ -0,0 +1,110 @@
+"""
+blog/feeds.py
+─────────────
+Feeds RSS y Atom de las últimas publicaciones del blog.
+
+- `/blog/feed/`               : últimas publicaciones (RSS 2.0).
+- `/blog/feed/atom/`          : ídem en Atom 1.0.
+- `/blog/feed/<categoría>/`   : últimas publicaciones de una categoría.
+
+Se sirven desde caché (`core.feeds.CachedFeed`) hasta el próximo cambio
+del blog. Regenerarlos cuesta una sola consulta: los posts con su
+categoría (`select_related`) por el índice `-created` (o
+`category, -created`), sin leer `content`; la descripción de cada ítem
+es el resumen guardado (`Post.excerpt`).
+"""
+
+from typing import List, Optional, Tuple
+
+from django.http import Http404
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+
+from core.feeds import CachedFeed
+
+from .cache import BLOG_TAG
+from .models import Category, Post
+
+FEED_ITEMS = 20
+
+FeedObject = Tuple[Optional[Category], List[Post]]
+
+
+class LatestPostsFeed(CachedFeed):
+    """Últimas `FEED_ITEMS` publicaciones, opcionalmente de una categoría."""
+
+    cache_version_tags = (BLOG_TAG,)
+    description = "Novedades, reseñas y recomendaciones de la Tienda de Historias."
+
+    def get_object(self, request, category_id: Optional[int] = None) -> FeedObject:
+        """
+        Lee los posts del feed (una consulta) y, si se pidió, su categoría.
+
+        La categoría sale del primer post; solo si no tiene publicaciones
+        se consulta aparte para distinguir «vacía» de «inexistente» (404).
+        """
+        posts = (
+            Post.objects.select_related("category")
+            .defer("content")
+            .order_by("-created", "-id")
+        )
+        if category_id is None:
+            return None, list(posts[:FEED_ITEMS])
+        posts = list(posts.filter(category_id=category_id)[:FEED_ITEMS])
+        if posts:
+            return posts[0].category, posts
+        category = Category.objects.filter(pk=category_id).first()
+        if category is None:
+            raise Http404("Categoría inexistente.")
+        return category, []
+
+    # Canal ----------------------------------------------------
+    def title(self, obj: FeedObject) -> str:
+        category, _ = obj
+        if category is None:
+            return "Tienda de Historias · Blog"
+        return f"Tienda de Historias · Blog · {category.name}"
+
+    def link(self, obj: FeedObject) -> str:
+        return reverse("blog:post_list")
+
+    def feed_url(self, obj: FeedObject) -> str:
+        category, _ = obj
+        if category is None:
+            return reverse("blog:post_feed")
+        return reverse("blog:post_category_feed", args=[category.pk])
+
+    # Ítems ----------------------------------------------------
+    def items(self, obj: FeedObject) -> List[Post]:
+        return obj[1]
+
+    def item_title(self, item: Post) -> str:
+        return item.title
+
+    def item_description(self, item: Post) -> str:
+        return item.excerpt
+
+    def item_link(self, item: Post) -> str:
+        return reverse("blog:post_detail", args=[item.pk])
+
+    def item_author_name(self, item: Post) -> str:
+        return item.author
+
+    def item_pubdate(self, item: Post):
+        return item.created
+
+    def item_updateddate(self, item: Post):
+        return item.updated_at
+
+    def item_categories(self, item: Post) -> List[str]:
+        return [item.category.name] if item.category else []
+
+
+class LatestPostsAtomFeed(LatestPostsFeed):
+    """Las mismas publicaciones en formato Atom 1.0."""
+
+    feed_type = Atom1Feed
+    subtitle = LatestPostsFeed.description
+
+    def feed_url(self, obj: FeedObject) -> str:
+        return reverse("blog:post_atom_feed")
@@ -0,0 +1,27 @@
+"""
+blog/management/commands/rebuild_post_index.py
+──────────────────────────────────────────────
+Reconstruye desde cero el índice FTS5 de las publicaciones.
+
+Uso:
+    python manage.py rebuild_post_index
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from blog import search
+
+
+class Command(BaseCommand):
+    help = "Reconstruye el índice de búsqueda de texto completo del blog."
+
+    def handle(self, *args, **options):
+        if not search.search_available():
+            raise CommandError(
+                "El índice FTS5 solo está disponible con SQLite; "
+                "en este motor la búsqueda del blog usa icontains."
+            )
+        with transaction.atomic():
+            total = search.rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"Índice reconstruido: {total} publicaciones."))
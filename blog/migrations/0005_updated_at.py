@@ -0,0 +1,26 @@
+# Generated by Django 5.2.2 on 2026-10-18 13:50
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill(apps, schema_editor):
+    """Las filas existentes toman como última modificación su fecha de alta."""
+    Post = apps.get_model("blog", "Post")
+    Post.objects.update(updated_at=F("created"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_post_author'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
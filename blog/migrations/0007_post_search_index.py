@@ -0,0 +1,42 @@
+"""
+Crea la tabla virtual FTS5 `blog_post_fts` y la puebla con las
+publicaciones existentes, con las mismas filas que arma `blog/search.py`
+(contenido como texto plano), por tandas. Solo aplica en SQLite; en
+otros motores no hace nada.
+"""
+
+from django.db import migrations
+
+from blog.search import insert_rows
+
+FTS_TABLE = "blog_post_fts"
+
+
+def create_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+        "USING fts5(title, content, category, "
+        "tokenize = 'unicode61 remove_diacritics 2')"
+    )
+    Post = apps.get_model("blog", "Post")
+    with schema_editor.connection.cursor() as cursor:
+        insert_rows(cursor, Post.objects.all())
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_list_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.2 on 2026-10-18 14:34
+
+from django.db import migrations, models
+
+from core.text import excerpt, plain_text, reading_minutes
+
+
+def backfill(apps, schema_editor):
+    """Calcula el resumen de los posts existentes."""
+    Post = apps.get_model("blog", "Post")
+    posts = []
+    for post in Post.objects.only("id", "content").iterator(chunk_size=2000):
+        text = plain_text(post.content)
+        post.excerpt = excerpt(text, 25, 300)
+        post.reading_time = reading_minutes(text)
+        posts.append(post)
+        if len(posts) >= 2000:
+            Post.objects.bulk_update(posts, ["excerpt", "reading_time"])
+            posts = []
+    Post.objects.bulk_update(posts, ["excerpt", "reading_time"])
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0007_post_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.CharField(default='', editable=False, max_length=300),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='reading_time',
+            field=models.PositiveSmallIntegerField(default=1, editable=False),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.2 on 2026-10-18 15:28
+
+from django.db import migrations, models
+
+from core.text import normalize_text
+
+
+def backfill(apps, schema_editor):
+    """Completa las columnas normalizadas de las filas existentes."""
+    Category = apps.get_model("blog", "Category")
+    Post = apps.get_model("blog", "Post")
+    categories = list(Category.objects.only("id", "name"))
+    for category in categories:
+        category.name_norm = normalize_text(category.name)[:40]
+    Category.objects.bulk_update(categories, ["name_norm"], batch_size=500)
+
+    posts = []
+    for post in Post.objects.only("id", "title", "author").iterator(chunk_size=2000):
+        post.title_norm = normalize_text(post.title)[:120]
+        post.author_norm = normalize_text(post.author)[:100]
+        posts.append(post)
+        if len(posts) >= 2000:
+            Post.objects.bulk_update(posts, ["title_norm", "author_norm"])
+            posts = []
+    Post.objects.bulk_update(posts, ["title_norm", "author_norm"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_post_summary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='name_norm',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=40),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='author_norm',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='title_norm',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=120),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -8,12 +8,21 @@ Incluye:
 
 from django.db import models
 
+from core.models import NormalizedFieldsMixin
+from core.text import excerpt, plain_text, reading_minutes
 
-class Category(models.Model):
+
+class Category(NormalizedFieldsMixin, models.Model):
     """
     Modelo que representa una categoría para clasificar publicaciones del blog.
+
+    `name_norm` es `name` sin tildes y en minúsculas (auto, indexado): la
+    usa la búsqueda por prefijo del admin.
   """
     name = models.CharField(max_length=40, unique=True)
+    name_norm = models.CharField(max_length=40, editable=False, db_index=True, default="")
+
+    normalized_fields = {"name_norm": "name"}
 
     class Meta:
         ordering = ["name"]
@@ -25,7 +34,7 @@ class Category(models.Model):
         return self.name
 
 
-class Post(models.Model):
+class Post(NormalizedFieldsMixin, models.Model):
     """
     Modelo que representa una publicación del blog.
 
@@ -36,7 +45,16 @@ class Post(models.Model):
         image (ImageField): Imagen opcional relacionada con el post.
         category (ForeignKey): Relación con una categoría (puede ser nula).
         created (DateTimeField): Fecha y hora de creación (se asigna automáticamente).
+        updated_at (DateTimeField): Última modificación (automática).
+        excerpt (CharField): Comienzo del contenido en texto plano, para el
+            listado (auto).
+        reading_time (PositiveSmallInteger): Minutos estimados de lectura (auto).
+        title_norm / author_norm (CharField): Título y autor normalizados
+            (auto, indexados; búsqueda por prefijo del admin).
     """
+
+    EXCERPT_WORDS = 25
+
     title   = models.CharField(max_length=120)
     author = models.CharField(max_length=100, blank=True)
     content = models.TextField()
@@ -45,14 +63,40 @@ class Post(models.Model):
         Category,
         on_delete=models.SET_NULL,
         null=True,
-        related_name="posts"
+        related_name="posts",
+        db_index=False,  # lo cubre `post_category_created_idx`
     )
     created = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    excerpt = models.CharField(max_length=300, editable=False, default="")
+    reading_time = models.PositiveSmallIntegerField(editable=False, default=1)
+    title_norm = models.CharField(max_length=120, editable=False, db_index=True, default="")
+    author_norm = models.CharField(max_length=100, editable=False, db_index=True, default="")
+
+    normalized_fields = {"title_norm": "title", "author_norm": "author"}
 
     class Meta:
         ordering = ["-created"]
+        # `-created` más la PK que agrega el cursor de PostListView
+        indexes = [
+            models.Index(fields=["-created", "-id"], name="post_created_idx"),
+            models.Index(fields=["category", "-created", "-id"], name="post_category_created_idx"),
+        ]
 
     def __str__(self):
         """Devuelve el título del post como representación del objeto."""
         return self.title
 
+    def refresh_summary(self) -> None:
+        """Recalcula `excerpt` y `reading_time` a partir de `content`."""
+        text = plain_text(self.content)
+        self.excerpt = excerpt(text, self.EXCERPT_WORDS, self._meta.get_field("excerpt").max_length)
+        self.reading_time = reading_minutes(text)
+
+    def save(self, *args, **kwargs):
+        """Con `update_fields` que incluye `content`, guarda también el resumen."""
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "content" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "excerpt", "reading_time"}
+        super().save(*args, **kwargs)
+
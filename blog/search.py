@@ -0,0 +1,201 @@
+"""
+blog/search.py
+──────────────
+Búsqueda de texto completo de publicaciones sobre SQLite FTS5.
+
+La tabla virtual `blog_post_fts` replica, por cada `Post`
+(`rowid = post.id`), su título, el contenido como texto plano (sin
+etiquetas HTML) y el nombre de su categoría. Mismo tokenizador que el
+catálogo (`unicode61 remove_diacritics 2`): ignora mayúsculas y tildes.
+
+Incluye:
+- filter_posts_fts : filtra y ordena un queryset por relevancia (BM25).
+- post_snippets    : fragmentos del contenido con las coincidencias
+                     resaltadas en `<mark>`, para una página de resultados.
+- index_posts      : (re)indexa publicaciones puntuales.
+- unindex_posts    : quita publicaciones del índice.
+- reindex_category : refresca el nombre de categoría de sus publicaciones.
+- rebuild_index    : reconstruye el índice completo.
+- insert_rows      : inserta por lotes las filas de un queryset (también
+                     lo usa la migración que crea el índice).
+
+Notas
+─────
+- La sincronización la hacen las señales de `blog/signals.py`; las
+  operaciones masivas deben llamar a `index_posts` o al comando
+  `rebuild_post_index`.
+- En motores distintos de SQLite (`search_available() == False`) la vista
+  vuelve a la búsqueda por `icontains` y no muestra fragmentos.
+"""
+
+from itertools import islice
+from typing import Dict, Iterable, List
+
+from django.db import connection
+from django.db.models import QuerySet
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+from django.utils.safestring import SafeString, mark_safe
+
+from core.fts import build_match_query, search_available
+from core.text import plain_text
+
+from .models import Post
+
+FTS_TABLE = "blog_post_fts"
+
+CREATE_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+    "USING fts5(title, content, category, "
+    "tokenize = 'unicode61 remove_diacritics 2')"
+)
+DROP_SQL = f"DROP TABLE IF EXISTS {FTS_TABLE}"
+
+# Columna 1 (content); separadores de control que no aparecen en el texto:
+# se reemplazan por `<mark>` recién después de escapar el fragmento.
+SNIPPET_TOKENS = 24
+_MARK_OPEN, _MARK_CLOSE = "\x02", "\x03"
+
+# SQLite admite hasta 999 parámetros en versiones antiguas
+_CHUNK = 500
+
+
+def _chunks(ids: Iterable[int]) -> Iterable[List[int]]:
+    ids = list(ids)
+    for start in range(0, len(ids), _CHUNK):
+        yield ids[start:start + _CHUNK]
+
+
+def _rows(posts: "QuerySet[Post]") -> Iterable[tuple]:
+    """Filas a indexar: `(id, título, texto plano, categoría)`."""
+    for pk, title, content, category in posts.values_list(
+        "pk", "title", "content", "category__name"
+    ).iterator(chunk_size=_CHUNK):
+        yield pk, title, plain_text(content), category or ""
+
+
+def insert_rows(cursor, posts: "QuerySet[Post]") -> None:
+    """
+    Inserta en el índice las filas de `posts`, leídas por tandas
+    (`iterator`) y escritas en lotes de `_CHUNK` (`executemany`).
+    """
+    rows = _rows(posts)
+    while batch := list(islice(rows, _CHUNK)):
+        cursor.executemany(
+            f"INSERT INTO {FTS_TABLE}(rowid, title, content, category) "
+            "VALUES (%s, %s, %s, %s)",
+            batch,
+        )
+
+
+# ------------------------------------------------------------------
+# Consulta
+# ------------------------------------------------------------------
+def filter_posts_fts(qs: "QuerySet[Post]", query: str) -> "QuerySet[Post]":
+    """
+    Restringe `qs` a las publicaciones que coinciden con `query`.
+
+    Anota `search_rank` (BM25: más negativo = más relevante; el título
+    pesa más que la categoría y ésta más que el contenido) y ordena por
+    relevancia, con las más nuevas primero como desempate.
+    """
+    match = build_match_query(query)
+    if not match:
+        return qs.none()
+    table = qs.model._meta.db_table
+    return (
+        qs.filter(
+            pk__in=RawSQL(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+                [match],
+            )
+        )
+        .annotate(
+            search_rank=RawSQL(
+                f"SELECT bm25({FTS_TABLE}, 10.0, 1.0, 5.0) FROM {FTS_TABLE} "
+                f'WHERE {FTS_TABLE} MATCH %s AND rowid = "{table}"."id"',
+                [match],
+            )
+        )
+        .order_by("search_rank", "-created", "-id")
+    )
+
+
+def post_snippets(ids: Iterable[int], query: str) -> Dict[int, SafeString]:
+    """
+    Fragmento del contenido de cada post con las coincidencias en `<mark>`.
+
+    Una sola consulta para la página ya paginada (no para todos los
+    resultados). El texto se escapa antes de insertar las marcas.
+    """
+    ids = list(ids)
+    match = build_match_query(query)
+    if not (ids and match and search_available()):
+        return {}
+    marks = ", ".join(["%s"] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid, snippet({FTS_TABLE}, 1, %s, %s, '…', %s) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND rowid IN ({marks})",
+            [_MARK_OPEN, _MARK_CLOSE, SNIPPET_TOKENS, match, *ids],
+        )
+        rows = cursor.fetchall()
+    return {
+        pk: mark_safe(
+            escape(text).replace(_MARK_OPEN, "<mark>").replace(_MARK_CLOSE, "</mark>")
+        )
+        for pk, text in rows
+    }
+
+
+# ------------------------------------------------------------------
+# Mantenimiento del índice
+# ------------------------------------------------------------------
+def index_posts(ids: Iterable[int]) -> None:
+    """Inserta o reemplaza en el índice las publicaciones indicadas."""
+    if not search_available():
+        return
+    with connection.cursor() as cursor:
+        for chunk in _chunks(ids):
+            marks = ", ".join(["%s"] * len(chunk))
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({marks})", chunk)
+            insert_rows(cursor, Post.objects.filter(pk__in=chunk))
+
+
+def unindex_posts(ids: Iterable[int]) -> None:
+    """Elimina del índice las publicaciones indicadas."""
+    if not search_available():
+        return
+    with connection.cursor() as cursor:
+        for chunk in _chunks(ids):
+            marks = ", ".join(["%s"] * len(chunk))
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({marks})", chunk)
+
+
+def reindex_category(category_id: int, name: str = "") -> None:
+    """
+    Actualiza el nombre de categoría de todas sus publicaciones en un UPDATE.
+
+    Se usa al renombrar una categoría y antes de borrarla (`name` = "").
+    """
+    if not search_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {FTS_TABLE} SET category = %s WHERE rowid IN "
+            f"(SELECT id FROM {Post._meta.db_table} WHERE category_id = %s)",
+            [name, category_id],
+        )
+
+
+def rebuild_index() -> int:
+    """Vacía y vuelve a poblar el índice; devuelve la cantidad de filas."""
+    if not search_available():
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(CREATE_SQL)
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        insert_rows(cursor, Post.objects.all())
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+        cursor.execute(f"SELECT COUNT(*) FROM {FTS_TABLE}")
+        return cursor.fetchone()[0]
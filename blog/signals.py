@@ -0,0 +1,110 @@
+"""
+blog/signals.py
+───────────────
+Señales de la app Blog.
+
+• Completan el resumen de cada post (`excerpt`, `reading_time`) antes de
+  guardarlo, también en cargas de fixtures.
+• Mantienen sincronizado el índice de búsqueda FTS5 (`blog/search.py`)
+  ante altas, ediciones y bajas de `Post` y de `Category`.
+• Invalidan la caché del blog (`blog/cache.py`), de la que dependen los
+  feeds.
+• Encolan la generación de variantes de la imagen de cada post y borran
+  las de imágenes reemplazadas o eliminadas (`core/renditions.py`).
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from core.renditions import discard_renditions, schedule_renditions
+from . import search
+from .cache import invalidate_blog
+from .models import Category, Post
+
+
+# ── resumen del listado ──────────────────────────────────────────────────────
+@receiver(pre_save, sender=Post)
+def fill_post_summary(sender, instance, **kwargs):
+    """Deriva `excerpt` y `reading_time` del contenido que se va a guardar."""
+    instance.refresh_summary()
+
+
+# ── índice de búsqueda ───────────────────────────────────────────────────────
+@receiver(post_save, sender=Post)
+def index_post(sender, instance, **kwargs):
+    """Reindexa el post guardado (título, contenido o categoría pueden cambiar)."""
+    search.index_posts([instance.pk])
+
+
+@receiver(post_delete, sender=Post)
+def unindex_post(sender, instance, **kwargs):
+    """Quita el post eliminado del índice."""
+    search.unindex_posts([instance.pk])
+
+
+@receiver(post_save, sender=Category)
+def reindex_category_posts(sender, instance, created, **kwargs):
+    """Propaga el nombre de la categoría a sus posts indexados."""
+    if not created:
+        search.reindex_category(instance.pk, instance.name)
+
+
+@receiver(pre_delete, sender=Category)
+def clear_category_from_index(sender, instance, **kwargs):
+    """
+    Borra el nombre de la categoría del índice antes de eliminarla
+    (`on_delete=SET_NULL` es un UPDATE masivo sin señales de `Post`).
+    """
+    search.reindex_category(instance.pk, "")
+
+
+# ── caché del blog ───────────────────────────────────────────────────────────
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_blog_cache(sender, **kwargs):
+    """Cualquier cambio de posts o categorías deja obsoletos los feeds."""
+    invalidate_blog()
+
+
+# ── variantes de imagen ──────────────────────────────────────────────────────
+@receiver(post_save, sender=Post)
+def schedule_post_renditions(sender, instance, created, raw, update_fields=None, **kwargs):
+    """Genera en background las variantes de la imagen nueva o cambiada."""
+    if raw or not instance.image:
+        return
+    if not created:
+        if update_fields is not None and "image" not in update_fields:
+            return
+        if getattr(instance, "_image_old", None) == instance.image.name:
+            return  # misma imagen: sus variantes ya existen
+    schedule_renditions(instance.image.name)
+
+
+@receiver(pre_save, sender=Post)
+def remember_previous_image(sender, instance, raw, update_fields=None, **kwargs):
+    """Guarda el nombre de la imagen anterior para limpiar sus variantes."""
+    instance._image_old = None
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    if update_fields is not None and "image" not in update_fields:
+        return
+    instance._image_old = (
+        Post.objects.filter(pk=instance.pk).values_list("image", flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Post)
+def discard_replaced_renditions(sender, instance, **kwargs):
+    """La imagen cambió: las variantes de la anterior ya no se usan."""
+    old = getattr(instance, "_image_old", None)
+    if old and old != instance.image.name:
+        discard_renditions(old)
+
+
+@receiver(post_delete, sender=Post)
+def discard_deleted_renditions(sender, instance, **kwargs):
+    """Borra las variantes de la imagen del post eliminado."""
+    if instance.image:
+        discard_renditions(instance.image.name)
@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
 from .models import Post, Category
@@ -18,6 +19,18 @@ class BlogModelTest(TestCase):
     def test_post_category(self):
         self.assertEqual(self.post.category.name, "Novedades")
 
+    def test_summary_is_stored_on_save(self):
+        self.assertEqual(
+            self.post.excerpt, "Durante julio envio gratis en compras mayores a 15000."
+        )
+        self.assertEqual(self.post.reading_time, 1)
+        self.post.content = "<p>Uno &amp; dos " + "palabra " * 450 + "</p>"
+        self.post.save(update_fields=["content"])
+        self.post.refresh_from_db()
+        self.assertTrue(self.post.excerpt.startswith("Uno & dos palabra"))
+        self.assertTrue(self.post.excerpt.endswith("…"))
+        self.assertEqual(self.post.reading_time, 3)
+
 class BlogViewTest(TestCase):
     def setUp(self):
         self.category = Category.objects.create(name="Novedades")
@@ -39,3 +52,207 @@ class BlogViewTest(TestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, "Novedades de Julio")
+
+    def test_post_list_paginates_by_cursor(self):
+        for i in range(10):
+            Post.objects.create(title=f"Post {i}", content="-", category=self.category)
+        url = reverse('blog:post_list')
+        first = self.client.get(url)
+        page = first.context["page_obj"]
+        self.assertEqual(len(page), 10)
+        self.assertTrue(page.has_next)
+        second = self.client.get(f"{url}?{page.next_query}")
+        self.assertEqual(
+            [p.title for p in second.context["posts"]], ["Novedades de Julio"]
+        )
+
+    def test_post_list_does_not_load_content(self):
+        other = Category.objects.create(name="Reseñas")
+        for i in range(6):
+            Post.objects.create(
+                title=f"Post {i}", content="texto " * 2000, category=(self.category, other)[i % 2]
+            )
+        url = reverse('blog:post_list')
+        self.client.get(url)  # calienta cachés de sesión/menú
+        with self.assertNumQueries(1) as ctx:  # solo la página, con su categoría
+            response = self.client.get(url)
+        self.assertNotIn('"content"', ctx.captured_queries[0]["sql"])
+        self.assertContains(response, "Reseñas")
+        self.assertContains(response, "10 min de lectura")
+
+    def test_post_detail_ignores_if_modified_since_after_catalog_change(self):
+        from django.utils.http import http_date
+        from product.models import Category as ProductCategory, Product
+
+        url = reverse('blog:post_detail', args=[self.post.pk])
+        self.assertNotIn("Last-Modified", self.client.get(url))
+        since = http_date(self.post.updated_at.timestamp() + 60)
+        Product.objects.create(  # el post no cambió, pero sí la barra de navegación
+            title="Libro", author="Autor", description="-", price=1, stock=1,
+            category=ProductCategory.objects.create(name="Aventura"),
+        )
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Aventura")
+
+    def test_post_detail_etag_follows_catalog_counts(self):
+        from product.models import Category as ProductCategory, Product
+
+        url = reverse('blog:post_detail', args=[self.post.pk])
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        Product.objects.create(  # cambia los conteos de la barra de navegación
+            title="Libro", author="Autor", description="-", price=1, stock=1,
+            category=ProductCategory.objects.create(name="Aventura"),
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Aventura")
+
+
+class BlogSearchTest(TestCase):
+    def setUp(self):
+        self.category = Category.objects.create(name="Reseñas")
+        self.match = Post.objects.create(
+            title="Diario de lectura",
+            content="<p>Una historia sobre el árbol de la vida y <b>otras</b> cosas.</p>",
+            category=self.category,
+        )
+        self.title_match = Post.objects.create(title="El árbol", content="Sin más.")
+        self.other = Post.objects.create(title="Novedades", content="Envío gratis en julio.")
+
+    def _search(self, term):
+        return self.client.get(reverse("blog:post_list"), {"search": term})
+
+    def test_search_ranks_title_matches_first_and_highlights_snippets(self):
+        response = self._search("arbol")
+        posts = list(response.context["posts"])
+        self.assertEqual(posts, [self.title_match, self.match])
+        self.assertContains(response, "el <mark>árbol</mark> de la vida")
+        self.assertNotContains(response, "<b>otras</b>")  # el fragmento no trae HTML del post
+
+    def test_index_follows_saves_deletes_and_category_renames(self):
+        self.other.content = "Ahora hablamos de un árbol."
+        self.other.save()
+        self.assertIn(self.other, self._search("arbol").context["posts"])
+        self.other.delete()
+        self.assertNotIn(self.other, self._search("arbol").context["posts"])
+
+        self.category.name = "Críticas"
+        self.category.save()
+        self.assertEqual(list(self._search("criticas").context["posts"]), [self.match])
+        self.category.delete()
+        self.assertFalse(self._search("criticas").context["posts"])
+
+
+class BlogFeedTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.news = Category.objects.create(name="Novedades")
+        self.reviews = Category.objects.create(name="Reseñas")
+        self.post = Post.objects.create(title="Envío gratis", content="<p>En julio.</p>", category=self.news)
+        self.review = Post.objects.create(title="Una reseña", content="Muy bueno.", category=self.reviews)
+
+    def test_latest_posts_feed_is_cached_until_a_post_changes(self):
+        url = reverse("blog:post_feed")
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertContains(response, "Envío gratis")
+        self.assertContains(response, "<description>En julio.</description>")
+        with self.assertNumQueries(0):
+            cached = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(cached.status_code, 304)
+        self.post.title = "Envío gratis en agosto"
+        self.post.save()
+        self.assertContains(self.client.get(url), "Envío gratis en agosto")
+
+    def test_category_feed(self):
+        response = self.client.get(reverse("blog:post_category_feed", args=[self.reviews.pk]))
+        self.assertContains(response, "Blog · Reseñas")
+        self.assertContains(response, "Una reseña")
+        self.assertNotContains(response, "Envío gratis")
+        empty = Category.objects.create(name="Vacía")
+        self.assertEqual(self.client.get(reverse("blog:post_category_feed", args=[empty.pk])).status_code, 200)
+        self.assertEqual(self.client.get(reverse("blog:post_category_feed", args=[999])).status_code, 404)
+        self.assertEqual(self.client.get(reverse("blog:post_atom_feed")).status_code, 200)
+
+
+class PostPermissionViewTest(TestCase):
+    """Edición y borrado: el post del chequeo de permisos es el que usa la vista."""
+
+    def setUp(self):
+        from django.contrib.auth.models import User
+        self.author = User.objects.create_user(
+            "ana", password="x", first_name="Ana", last_name="Pérez"
+        )
+        self.category = Category.objects.create(name="Reseñas")
+        self.post = Post.objects.create(
+            title="Reseña", author="Ana Pérez", content="<p>Texto</p>", category=self.category
+        )
+
+    def post_fetches(self, method, url, data=None):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as ctx:
+            response = getattr(self.client, method)(url, data)
+        # Filas completas del post (no lecturas puntuales como la imagen previa)
+        fetches = [
+            q["sql"] for q in ctx.captured_queries
+            if q["sql"].startswith('SELECT "blog_post"."id"')
+            and 'WHERE "blog_post"."id" = ' in q["sql"]
+        ]
+        return response, len(fetches)
+
+    def test_author_edit_and_delete_fetch_post_once(self):
+        self.client.force_login(self.author)
+        edit = reverse("blog:post_edit", args=[self.post.pk])
+        response, fetches = self.post_fetches("get", edit)
+        self.assertEqual((response.status_code, fetches), (200, 1))
+        response, fetches = self.post_fetches(
+            "post", edit, {
+                "title": "Reseña nueva", "author": "Ana Pérez",
+                "content": "<p>Otro</p>", "category": self.category.pk,
+            },
+        )
+        self.assertEqual((response.status_code, fetches), (302, 1))
+
+        response, fetches = self.post_fetches(
+            "post", reverse("blog:post_delete", args=[self.post.pk])
+        )
+        self.assertEqual((response.status_code, fetches), (302, 1))
+        self.assertFalse(Post.objects.exists())
+
+    def test_other_user_is_forbidden(self):
+        from django.contrib.auth.models import User
+        self.client.force_login(User.objects.create_user("otro", password="x"))
+        response = self.client.get(reverse("blog:post_edit", args=[self.post.pk]))
+        self.assertEqual(response.status_code, 403)
+
+
+class BlogAdminTest(TestCase):
+    """Búsqueda del admin por prefijo sobre las columnas normalizadas."""
+
+    def setUp(self):
+        from django.contrib.auth.models import User
+        admin = User.objects.create_superuser("admin", "a@x.com", "pass")
+        self.client.force_login(admin)
+        self.category = Category.objects.create(name="Reseñas")
+        Post.objects.create(
+            title="Él Principito", author="Saint-Exupéry", content="<p>-</p>",
+            category=self.category,
+        )
+        Post.objects.create(title="Otro post", author="Ana", content="<p>-</p>")
+
+    def test_prefix_search_on_normalized_columns(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        url = reverse("admin:blog_post_changelist")
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, {"q": "el princ"})
+        self.assertContains(response, "Él Principito")
+        self.assertNotContains(response, "Otro post")
+        self.assertFalse([q for q in ctx.captured_queries if " LIKE " in q["sql"]])
+        self.assertContains(self.client.get(url, {"q": "SAINT"}), "Él Principito")
+
+        response = self.client.get(reverse("admin:blog_category_changelist"), {"q": "resen"})
+        self.assertContains(response, "Reseñas")
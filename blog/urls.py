@@ -1,11 +1,13 @@
 """
 Rutas de la aplicación Blog.
 
-Define las URL para listar, ver detalle, crear, editar y eliminar publicaciones.
+Define las URL para listar, ver detalle, crear, editar y eliminar publicaciones,
+y los feeds RSS/Atom de las últimas publicaciones.
 """
 
 from django.urls import path
 from . import views
+from .feeds import LatestPostsAtomFeed, LatestPostsFeed
 
 app_name = "blog"
 
@@ -15,4 +17,7 @@ urlpatterns = [
     path("posts/create/", views.PostCreateView.as_view(), name="post_create"),
     path("posts/<int:pk>/edit/", views.PostUpdateView.as_view(), name="post_edit"),
     path("posts/<int:pk>/delete/", views.PostDeleteView.as_view(), name="post_delete"),
+    path("feed/", LatestPostsFeed(), name="post_feed"),
+    path("feed/atom/", LatestPostsAtomFeed(), name="post_atom_feed"),
+    path("feed/<int:category_id>/", LatestPostsFeed(), name="post_category_feed"),
 ]
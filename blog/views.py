@@ -24,6 +24,11 @@ from django.views.generic import (
     DeleteView,
 )
 
+from core.pagination import KeysetPaginationMixin
+from core.view_mixins import ConditionalGetMixin, MemoizedObjectMixin
+from product.cache import CATALOG_TAG
+
+from . import search
 from .forms import PostForm
 from .models import Post
 
@@ -34,14 +39,16 @@ from .models import Post
 MSG_CREATED = "Publicación creada correctamente."
 MSG_UPDATED = "Publicación actualizada correctamente."
 MSG_DELETED = "Publicación eliminada correctamente."
+MSG_NO_PERMISSION = "Solo el autor o el staff pueden modificar esta publicación."
 
 # ──────────────────────────────────────────────────────────────
 # Mixins
 # ──────────────────────────────────────────────────────────────
-class AuthorOrStaffRequiredMixin(UserPassesTestMixin):
+class AuthorOrStaffRequiredMixin(MemoizedObjectMixin, UserPassesTestMixin):
     """
     Permite el acceso si el usuario es staff o autor del objeto.
-    Se usa en UpdateView y DeleteView de Post.
+    Se usa en UpdateView y DeleteView de Post; el post que carga
+    `test_func` es el mismo que edita o borra la vista (una consulta).
     """
 
     # Helpers --------------------------------------------------
@@ -69,12 +76,21 @@ class AuthorOrStaffRequiredMixin(UserPassesTestMixin):
 # ──────────────────────────────────────────────────────────────
 # Vistas públicas
 # ──────────────────────────────────────────────────────────────
-class PostListView(ListView):
+class PostListView(KeysetPaginationMixin, ListView):
     """
-    Lista pública de posts con búsqueda opcional.
+    Lista pública de posts con búsqueda opcional, paginada por cursor.
+
+    Cada tarjeta usa el resumen guardado en el post (`excerpt`,
+    `reading_time`): no se lee `content`, así el costo del listado no
+    depende del largo de las publicaciones.
+
+    Con SQLite la búsqueda usa el índice FTS5 (`blog/search.py`): ordena
+    por relevancia y cada resultado trae `search_snippet`, un fragmento del
+    contenido con las coincidencias resaltadas. En otros motores filtra
+    con `icontains` y mantiene el orden por fecha.
 
     URL:
-        /blog/posts/?search=palabra
+        /blog/posts/?search=palabra&cursor=<token>
     """
 
     model = Post
@@ -85,11 +101,13 @@ class PostListView(ListView):
     # Overrides -----------------------------------------------
     def get_queryset(self) -> "QuerySet[Post]":
         """
-        Devuelve un queryset filtrado por término de búsqueda
-        y ordenado por fecha de creación descendente.
+        Devuelve un queryset filtrado por término de búsqueda; sin búsqueda,
+        ordenado por fecha de creación descendente.
         """
         query: str = self.request.GET.get("search", "").strip()
-        qs: QuerySet[Post] = Post.objects.all()
+        qs: QuerySet[Post] = Post.objects.select_related("category").defer("content")
+        if query and search.search_available():
+            return search.filter_posts_fts(qs, query)
         if query:
             qs = qs.filter(
                 Q(title__icontains=query)
@@ -99,15 +117,27 @@ class PostListView(ListView):
         return qs.order_by("-created")
 
     def get_context_data(self, **kwargs: Any) -> Dict[str, Any]:
-        """Agrega 'search' al contexto para mantener el valor en la plantilla."""
+        """Agrega 'search' al contexto y los fragmentos resaltados de la página."""
         context = super().get_context_data(**kwargs)
         context["search"] = self.request.GET.get("search", "").strip()
+        if context["search"]:
+            snippets = search.post_snippets(
+                [post.pk for post in context["posts"]], context["search"]
+            )
+            for post in context["posts"]:
+                post.search_snippet = snippets.get(post.pk, "")
         return context
 
 
-class PostDetailView(DetailView):
-    """Vista pública de detalle de un post."""
+class PostDetailView(ConditionalGetMixin, DetailView):
+    """
+    Vista pública de detalle de un post (con GET condicional por `updated_at`).
+
+    La ETag suma la versión del catálogo: `base.html` muestra los conteos
+    por categoría en la barra de navegación.
+    """
     model = Post
+    etag_version_tags = (CATALOG_TAG,)
     template_name = "blog/post_detail.html"
     context_object_name = "post"
 
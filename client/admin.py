@@ -1,4 +1,21 @@
+"""
+client/admin.py
+───────────────
+Administración de clientes: búsqueda por prefijo de nombre/apellido sobre
+las columnas indexadas `*_norm` y conteo estimado (`FastChangeListAdmin`).
+"""
+
 from django.contrib import admin
+
+from core.admin import FastChangeListAdmin
+
 from .models import Client
 
-admin.site.register(Client)
+
+@admin.register(Client)
+class ClientAdmin(FastChangeListAdmin):
+    list_display = ("last_name", "first_name", "email", "phone", "user", "created_at")
+    list_select_related = ("user",)
+    ordering = ("-pk",)
+    search_fields = ("last_name_norm", "first_name_norm")
+    autocomplete_fields = ("user",)
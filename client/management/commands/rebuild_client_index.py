@@ -0,0 +1,27 @@
+"""
+client/management/commands/rebuild_client_index.py
+──────────────────────────────────────────────────
+Reconstruye desde cero el índice de trigramas de clientes.
+
+Uso:
+    python manage.py rebuild_client_index
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from client import search
+
+
+class Command(BaseCommand):
+    help = "Reconstruye el índice de búsqueda por trigramas de clientes."
+
+    def handle(self, *args, **options):
+        if not search.search_available():
+            raise CommandError(
+                "El índice de trigramas requiere SQLite 3.34+; "
+                "en este motor la búsqueda es por prefijo sobre las columnas *_norm."
+            )
+        with transaction.atomic():
+            total = search.rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"Índice reconstruido: {total} clientes."))
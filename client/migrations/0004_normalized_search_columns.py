@@ -0,0 +1,40 @@
+# Generated by Django 5.2.2 on 2026-10-18 13:46
+
+from django.db import migrations, models
+
+from core.text import normalize_text
+
+
+def backfill(apps, schema_editor):
+    """Completa las columnas normalizadas de las filas existentes."""
+    Client = apps.get_model("client", "Client")
+    clients = []
+    for client in Client.objects.only("id", "first_name", "last_name").iterator(chunk_size=2000):
+        client.first_name_norm = normalize_text(client.first_name)[:50]
+        client.last_name_norm = normalize_text(client.last_name)[:50]
+        clients.append(client)
+        if len(clients) >= 2000:
+            Client.objects.bulk_update(clients, ["first_name_norm", "last_name_norm"])
+            clients = []
+    Client.objects.bulk_update(clients, ["first_name_norm", "last_name_norm"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('client', '0003_alter_client_options_alter_client_created_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='client',
+            name='first_name_norm',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=50),
+        ),
+        migrations.AddField(
+            model_name='client',
+            name='last_name_norm',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=50),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
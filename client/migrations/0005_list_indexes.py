@@ -0,0 +1,19 @@
+# Generated by Django 5.2.2 on 2026-10-18 14:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('client', '0004_normalized_search_columns'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(condition=models.Q(('first_name', ''), ('last_name', ''), _negated=True), fields=['last_name', 'first_name', 'id'], name='client_named_idx'),
+        ),
+    ]
@@ -0,0 +1,62 @@
+"""
+Crea la tabla virtual FTS5 de trigramas `client_client_fts` y la puebla
+con los clientes existentes (ver `client/search.py`). Solo aplica en
+SQLite 3.34+; en otros motores no hace nada.
+"""
+
+import re
+import sqlite3
+
+from django.db import migrations
+
+from core.text import normalize_text
+
+FTS_TABLE = "client_client_fts"
+
+
+def _available(schema_editor) -> bool:
+    return (
+        schema_editor.connection.vendor == "sqlite"
+        and sqlite3.sqlite_version_info >= (3, 34, 0)
+    )
+
+
+def create_index(apps, schema_editor):
+    if not _available(schema_editor):
+        return
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+        "USING fts5(name, email, phone, tokenize = 'trigram')"
+    )
+    Client = apps.get_model("client", "Client")
+    insert = f"INSERT INTO {FTS_TABLE}(rowid, name, email, phone) VALUES (%s, %s, %s, %s)"
+    rows = []
+    with schema_editor.connection.cursor() as cursor:
+        for pk, first, last, email, phone in Client.objects.values_list(
+            "pk", "first_name", "last_name", "email", "phone"
+        ).iterator(chunk_size=2000):
+            words = normalize_text(f"{first} {last}").split()
+            name = "".join(f"  {word}" for word in words) + "  " if words else ""
+            rows.append((pk, name, (email or "").lower(), re.sub(r"\D+", "", phone or "")))
+            if len(rows) >= 500:
+                cursor.executemany(insert, rows)
+                rows = []
+        if rows:
+            cursor.executemany(insert, rows)
+
+
+def drop_index(apps, schema_editor):
+    if not _available(schema_editor):
+        return
+    schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('client', '0005_list_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
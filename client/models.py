@@ -14,8 +14,10 @@ Puntos clave
 from django.db import models
 from django.contrib.auth.models import User
 
+from core.models import NormalizedFieldsMixin
 
-class Client(models.Model):
+
+class Client(NormalizedFieldsMixin, models.Model):
     """
     Modelo que almacena la información de contacto de un cliente.
 
@@ -27,6 +29,8 @@ class Client(models.Model):
         phone (CharField): Teléfono de contacto.
         address (CharField): Dirección postal.
         created_at (DateTimeField): Fecha de alta (se asigna automáticamente).
+        first_name_norm / last_name_norm: Nombre y apellido sin tildes ni
+            mayúsculas (auto, indexados) para búsquedas por prefijo.
     """
 
     user = models.OneToOneField(
@@ -43,9 +47,21 @@ class Client(models.Model):
     phone = models.CharField("Teléfono", max_length=30, blank=True)
     address = models.CharField("Dirección", max_length=255, blank=True)
     created_at = models.DateTimeField("Fecha de alta", auto_now_add=True)
+    first_name_norm = models.CharField(max_length=50, editable=False, db_index=True, default="")
+    last_name_norm = models.CharField(max_length=50, editable=False, db_index=True, default="")
+
+    normalized_fields = {"first_name_norm": "first_name", "last_name_norm": "last_name"}
 
     class Meta:
         ordering = ["last_name", "first_name"]
+        # Parcial: el listado excluye las fichas sin nombre ni apellido
+        indexes = [
+            models.Index(
+                fields=["last_name", "first_name", "id"],
+                condition=~models.Q(first_name="", last_name=""),
+                name="client_named_idx",
+            ),
+        ]
         verbose_name = "Client"
         verbose_name_plural = "Clients"
 
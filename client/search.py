@@ -0,0 +1,325 @@
+"""
+client/search.py
+────────────────
+Búsqueda de clientes por n-gramas (trigramas) sobre SQLite FTS5.
+
+La tabla virtual `client_client_fts` usa el tokenizador `trigram`: indexa
+cada secuencia de tres caracteres, de modo que cualquier fragmento de
+tres o más letras se resuelve por índice, no solo los prefijos («arc»
+encuentra «García»). Por cada `Client` (`rowid = client.id`) guarda:
+
+- name  : nombre y apellido normalizados (sin tildes, minúsculas), con
+          cada palabra rodeada de dos espacios («  jose  garcia  ») para
+          que existan trigramas de borde, como en `pg_trgm`.
+- email : el correo en minúsculas.
+- phone : solo los dígitos del teléfono.
+
+Estrategia de búsqueda
+──────────────────────
+1. Fragmentos: cada palabra de 3+ caracteres debe aparecer tal cual en
+   alguna columna (AND de frases FTS5), ordenado por BM25 (el nombre
+   pesa más que correo y teléfono). Con más de `SEARCH_LIMIT`
+   coincidencias se puntúan hasta `RANK_CANDIDATES` y se muestran las
+   `SEARCH_LIMIT` mejores.
+2. Si no hay ninguna, tolerancia a errores: candidatos que conservan
+   intacta una mitad de cada palabra (un error de tipeo cae en una sola)
+   y, de ellos, los que comparten al menos `MIN_SIMILARITY` de los
+   trigramas de cada palabra («garsia» → «García»), por similitud.
+
+Las palabras de menos de 3 caracteres no forman trigramas: acompañando
+a otras, se exigen como inicio de una palabra del nombre dentro de la
+misma consulta; solas, se resuelven como prefijo sobre las columnas
+indexadas `*_norm` (`core.text.prefix_q`).
+
+Incluye:
+- filter_clients_fts : filtra y ordena un queryset por relevancia.
+- index_clients      : (re)indexa clientes puntuales.
+- unindex_clients    : quita clientes del índice.
+- rebuild_index      : reconstruye el índice completo.
+
+Notas
+─────
+- La sincronización la hacen las señales de `client/signals.py`; las
+  operaciones masivas deben llamar a `index_clients` o al comando
+  `rebuild_client_index`.
+- Requiere SQLite 3.34+ (tokenizador `trigram`). En otros motores
+  (`search_available() == False`) la vista busca por prefijo.
+"""
+
+import re
+import sqlite3
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from django.db import connection
+from django.db.models import QuerySet
+from django.db.models.expressions import RawSQL
+
+from core.text import normalize_text, prefix_q
+
+from .models import Client
+
+FTS_TABLE = "client_client_fts"
+
+CREATE_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+    "USING fts5(name, email, phone, tokenize = 'trigram')"
+)
+DROP_SQL = f"DROP TABLE IF EXISTS {FTS_TABLE}"
+
+# Pesos BM25 por columna: name, email, phone
+_BM25 = f"bm25({FTS_TABLE}, 10.0, 2.0, 2.0)"
+
+SEARCH_LIMIT = 500
+# Coincidencias que se puntúan como máximo para elegir las `SEARCH_LIMIT`
+# mejores (~60 ms con un millón de clientes y un nombre muy común)
+RANK_CANDIDATES = 50_000
+MIN_SIMILARITY = 0.5
+FUZZY_CANDIDATES = 2000
+
+# SQLite admite hasta 999 parámetros en versiones antiguas
+_CHUNK = 500
+
+_NON_DIGITS = re.compile(r"\D+")
+_LETTER = re.compile(r"[^\W\d_]")
+
+
+def search_available() -> bool:
+    """True si la base de datos actual soporta el índice de trigramas."""
+    return connection.vendor == "sqlite" and sqlite3.sqlite_version_info >= (3, 34, 0)
+
+
+def _chunks(ids: Iterable[int]) -> Iterable[List[int]]:
+    ids = list(ids)
+    for start in range(0, len(ids), _CHUNK):
+        yield ids[start:start + _CHUNK]
+
+
+# ------------------------------------------------------------------
+# Texto indexado y trigramas
+# ------------------------------------------------------------------
+def _padded(words: Sequence[str]) -> str:
+    return "".join(f"  {word}" for word in words) + "  " if words else ""
+
+
+def index_row(first_name: str, last_name: str, email: str, phone: str) -> Tuple[str, str, str]:
+    """Columnas `(name, email, phone)` que se indexan para un cliente."""
+    name = normalize_text(f"{first_name} {last_name}").split()
+    return _padded(name), (email or "").lower(), _NON_DIGITS.sub("", phone or "")
+
+
+def _words(query: str) -> List[str]:
+    """Palabras de la búsqueda; las que no tienen letras quedan en sus dígitos."""
+    words = []
+    for word in normalize_text(query).split():
+        if not _LETTER.search(word):
+            word = _NON_DIGITS.sub("", word)
+        if word:
+            words.append(word)
+    return words
+
+
+def trigrams(word: str) -> Set[str]:
+    """Trigramas de `word` con los bordes marcados («  ga», « ga», …, «ía »)."""
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _phrase(text: str) -> str:
+    return '"%s"' % text.replace('"', '""')
+
+
+def _similarity(word_grams: Set[str], row: Sequence[str]) -> float:
+    """Fracción de los trigramas de la palabra presentes en la fila."""
+    text = "  ".join(row)
+    row_grams = {text[i:i + 3] for i in range(len(text) - 2)}
+    return len(word_grams & row_grams) / len(word_grams)
+
+
+# ------------------------------------------------------------------
+# Consulta
+# ------------------------------------------------------------------
+def _where(match: str, short_words: List[str]) -> Tuple[str, List[str]]:
+    likes = "".join(" AND name LIKE %s" for _ in short_words)
+    return (
+        f"{FTS_TABLE} MATCH %s{likes}",
+        [match, *(f"%  {word}%" for word in short_words)],
+    )
+
+
+def _matches(match: str, short_words: List[str], limit: int) -> List[tuple]:
+    """
+    `(rowid, name, email, phone)` de hasta `limit` coincidencias.
+
+    Sin `ORDER BY` ni BM25 (su IDF cuenta todas las coincidencias): FTS5
+    entrega las filas en orden de `rowid` y corta al llegar al límite, así
+    una búsqueda muy común («garcia» entre un millón de clientes) cuesta
+    lo mismo que una rara. Las palabras cortas se
+    exigen como inicio de una palabra del nombre (`LIKE '%  jo%'`) sobre
+    las filas que ya encontró el MATCH.
+    """
+    where, params = _where(match, short_words)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid, name, email, phone FROM {FTS_TABLE} WHERE {where} LIMIT %s",
+            [*params, limit],
+        )
+        return cursor.fetchall()
+
+
+def _bm25_order(match: str, ids: List[int]) -> List[int]:
+    """`ids` (pocas coincidencias de `match`) ordenados por BM25."""
+    marks = ", ".join(["%s"] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s "
+            f"AND rowid IN ({marks}) ORDER BY {_BM25}, rowid",
+            [match, *ids],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _bm25_top(match: str, short_words: List[str], limit: int) -> List[int]:
+    """
+    Las `limit` coincidencias más relevantes (BM25) de `match`.
+
+    Se puntúan a lo sumo `RANK_CANDIDATES` coincidencias (las primeras por
+    `rowid`) y se ordenan con un tope: el costo queda acotado aunque la
+    búsqueda encuentre a casi todos los clientes.
+    """
+    where, params = _where(match, short_words)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid FROM (SELECT rowid, {_BM25} AS score FROM {FTS_TABLE} "
+            f"WHERE {where} LIMIT %s) ORDER BY score, rowid LIMIT %s",
+            [*params, RANK_CANDIDATES, limit],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _pieces(word: str) -> List[str]:
+    """
+    Fragmentos de `word` de los que al menos uno sobrevive a un error.
+
+    Con 6+ caracteres, sus dos mitades (un error de tipeo cae en una
+    sola); con menos, sus trigramas.
+    """
+    if len(word) >= 6:
+        return [word[:len(word) // 2], word[len(word) // 2:]]
+    return [word[i:i + 3] for i in range(len(word) - 2)]
+
+
+def _fuzzy_ids(words: List[str], short_words: List[str]) -> List[int]:
+    """Candidatos que conservan un fragmento de cada palabra, por similitud."""
+    match = " AND ".join(
+        "(%s)" % " OR ".join(_phrase(piece) for piece in _pieces(word)) for word in words
+    )
+    grams = [trigrams(word) for word in words]
+    scores = {}
+    for pk, *columns in _matches(match, short_words, FUZZY_CANDIDATES):
+        each = [_similarity(word_grams, columns) for word_grams in grams]
+        if min(each) >= MIN_SIMILARITY:
+            scores[pk] = sum(each) / len(each)
+    return sorted(scores, key=lambda pk: (-scores[pk], pk))
+
+
+def filter_clients_fts(
+    qs: "QuerySet[Client]", query: str, limit: Optional[int] = SEARCH_LIMIT
+) -> "QuerySet[Client]":
+    """
+    Restringe `qs` a los clientes que coinciden con `query`.
+
+    Con `limit=None` (exportación) devuelve todas las coincidencias de
+    fragmentos, sin ranking ni tope; la tolerancia a errores se aplica igual.
+
+    Anota `search_rank` (posición en el ranking: menor = más relevante) y
+    ordena por ella, con apellido, nombre e id como desempate estable. Si
+    hay más de `limit` coincidencias se muestran las `limit` más
+    relevantes (`_bm25_top`). Sin palabras de 3+ caracteres es un filtro
+    por prefijo sobre `*_norm`, sin reordenar.
+    """
+    words = _words(query)
+    short_words = [word for word in words if len(word) < 3]
+    words = [word for word in words if len(word) >= 3]
+    if not words:
+        for word in short_words:
+            qs = qs.filter(prefix_q("first_name_norm", word) | prefix_q("last_name_norm", word))
+        return qs
+
+    match = " ".join(_phrase(word) for word in words)
+    if limit is None:
+        if _matches(match, short_words, 1):
+            where, params = _where(match, short_words)
+            return qs.filter(
+                pk__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {where}", params)
+            )
+        ids = _fuzzy_ids(words, short_words)
+    else:
+        rows = _matches(match, short_words, limit + 1)
+        if len(rows) > limit:
+            ids = _bm25_top(match, short_words, limit)
+        elif rows:
+            ids = _bm25_order(match, [row[0] for row in rows])
+        else:
+            ids = _fuzzy_ids(words, short_words)
+
+    # Posición en el ranking: índice del id dentro de «,id1,id2,…,»
+    positions = "," + ",".join(str(pk) for pk in ids) + ","
+    table = qs.model._meta.db_table
+    rank = RawSQL(f"""instr(%s, ',' || "{table}"."id" || ',')""", [positions])
+    return (
+        qs.filter(pk__in=ids)
+        .annotate(search_rank=rank)
+        .order_by("search_rank", "last_name", "first_name", "id")
+    )
+
+
+# ------------------------------------------------------------------
+# Mantenimiento del índice
+# ------------------------------------------------------------------
+def _insert(cursor, clients: "QuerySet[Client]") -> None:
+    rows = (
+        (pk, *index_row(*fields))
+        for pk, *fields in clients.values_list(
+            "pk", "first_name", "last_name", "email", "phone"
+        ).iterator(chunk_size=_CHUNK)
+    )
+    while batch := list(islice(rows, _CHUNK)):
+        cursor.executemany(
+            f"INSERT INTO {FTS_TABLE}(rowid, name, email, phone) VALUES (%s, %s, %s, %s)",
+            batch,
+        )
+
+
+def index_clients(ids: Iterable[int]) -> None:
+    """Inserta o reemplaza en el índice los clientes indicados."""
+    if not search_available():
+        return
+    with connection.cursor() as cursor:
+        for chunk in _chunks(ids):
+            marks = ", ".join(["%s"] * len(chunk))
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({marks})", chunk)
+            _insert(cursor, Client.objects.filter(pk__in=chunk))
+
+
+def unindex_clients(ids: Iterable[int]) -> None:
+    """Elimina del índice los clientes indicados."""
+    if not search_available():
+        return
+    with connection.cursor() as cursor:
+        for chunk in _chunks(ids):
+            marks = ", ".join(["%s"] * len(chunk))
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({marks})", chunk)
+
+
+def rebuild_index() -> int:
+    """Vacía y vuelve a poblar el índice; devuelve la cantidad de filas."""
+    if not search_available():
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(CREATE_SQL)
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        _insert(cursor, Client.objects.all())
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+        cursor.execute(f"SELECT COUNT(*) FROM {FTS_TABLE}")
+        return cursor.fetchone()[0]
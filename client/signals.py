@@ -0,0 +1,30 @@
+"""
+client/signals.py
+─────────────────
+Señales de la app Client.
+
+• Mantienen sincronizado el índice de búsqueda por trigramas
+  (`client/search.py`) ante altas, ediciones y bajas de `Client`.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import search
+from .models import Client
+
+
+@receiver(post_save, sender=Client)
+def index_client(sender, instance, update_fields=None, **kwargs):
+    """Reindexa el cliente si cambió alguno de los campos buscables."""
+    if update_fields is not None and not set(update_fields) & {
+        "first_name", "last_name", "email", "phone"
+    }:
+        return
+    search.index_clients([instance.pk])
+
+
+@receiver(post_delete, sender=Client)
+def unindex_client(sender, instance, **kwargs):
+    """Quita el cliente eliminado del índice."""
+    search.unindex_clients([instance.pk])
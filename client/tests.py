@@ -47,3 +47,82 @@ class ClientViewTest(TestCase):
         self.client.login(username="staff", password="pass")
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
+
+    def test_client_search_ignores_accents_by_prefix(self):
+        Client.objects.create(first_name="José", last_name="García")
+        response = self.client.get(reverse('client:client_list'), {"search": "garcia jo"})
+        self.assertEqual(
+            [c.last_name for c in response.context["clients"]], ["García"]
+        )
+
+    def _search(self, term):
+        response = self.client.get(reverse('client:client_list'), {"search": term})
+        return [c.last_name for c in response.context["clients"]]
+
+    def test_client_search_matches_fragments_email_and_phone(self):
+        Client.objects.create(first_name="José", last_name="García", email="jgarcia@correo.com")
+        Client.objects.create(first_name="Marcos", last_name="Ruiz", phone="(011) 4555-1234")
+        self.assertCountEqual(self._search("arc"), ["García", "Ruiz"])
+        self.assertEqual(self._search("jgarc"), ["García"])
+        self.assertEqual(self._search("4555-12"), ["Ruiz"])
+        self.assertEqual(self._search("alicia@exa"), ["Lopez"])
+
+    def test_client_search_tolerates_typos(self):
+        Client.objects.create(first_name="José", last_name="García")
+        Client.objects.create(first_name="Gabriel", last_name="Sosa")
+        self.assertEqual(self._search("garsia"), ["García"])
+        self.assertEqual(self._search("xyzw"), [])
+
+    def test_search_over_the_limit_keeps_the_most_relevant(self):
+        from .search import filter_clients_fts
+        for i in range(5):  # coinciden solo por correo y llegan antes
+            Client.objects.create(first_name="Ana", last_name=f"Zeta {i}", email=f"garcia{i}@x.com")
+        Client.objects.create(first_name="José", last_name="García")
+        found = filter_clients_fts(Client.objects.all(), "garcia", limit=3)
+        self.assertEqual(len(found), 3)
+        self.assertEqual(found[0].last_name, "García")
+
+    def test_search_index_follows_updates_and_deletes(self):
+        self.client_obj.last_name = "Pérez"
+        self.client_obj.save()
+        self.assertEqual(self._search("erez"), ["Pérez"])
+        self.client_obj.delete()
+        self.assertEqual(self._search("erez"), [])
+
+    def test_client_list_paginates_by_cursor(self):
+        for i in range(30):
+            Client.objects.create(first_name="Ana", last_name=f"Zeta {i:02d}")
+        url = reverse('client:client_list')
+        page = self.client.get(url).context["page_obj"]
+        self.assertEqual(len(page), 25)
+        self.assertEqual(page[0].last_name, "Lopez")
+        second = self.client.get(f"{url}?{page.next_query}").context["page_obj"]
+        self.assertEqual([c.last_name for c in second][-1], "Zeta 29")
+        self.assertEqual(len(second), 6)
+
+        first = self.client.get(url, {"search": "zeta"}).context["page_obj"]
+        rest = self.client.get(f"{url}?{first.next_query}").context["page_obj"]
+        self.assertEqual(len(first) + len(rest), 30)
+        self.assertEqual(len({c.pk for c in [*first, *rest]}), 30)
+
+    def test_normalized_columns_follow_update_fields(self):
+        self.client_obj.last_name = "Pérez"
+        self.client_obj.save(update_fields=["last_name"])
+        self.client_obj.refresh_from_db()
+        self.assertEqual(self.client_obj.last_name_norm, "perez")
+
+    def test_csv_export_streams_filtered_rows(self):
+        Client.objects.create(first_name="José", last_name="García", address="=HYPERLINK()")
+        response = self.client.get(reverse('client:client_export'), {"search": "garcia"})
+        self.assertTrue(response.streaming)
+        self.assertIn("attachment;", response["Content-Disposition"])
+        lines = b"".join(response.streaming_content).decode("utf-8-sig").splitlines()
+        self.assertTrue(lines[0].startswith("ID,Nombre,Apellido"))
+        self.assertEqual(len(lines), 2)
+        self.assertIn("García", lines[1])
+        self.assertIn("'=HYPERLINK()", lines[1])
+
+    def test_csv_export_requires_staff(self):
+        self.client.logout()
+        response = self.client.get(reverse('client:client_export'))
+        self.assertNotEqual(response.status_code, 200)
@@ -5,6 +5,7 @@ Rutas para la gestión de clientes en la Tienda de Historias.
 
 Incluye (por defecto):
 - Listado de clientes (`client_list`)
+- Exportación CSV del listado (`client_export`)
 - Edición de un cliente (`client_edit`)
 - Eliminación de un cliente (`client_delete`)
 
@@ -19,6 +20,7 @@ from django.urls import path
 
 from .views import (
     ClientListView,
+    ClientExportView,
     ClientCreateView,  # ← Habilitado para alta manual
     ClientUpdateView,
     ClientDeleteView,
@@ -28,6 +30,7 @@ app_name = "client"
 
 urlpatterns = [
     path("list/", ClientListView.as_view(), name="client_list"),
+    path("export/", ClientExportView.as_view(), name="client_export"),
     path("create/", ClientCreateView.as_view(), name="client_create"),  # ← Habilitado
     path("<int:pk>/edit/", ClientUpdateView.as_view(), name="client_edit"),
     path("<int:pk>/delete/", ClientDeleteView.as_view(), name="client_delete"),
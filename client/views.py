@@ -11,17 +11,20 @@ Convenciones
 - Principio DRY: reutilizamos mixins y evitamos lógica duplicada.
 """
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
-from django.db.models import Q, QuerySet
+from django.db.models import QuerySet
 from django.urls import reverse_lazy
-from django.views.generic import ListView, CreateView, UpdateView, DeleteView
+from django.views.generic import ListView, CreateView, UpdateView, DeleteView, View
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.messages.views import SuccessMessageMixin
 
+from . import search
 from .models import Client
 from .forms import ClientForm
-from core.view_mixins import StaffRequiredMixin  # Reutilizado también en 'product' app
+from core.pagination import KeysetPaginationMixin
+from core.text import prefix_q
+from core.view_mixins import CsvExportMixin, StaffRequiredMixin  # Reutilizado también en 'product' app
 
 # ─────────────────────────────────────────
 # Mensajes reutilizables
@@ -30,21 +33,52 @@ MSG_CREATED = "Cliente creado correctamente."
 MSG_UPDATED = "Cliente actualizado correctamente."
 MSG_DELETED = "Cliente eliminado correctamente."
 
+# ─────────────────────────────────────────
+# Helpers
+# ─────────────────────────────────────────
+def _filter_clients(
+    qs: "QuerySet[Client]", query: str, limit: Optional[int] = search.SEARCH_LIMIT
+) -> "QuerySet[Client]":
+    """
+    Con SQLite busca por trigramas (`client/search.py`): fragmentos de
+    nombre, apellido, correo o teléfono, tolerando errores de tipeo, y
+    ordena por relevancia (`limit=None`: todas las coincidencias, sin
+    ordenar; lo usa la exportación). En otros motores cada palabra de
+    `query` debe ser prefijo del nombre o del apellido.
+    """
+    if query and search.search_available():
+        return search.filter_clients_fts(qs, query, limit)
+    for word in query.split():
+        qs = qs.filter(
+            prefix_q("first_name_norm", word) |
+            prefix_q("last_name_norm", word)
+        )
+    return qs
+
+
 # ─────────────────────────────────────────
 # CRUD (solo empleados `is_staff`)
 # ─────────────────────────────────────────
-class ClientListView(LoginRequiredMixin, StaffRequiredMixin, ListView):
+class ClientListView(LoginRequiredMixin, StaffRequiredMixin, KeysetPaginationMixin, ListView):
     """
-    Lista de clientes con búsqueda opcional por nombre o apellido.
+    Directorio de clientes paginado por cursor, con búsqueda opcional.
+
+    Sin búsqueda recorre el índice parcial `client_named_idx` en orden de
+    apellido y nombre: cada página es un rango del índice, sin `COUNT(*)`
+    ni `OFFSET`. La búsqueda usa el índice de trigramas de
+    `client/search.py`: encuentra fragmentos internos («arc» → «García»),
+    correos y teléfonos, tolera errores de tipeo («garsia») y ordena por
+    relevancia; ignora tildes y mayúsculas.
 
     URL:
-        /client/list/?search=<cadena>
+        /client/list/?search=<cadena>&cursor=<token>
     """
 
     model = Client
     template_name = "client/client_list.html"
     context_object_name = "clients"
     ordering = ["last_name", "first_name"]
+    paginate_by = 25
 
     # Overrides -----------------------------------------------
     def get_queryset(self) -> "QuerySet[Client]":
@@ -54,12 +88,7 @@ class ClientListView(LoginRequiredMixin, StaffRequiredMixin, ListView):
         qs: QuerySet[Client] = super().get_queryset().exclude(
             first_name__exact="", last_name__exact=""
         )
-        if query:
-            qs = qs.filter(
-                Q(first_name__icontains=query) |
-                Q(last_name__icontains=query)
-            )
-        return qs.order_by("last_name", "first_name")
+        return _filter_clients(qs, query)
 
     def get_context_data(self, **kwargs: Any) -> Dict[str, Any]:
         """Mantiene el valor de búsqueda en el contexto para la plantilla."""
@@ -68,6 +97,35 @@ class ClientListView(LoginRequiredMixin, StaffRequiredMixin, ListView):
         return ctx
 
 
+class ClientExportView(LoginRequiredMixin, StaffRequiredMixin, CsvExportMixin, View):
+    """
+    Exporta a CSV (en streaming) los clientes del listado.
+
+    Aplica el mismo filtro `search` y las mismas exclusiones que
+    `ClientListView`.
+
+    URL:
+        /clientes/export/?search=<cadena>
+    """
+
+    export_filename = "clientes"
+    export_columns = [
+        ("ID", "id"),
+        ("Nombre", "first_name"),
+        ("Apellido", "last_name"),
+        ("Correo", "email"),
+        ("Teléfono", "phone"),
+        ("Dirección", "address"),
+        ("Usuario", "user__username"),
+        ("Alta", "created_at"),
+    ]
+
+    def get_export_queryset(self) -> "QuerySet[Client]":
+        query = self.request.GET.get("search", "").strip()
+        qs = Client.objects.exclude(first_name__exact="", last_name__exact="")
+        return _filter_clients(qs, query, limit=None).order_by("last_name", "first_name", "id")
+
+
 class ClientCreateView(
     LoginRequiredMixin,
     StaffRequiredMixin,
@@ -1,3 +1,58 @@
+"""
+core/admin.py
+─────────────
+Piezas comunes de los `ModelAdmin` del proyecto.
+
+Incluye:
+- FastChangeListAdmin: changelist apto para tablas de cientos de miles de
+  filas (conteo estimado y búsqueda por prefijo sobre columnas indexadas).
+
+Convenciones
+────────────
+- Cada app registra sus modelos en su propio `admin.py` heredando de aquí.
+- `list_select_related` se declara siempre que `list_display` muestre una FK.
+"""
+
+from typing import Sequence
+
 from django.contrib import admin
+from django.db.models import Q
+
+from .pagination import EstimatedCountPaginator
+from .text import prefix_q
+
+
+class FastChangeListAdmin(admin.ModelAdmin):
+    """
+    `ModelAdmin` base para tablas grandes.
+
+    - Paginación con `EstimatedCountPaginator`: sin `COUNT(*)` completo.
+    - `show_full_result_count = False`: al filtrar no se cuenta la tabla.
+    - Con `prefix_search = True` los `search_fields` son columnas `*_norm`
+      indexadas: el texto buscado debe ser prefijo de alguna, resuelto
+      como rango sobre el índice (`core.text.prefix_q`), igual que los
+      buscadores del sitio. También lo usa el autocompletado de las FK
+      (`autocomplete_fields`). Con `False` se usa la búsqueda de Django.
+
+    Ejemplo de uso:
+        @admin.register(Category)
+        class CategoryAdmin(FastChangeListAdmin):
+            search_fields = ("name_norm",)
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
+    prefix_search = True
 
-# Register your models here.
+    def get_search_results(self, request, queryset, search_term):
+        if not self.prefix_search:
+            return super().get_search_results(request, queryset, search_term)
+        term = " ".join(search_term.split())
+        if not term:
+            return queryset, False
+        fields: Sequence[str] = self.get_search_fields(request)
+        condition = Q()
+        for field in fields:
+            condition |= prefix_q(field, term)
+        return queryset.filter(condition), False
@@ -0,0 +1,67 @@
+"""
+core/cache.py
+─────────────
+Versionado de claves de caché para invalidación por etiquetas.
+
+En lugar de borrar entradas una por una, cada «etiqueta» (p. ej. el
+catálogo completo o un producto puntual) tiene un número de versión que
+forma parte de las claves que dependen de ella. Incrementar la versión
+deja obsoletas todas esas entradas de una vez; expiran solas por TTL.
+
+Incluye:
+- get_version  : versión actual de una etiqueta.
+- get_versions : varias versiones en un solo acceso a la caché.
+- bump_version : invalida una etiqueta.
+
+Notas
+─────
+- Si la caché desaloja una versión, se regenera con un valor nuevo basado
+  en el reloj, nunca con uno ya usado, para no resucitar entradas viejas.
+- Con varios procesos (gunicorn) configurar una caché compartida
+  (Redis / Memcached) en `CACHES`; la LocMemCache es por proceso.
+"""
+
+import time
+from typing import Dict, Iterable
+
+from django.core.cache import cache
+
+__all__ = ["get_version", "get_versions", "bump_version"]
+
+VERSION_PREFIX = "version:"
+
+
+def _fresh() -> int:
+    return time.time_ns()
+
+
+def get_version(tag: str) -> int:
+    """Devuelve la versión de `tag`, creándola si no existe."""
+    key = VERSION_PREFIX + tag
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _fresh(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def get_versions(tags: Iterable[str]) -> Dict[str, int]:
+    """Versión de cada etiqueta de `tags`, con un único `get_many`."""
+    keys = {VERSION_PREFIX + tag: tag for tag in tags}
+    found = cache.get_many(list(keys))
+    missing = {key: _fresh() for key in keys if key not in found}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        found.update(missing)
+    return {keys[key]: value for key, value in found.items()}
+
+
+def bump_version(tag: str) -> int:
+    """Invalida todas las entradas que dependen de `tag`; devuelve la versión nueva."""
+    key = VERSION_PREFIX + tag
+    try:
+        return cache.incr(key)
+    except ValueError:  # la clave no existe (nunca usada o desalojada)
+        version = _fresh()
+        cache.set(key, version, timeout=None)
+        return version
@@ -0,0 +1,81 @@
+"""
+core/feeds.py
+─────────────
+Base para feeds RSS/Atom servidos desde caché.
+
+Los agregadores consultan el feed cada pocos minutos y casi siempre
+obtienen lo mismo. `CachedFeed` guarda la respuesta ya generada con una
+clave que incluye la versión de sus etiquetas (`core/cache.py`): el feed
+se regenera solo después de un cambio en los modelos que lo alimentan.
+
+Además responde GET condicionales: la ETag es la propia clave de caché
+y `Last-Modified` la fecha del ítem más reciente, así un lector que ya
+tiene la última versión recibe `304 Not Modified` sin cuerpo.
+
+Ejemplo de uso:
+    class LatestPostsFeed(CachedFeed):
+        cache_version_tags = (BLOG_TAG,)
+        def items(self): ...
+"""
+
+import hashlib
+from typing import Sequence
+
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+
+from .cache import get_versions
+
+__all__ = ["CachedFeed"]
+
+FEED_CACHE_PREFIX = "feed:"
+
+
+class CachedFeed(Feed):
+    """
+    `Feed` cuya respuesta se cachea hasta que cambie alguna de sus etiquetas.
+
+    Atributos:
+        cache_version_tags (tuple): Etiquetas de `core/cache.py` de las que
+                                    depende el contenido.
+        cache_timeout (int)       : TTL de la respuesta cacheada (segundos).
+    """
+
+    cache_version_tags: Sequence[str] = ()
+    cache_timeout = 60 * 60
+
+    def get_cache_key(self, request) -> str:
+        """Feed, URL (incluye argumentos y host) y versiones de sus etiquetas."""
+        versions = sorted(get_versions(self.cache_version_tags).items())
+        raw = repr((
+            type(self).__module__,
+            type(self).__qualname__,
+            request.build_absolute_uri(request.path),
+            versions,
+        ))
+        return FEED_CACHE_PREFIX + hashlib.md5(raw.encode()).hexdigest()
+
+    def __call__(self, request, *args, **kwargs):
+        key = self.get_cache_key(request)
+        entry = cache.get(key)
+        if entry is None:
+            response = super().__call__(request, *args, **kwargs)
+            entry = (response.content, response["Content-Type"], response.get("Last-Modified"))
+            cache.set(key, entry, self.cache_timeout)
+
+        content, content_type, last_modified = entry
+        etag = '"%s"' % key.removeprefix(FEED_CACHE_PREFIX)
+        response = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=parse_http_date_safe(last_modified) if last_modified else None,
+        )
+        if response is None:
+            response = HttpResponse(content, content_type=content_type)
+        response.headers["ETag"] = etag
+        if last_modified:
+            response.headers["Last-Modified"] = last_modified
+        return response
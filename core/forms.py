@@ -12,15 +12,16 @@ Convenciones
   el usuario se registra o edita sus datos.
 """
 
-from typing import Any, Dict
+import unicodedata
+from typing import Any, Dict, Optional
 
 from django import forms
-from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
+from django.contrib.auth.forms import AuthenticationForm, PasswordResetForm, UserCreationForm
 from django.contrib.auth.models import User
+from django.db import transaction
 from django.utils.translation import gettext_lazy as _
 
-from client.models import Client
-from .models import Profile
+from .models import Profile, users_by_email, users_by_username
 
 # ──────────────────────────────────────────────────────────────
 # REGISTRO
@@ -102,12 +103,25 @@ class CustomUserCreationForm(UserCreationForm):
     # Validaciones
     # ----------------------------------------------------------
     def clean_email(self) -> str:
-        """Valida unicidad de e-mail (case-insensitive)."""
+        """Valida unicidad de e-mail (case-insensitive, por índice)."""
         email = self.cleaned_data["email"].lower()
-        if User.objects.filter(email__iexact=email).exists():
+        if users_by_email(email).exists():
             raise forms.ValidationError(_("Ese correo ya está registrado."))
         return email
 
+    def clean_username(self) -> Optional[str]:
+        """
+        Rechaza nombres que solo difieren en mayúsculas (como Django, pero
+        por el índice `LOWER(username)` en vez de `username__iexact`).
+        """
+        username = self.cleaned_data.get("username")
+        if username and users_by_username(username).exists():
+            self._update_errors(forms.ValidationError({
+                "username": self.instance.unique_error_message(User, ["username"])
+            }))
+            return None
+        return username
+
     def clean_first_name(self) -> str:
         """Normaliza nombre (sin espacios extra, Title Case)."""
         return " ".join(self.cleaned_data["first_name"].strip().title().split())
@@ -120,26 +134,26 @@ class CustomUserCreationForm(UserCreationForm):
     # Guardado: User + Profile + Client
     # ----------------------------------------------------------
     def save(self, commit: bool = True) -> User:  # type: ignore[override]
-        """Crea el usuario y sincroniza Profile + Client."""
+        """
+        Crea el usuario y completa su Profile en una transacción.
+
+        La señal `create_profile` inserta el Profile; aquí solo se escriben
+        teléfono y dirección si se cargaron. `Client` lo crea después el
+        worker del outbox (tarea `client.sync`, ver `core/signals.py`).
+        """
         user = super().save(commit=False)
         user.email = self.cleaned_data["email"].lower()
-        if commit:
-            user.save()
+        if not commit:
+            return user
 
-        # 1. Profile (teléfono y dirección)
-        profile, _ = Profile.objects.get_or_create(user=user)
-        profile.phone = self.cleaned_data.get("phone", "")
-        profile.address = self.cleaned_data.get("address", "")
-        profile.save()
-
-        # 2. Client (registro visible para empleados)
-        client, _ = Client.objects.get_or_create(user=user)
-        client.first_name = user.first_name
-        client.last_name = user.last_name
-        client.email = user.email
-        client.phone = profile.phone
-        client.address = profile.address
-        client.save()
+        with transaction.atomic():
+            user.save()
+            profile = user.profile  # recién creado por la señal (sin consulta)
+            profile.phone = self.cleaned_data.get("phone", "")
+            profile.address = self.cleaned_data.get("address", "")
+            changed = [field for field in ("phone", "address") if getattr(profile, field)]
+            if changed:
+                profile.save(update_fields=changed)
 
         return user
 
@@ -165,6 +179,23 @@ class CustomAuthenticationForm(AuthenticationForm):
     )
 
 
+# ──────────────────────────────────────────────────────────────
+# RECUPERACIÓN DE CONTRASEÑA
+# ──────────────────────────────────────────────────────────────
+class EmailPasswordResetForm(PasswordResetForm):
+    """`PasswordResetForm` que busca al usuario por el índice `LOWER(email)`."""
+
+    def get_users(self, email: str):
+        """Usuarios activos con ese correo y contraseña utilizable."""
+        folded = unicodedata.normalize("NFKC", email).casefold()
+        for user in users_by_email(email).filter(is_active=True):
+            if (
+                user.has_usable_password()
+                and unicodedata.normalize("NFKC", user.email).casefold() == folded
+            ):
+                yield user
+
+
 # ──────────────────────────────────────────────────────────────
 # EDICIÓN DE PERFIL
 # ──────────────────────────────────────────────────────────────
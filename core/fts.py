@@ -0,0 +1,40 @@
+"""
+core/fts.py
+───────────
+Piezas comunes de los índices de texto completo sobre SQLite FTS5.
+
+Los índices viven en cada app (`product/search.py`, `blog/search.py`);
+aquí está lo que comparten: saber si el motor los soporta y convertir
+lo que escribe el usuario en una expresión MATCH segura.
+
+Incluye:
+- search_available  : True si la base de datos actual soporta FTS5.
+- build_match_query : búsqueda del usuario → expresión MATCH por prefijo.
+
+Ejemplo:
+    >>> build_match_query("Harr pott!")
+    '"Harr"* "pott"*'
+"""
+
+import re
+
+from django.db import connection
+
+__all__ = ["search_available", "build_match_query"]
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def search_available() -> bool:
+    """True si la base de datos actual soporta el índice FTS5."""
+    return connection.vendor == "sqlite"
+
+
+def build_match_query(query: str) -> str:
+    """
+    Convierte la búsqueda del usuario en una expresión MATCH segura.
+
+    Cada palabra se cita (evita inyectar operadores FTS) y se busca por
+    prefijo: «harr pott» → `"harr"* "pott"*` (ambas deben aparecer).
+    """
+    return " ".join(f'"{token}"*' for token in _TOKEN_RE.findall(query))
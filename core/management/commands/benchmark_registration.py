@@ -0,0 +1,125 @@
+"""
+core/management/commands/benchmark_registration.py
+──────────────────────────────────────────────────
+Mide la latencia del registro con muchos usuarios en `auth_user`.
+
+Compara la validación de correo único por `email__iexact` (recorre la
+tabla) con `users_by_email` (índice `LOWER(email)`) y mide el registro
+completo (`CustomUserCreationForm`: validación + alta; el alta incluye
+el hash PBKDF2 de la contraseña, que domina el total). Con `--users N`
+completa la tabla con usuarios sintéticos hasta N filas.
+
+Todo corre en una transacción que se deshace al final: no quedan
+usuarios sintéticos ni registros de prueba.
+
+Uso:
+    python manage.py benchmark_registration --users 1000000
+    python manage.py benchmark_registration --lookups 500 --registrations 20
+"""
+
+import statistics
+import time
+from itertools import islice
+from typing import Callable, List
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core.forms import CustomUserCreationForm
+from core.models import users_by_email
+
+SEED_BATCH = 5000
+
+
+def _timings(func: Callable[[int], object], count: int) -> List[float]:
+    """Milisegundos de cada una de `count` llamadas a `func(i)`."""
+    result = []
+    for i in range(count):
+        started = time.perf_counter()
+        func(i)
+        result.append((time.perf_counter() - started) * 1000)
+    return result
+
+
+class Command(BaseCommand):
+    help = "Mide la validación de correo y el registro con muchos usuarios (sin dejar cambios)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--users", type=int, default=0,
+            help="Completar auth_user con usuarios sintéticos hasta N filas.",
+        )
+        parser.add_argument(
+            "--lookups", type=int, default=200, help="Búsquedas por correo a medir."
+        )
+        parser.add_argument(
+            "--registrations", type=int, default=10, help="Registros completos a medir."
+        )
+
+    def handle(self, *args, **options):
+        lookups, registrations = options["lookups"], options["registrations"]
+        if min(lookups, registrations) < 1 or options["users"] < 0:
+            raise CommandError("--lookups y --registrations deben ser mayores que cero.")
+
+        with transaction.atomic():
+            total = self.seed(options["users"])
+            self.stdout.write(f"Usuarios en auth_user: {total}")
+
+            # Correos existentes (en mayúsculas) y nuevos, alternados
+            emails = [
+                f"BENCHREG{i * 7919 % max(total, 1)}@Example.COM" if i % 2 else f"nuevo{i}@example.com"
+                for i in range(lookups)
+            ]
+            self.report(
+                "email__iexact (antes)",
+                _timings(lambda i: User.objects.filter(email__iexact=emails[i]).exists(), lookups),
+            )
+            self.report(
+                "users_by_email (índice)",
+                _timings(lambda i: users_by_email(emails[i]).exists(), lookups),
+            )
+            self.report("validación del registro", _timings(self.validate, registrations))
+            self.report("registro completo", _timings(self.register, registrations))
+            transaction.set_rollback(True)
+
+    # ----------------------------------------------------------
+    # Helpers
+    # ----------------------------------------------------------
+    def seed(self, target: int) -> int:
+        """Inserta usuarios sintéticos hasta `target` filas; devuelve el total."""
+        count = User.objects.count()
+        users = (
+            User(username=f"benchreg{i}", email=f"benchreg{i}@example.com", password="!")
+            for i in range(count, target)
+        )
+        started = time.perf_counter()
+        while batch := list(islice(users, SEED_BATCH)):
+            User.objects.bulk_create(batch)
+        if target > count:
+            self.stdout.write(
+                f"Sembrados {target - count} usuarios en {time.perf_counter() - started:.1f} s."
+            )
+        return max(count, target)
+
+    def validate(self, i: int) -> CustomUserCreationForm:
+        """Validación del formulario (usuario y correo únicos, contraseña)."""
+        form = CustomUserCreationForm({
+            "username": f"registro{i}", "first_name": "Ana", "last_name": "Pérez",
+            "email": f"registro{i}@example.com",
+            "password1": "Zx9!kqpwLm", "password2": "Zx9!kqpwLm",
+        })
+        if not form.is_valid():
+            raise CommandError(f"Formulario inválido: {form.errors.as_text()}")
+        return form
+
+    def register(self, i: int) -> None:
+        """Validación + alta (incluye el hash de la contraseña)."""
+        self.validate(i).save()
+
+    def report(self, label: str, timings: List[float]) -> None:
+        timings = sorted(timings)
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        self.stdout.write(
+            f"{label:<26} mediana {statistics.median(timings):8.2f} ms · p95 {p95:8.2f} ms"
+        )
@@ -0,0 +1,69 @@
+"""
+core/management/commands/run_outbox_worker.py
+─────────────────────────────────────────────
+Worker del outbox transaccional (`core/outbox.py`).
+
+Toma tareas por lotes de `--batch-size` y las ejecuta en un pool de
+`--workers` hilos (los handlers esperan sobre todo a la base de datos y
+cada hilo usa su propia conexión). Sin tareas disponibles espera
+`--poll` segundos. Pueden correr varios workers a la vez. Con SQLite
+(un solo escritor) el pool se limita a un hilo.
+
+Uso:
+    python manage.py run_outbox_worker
+    python manage.py run_outbox_worker --workers 8 --batch-size 100
+    python manage.py run_outbox_worker --once   # vacía la cola y termina (cron)
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from core import outbox
+
+
+class Command(BaseCommand):
+    help = "Ejecuta las tareas diferidas del outbox (por lotes, con reintentos)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=4, help="Hilos del pool.")
+        parser.add_argument(
+            "--batch-size", type=int, default=outbox.BATCH_SIZE, help="Tareas por lote."
+        )
+        parser.add_argument(
+            "--poll", type=float, default=1.0, help="Espera sin tareas (segundos)."
+        )
+        parser.add_argument(
+            "--once", action="store_true", help="Procesar lo disponible y terminar."
+        )
+
+    def handle(self, *args, **options):
+        workers, batch_size = options["workers"], options["batch_size"]
+        if min(workers, batch_size) < 1:
+            raise CommandError("--workers y --batch-size deben ser mayores que cero.")
+
+        if connection.vendor == "sqlite" and workers > 1:
+            # SQLite admite un solo escritor: más hilos solo chocan («database is locked»)
+            self.stdout.write("SQLite: se usa un solo hilo (un escritor a la vez).")
+            workers = 1
+
+        total_done = total_failed = 0
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="outbox") as pool:
+            try:
+                while True:
+                    done, failed = outbox.process_batch(batch_size, pool)
+                    total_done, total_failed = total_done + done, total_failed + failed
+                    if done or failed:
+                        self.stdout.write(f"Lote: {done} completadas, {failed} con error.")
+                    elif options["once"]:
+                        break
+                    else:
+                        time.sleep(options["poll"])
+            except KeyboardInterrupt:
+                self.stdout.write("Worker detenido.")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Outbox: {total_done} tareas completadas, {total_failed} con error."
+        ))
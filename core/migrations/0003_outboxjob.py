@@ -0,0 +1,36 @@
+# Generated by Django 5.2.2 on 2026-10-18 15:02
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_alter_profile_options_alter_profile_user'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task', models.CharField(max_length=100, verbose_name='Tarea')),
+                ('payload', models.JSONField(default=dict, verbose_name='Argumentos')),
+                ('dedupe_key', models.CharField(blank=True, default='', max_length=200)),
+                ('available_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Disponible desde')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Intentos')),
+                ('locked_by', models.CharField(blank=True, editable=False, max_length=32, null=True)),
+                ('last_error', models.TextField(blank=True, verbose_name='Último error')),
+                ('failed_at', models.DateTimeField(blank=True, null=True, verbose_name='Falló')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Alta')),
+            ],
+            options={
+                'verbose_name': 'Outbox job',
+                'verbose_name_plural': 'Outbox jobs',
+                'ordering': ['available_at', 'id'],
+                'indexes': [models.Index(condition=models.Q(('failed_at__isnull', True)), fields=['available_at', 'id'], name='outbox_ready_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('locked_by__isnull', True), models.Q(('dedupe_key', ''), _negated=True)), fields=('dedupe_key',), name='outbox_pending_dedupe_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+"""
+Índices `LOWER(email)` y `LOWER(username)` sobre `auth_user` para buscar
+usuarios sin distinguir mayúsculas (`core.models.users_by_email` /
+`users_by_username`), como hace el registro.
+
+`User` pertenece a `django.contrib.auth`: los índices se crean con el
+schema editor (SQL propio de cada motor) en vez de declararse en su Meta.
+Al crearse indexan todas las filas existentes.
+"""
+
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+INDEXES = {
+    "auth_user_email_lower_idx": "email",
+    "auth_user_username_lower_idx": "username",
+}
+
+
+def _indexes():
+    return [models.Index(Lower(field), name=name) for name, field in INDEXES.items()]
+
+
+def create_indexes(apps, schema_editor):
+    for index in _indexes():
+        schema_editor.add_index(apps.get_model("auth", "User"), index)
+
+
+def drop_indexes(apps, schema_editor):
+    for index in _indexes():
+        schema_editor.remove_index(apps.get_model("auth", "User"), index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0003_outboxjob"),
+        ("auth", "0012_alter_user_first_name_max_length"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
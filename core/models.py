@@ -4,11 +4,101 @@ core/models.py
 Modelos complementarios al sistema de autenticación.
 
 Incluye:
+- NormalizedFieldsMixin: mantiene columnas `*_norm` para búsquedas.
+- ManagedFieldsMixin   : excluye contadores mantenidos con F() de los save().
 - Profile: datos de contacto adicionales para cada `User`.
+- users_by_email / users_by_username: búsqueda de usuarios sin distinguir
+  mayúsculas, por los índices `LOWER(...)` de `auth_user`.
+- OutboxJob: tareas diferidas del outbox transaccional (`core/outbox.py`).
 """
 
+from typing import Dict, Tuple
+
 from django.contrib.auth.models import User
 from django.db import models
+from django.db.models import QuerySet, Value
+from django.db.models.functions import Lower
+from django.db.models.signals import pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .text import normalize_text
+
+
+class NormalizedFieldsMixin:
+    """
+    Completa columnas «sombra» normalizadas (sin tildes, en minúsculas).
+
+    Cada modelo declara `normalized_fields = {"columna_norm": "campo"}`;
+    antes de guardar se recalculan todas, incluso en cargas de fixtures
+    (`raw=True`), y si se usa `save(update_fields=...)` se agregan las
+    columnas derivadas de los campos actualizados.
+
+    Ejemplo:
+        class Category(NormalizedFieldsMixin, models.Model):
+            name = models.CharField(max_length=100)
+            name_norm = models.CharField(max_length=100, editable=False, db_index=True)
+            normalized_fields = {"name_norm": "name"}
+    """
+
+    normalized_fields: Dict[str, str] = {}
+
+    def refresh_normalized_fields(self) -> None:
+        """Recalcula las columnas `*_norm` a partir de sus campos fuente."""
+        for target, source in self.normalized_fields.items():
+            max_length = self._meta.get_field(target).max_length
+            setattr(self, target, normalize_text(getattr(self, source))[:max_length])
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            update_fields |= {
+                target
+                for target, source in self.normalized_fields.items()
+                if source in update_fields
+            }
+            kwargs["update_fields"] = update_fields
+        super().save(*args, **kwargs)
+
+
+class ManagedFieldsMixin:
+    """
+    Protege columnas que solo se modifican con UPDATE atómicos (`F()`).
+
+    Una instancia leída hace un rato trae valores viejos de esas columnas;
+    un `save()` común las reescribiría y perdería los cambios concurrentes.
+    Al guardar una fila existente sin `update_fields`, se guardan todos los
+    campos salvo los listados en `managed_fields`.
+
+    Ejemplo:
+        class Category(ManagedFieldsMixin, NormalizedFieldsMixin, models.Model):
+            product_count = models.PositiveIntegerField(default=0, editable=False)
+            managed_fields = ("product_count",)
+    """
+
+    managed_fields: Tuple[str, ...] = ()
+
+    def save(self, *args, **kwargs):
+        if (
+            self.managed_fields
+            and not self._state.adding
+            and kwargs.get("update_fields") is None
+            and not kwargs.get("force_insert")
+        ):
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.managed_fields
+            ]
+        super().save(*args, **kwargs)
+
+
+@receiver(pre_save)
+def fill_normalized_fields(sender, instance, **kwargs):
+    """Aplica `refresh_normalized_fields` a todo modelo que use el mixin."""
+    if isinstance(instance, NormalizedFieldsMixin):
+        instance.refresh_normalized_fields()
 
 
 class Profile(models.Model):
@@ -47,3 +137,86 @@ class Profile(models.Model):
         """Nombre completo del usuario (útil en plantillas)."""
         return self.user.get_full_name() or self.user.username
 
+
+# Creados por la migración `core.0004_user_lower_indexes` (User es de
+# `django.contrib.auth`: no se le pueden declarar índices en su Meta)
+USER_EMAIL_INDEX = "auth_user_email_lower_idx"
+USER_USERNAME_INDEX = "auth_user_username_lower_idx"
+
+
+def _users_lower_equal(field: str, value: str) -> "QuerySet[User]":
+    """
+    Usuarios con `LOWER(field) = LOWER(value)`, la expresión de los índices.
+
+    `__iexact` no los aprovecha (en SQLite es `LIKE`, en PostgreSQL
+    `UPPER(...)`) y recorre la tabla. Ambos lados pasan por el `LOWER` de
+    la base para que la comparación sea la misma que la del índice.
+    """
+    return User.objects.alias(lowered=Lower(field)).filter(lowered=Lower(Value(value)))
+
+
+def users_by_email(email: str) -> "QuerySet[User]":
+    """Usuarios con el correo `email`, sin distinguir mayúsculas (por índice)."""
+    return _users_lower_equal("email", email)
+
+
+def users_by_username(username: str) -> "QuerySet[User]":
+    """Usuarios con el nombre `username`, sin distinguir mayúsculas (por índice)."""
+    return _users_lower_equal("username", username)
+
+
+class OutboxJob(models.Model):
+    """
+    Tarea diferida del outbox transaccional (ver `core/outbox.py`).
+
+    Se inserta en la misma transacción que el cambio que la origina y la
+    ejecuta `run_outbox_worker`; al terminar bien se borra.
+
+    Campos:
+        task (CharField)          : Nombre del handler registrado.
+        payload (JSONField)       : Argumentos (nombre → valor) del handler.
+        dedupe_key (CharField)    : Evita encolar dos veces la misma tarea
+                                    mientras ninguna se haya tomado ("" = sin
+                                    deduplicar).
+        available_at (DateTimeField): Desde cuándo se puede tomar (reintentos
+                                    con espera y vencimiento de la toma).
+        attempts (PositiveSmallIntegerField): Veces que se tomó.
+        locked_by (CharField)     : Token de la última toma (`None` = nunca).
+        last_error (TextField)    : Último error del handler.
+        failed_at (DateTimeField) : Agotó los reintentos (queda para revisar).
+        created_at (DateTimeField): Fecha de alta.
+    """
+
+    task = models.CharField("Tarea", max_length=100)
+    payload = models.JSONField("Argumentos", default=dict)
+    dedupe_key = models.CharField(max_length=200, blank=True, default="")
+    available_at = models.DateTimeField("Disponible desde", default=timezone.now)
+    attempts = models.PositiveSmallIntegerField("Intentos", default=0)
+    locked_by = models.CharField(max_length=32, null=True, blank=True, editable=False)
+    last_error = models.TextField("Último error", blank=True)
+    failed_at = models.DateTimeField("Falló", null=True, blank=True)
+    created_at = models.DateTimeField("Alta", auto_now_add=True)
+
+    class Meta:
+        ordering = ["available_at", "id"]
+        indexes = [
+            # Parcial: el worker solo busca tareas pendientes
+            models.Index(
+                fields=["available_at", "id"],
+                condition=models.Q(failed_at__isnull=True),
+                name="outbox_ready_idx",
+            ),
+        ]
+        constraints = [
+            # Una sola copia sin tomar por clave (INSERT … ON CONFLICT DO NOTHING)
+            models.UniqueConstraint(
+                fields=["dedupe_key"],
+                condition=models.Q(locked_by__isnull=True) & ~models.Q(dedupe_key=""),
+                name="outbox_pending_dedupe_uniq",
+            ),
+        ]
+        verbose_name = "Outbox job"
+        verbose_name_plural = "Outbox jobs"
+
+    def __str__(self) -> str:
+        return f"{self.task} #{self.pk}"
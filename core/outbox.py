@@ -0,0 +1,210 @@
+"""
+core/outbox.py
+──────────────
+Outbox transaccional: efectos secundarios diferidos fuera del request.
+
+Las señales no hacen el trabajo pesado: `enqueue` inserta un `OutboxJob`
+en la **misma transacción** que el cambio (si ésta se deshace, la tarea
+también) y el request termina. El worker (`manage.py run_outbox_worker`)
+las toma por lotes y ejecuta sus handlers en un pool de hilos.
+
+Ejemplo de uso:
+    @outbox.handler("client.sync")
+    def sync_client(user_id: int) -> None: ...
+
+    outbox.enqueue("client.sync", {"user_id": user.pk}, dedupe_key=f"client.sync:{user.pk}")
+
+Garantías
+─────────
+- Al menos una vez: un handler puede repetirse (reintento, worker caído
+  a mitad de una tarea), así que debe ser idempotente.
+- Toma por lotes con un token propio (`locked_by`) y un vencimiento
+  (`available_at` = ahora + `OUTBOX_LEASE`): varios workers pueden correr a
+  la vez sin ejecutar dos veces la misma tarea; si uno muere, sus tareas
+  vuelven a estar disponibles al vencer la toma. En PostgreSQL la lectura
+  usa `SELECT … FOR UPDATE SKIP LOCKED`.
+- Reintentos con espera exponencial (`OUTBOX_BACKOFF` · 2ⁿ, con jitter,
+  hasta `OUTBOX_BACKOFF_MAX`); tras `OUTBOX_MAX_ATTEMPTS` la tarea queda
+  marcada (`failed_at`, `last_error`) para revisarla.
+- `dedupe_key`: mientras haya una copia sin tomar, encolar otra no inserta
+  nada (índice único parcial + `ON CONFLICT DO NOTHING`). Alcanza con una,
+  porque el handler lee el estado al ejecutarse.
+
+Incluye:
+- handler       : registra un handler con su nombre de tarea.
+- enqueue       : encola una tarea en la transacción en curso.
+- claim         : toma un lote de tareas disponibles.
+- run_job       : ejecuta una tarea tomada (borra, reprograma o marca fallo).
+- process_batch : toma y ejecuta un lote (opcionalmente en un pool).
+
+Ajustes opcionales (settings)
+─────────────────────────────
+• OUTBOX_ASYNC        (bool, True) – False ejecuta las tareas al confirmar,
+                                     en el mismo proceso (tests, desarrollo
+                                     sin worker).
+• OUTBOX_MAX_ATTEMPTS (int, 5)     – intentos antes de marcar el fallo.
+• OUTBOX_BACKOFF      (int, 10)    – espera base entre reintentos (s).
+• OUTBOX_BACKOFF_MAX  (int, 3600)  – espera máxima entre reintentos (s).
+• OUTBOX_LEASE        (int, 300)   – vencimiento de una toma (s).
+"""
+
+import logging
+import random
+import uuid
+from concurrent.futures import Executor
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import OutboxJob
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["handler", "enqueue", "claim", "run_job", "process_batch"]
+
+BATCH_SIZE = 50
+
+HANDLERS: Dict[str, Callable[..., None]] = {}
+
+
+def _setting(name: str, default: Any) -> Any:
+    return getattr(settings, name, default)
+
+
+# ------------------------------------------------------------------
+# Registro y encolado (camino del request)
+# ------------------------------------------------------------------
+def handler(task: str) -> Callable[[Callable[..., None]], Callable[..., None]]:
+    """Decorador: registra `func` como handler de `task`."""
+
+    def register(func: Callable[..., None]) -> Callable[..., None]:
+        HANDLERS[task] = func
+        return func
+
+    return register
+
+
+def enqueue(
+    task: str,
+    payload: Optional[Dict[str, Any]] = None,
+    *,
+    dedupe_key: str = "",
+    delay: float = 0,
+) -> None:
+    """
+    Encola `task(**payload)` en la transacción en curso (un INSERT).
+
+    Con `dedupe_key` no se duplica una tarea que todavía nadie tomó.
+    `payload` debe ser serializable a JSON (ids, no instancias).
+    """
+    if task not in HANDLERS:
+        raise ValueError(f"Tarea de outbox desconocida: {task!r}")
+    job = OutboxJob(
+        task=task,
+        payload=payload or {},
+        dedupe_key=dedupe_key,
+        available_at=timezone.now() + timedelta(seconds=delay),
+    )
+    OutboxJob.objects.bulk_create([job], ignore_conflicts=True)
+    if not _setting("OUTBOX_ASYNC", True):
+        transaction.on_commit(lambda: process_batch())
+
+
+# ------------------------------------------------------------------
+# Worker
+# ------------------------------------------------------------------
+def claim(batch_size: int = BATCH_SIZE) -> List[OutboxJob]:
+    """
+    Toma hasta `batch_size` tareas disponibles, las más antiguas primero.
+
+    Marca el lote con un token nuevo, suma un intento y corre su
+    vencimiento; el UPDATE repite la condición de disponibilidad, así que
+    una tarea que otro worker tomó entre la lectura y la escritura no entra.
+    """
+    now = timezone.now()
+    token = uuid.uuid4().hex
+    ready = (
+        OutboxJob.objects.filter(failed_at__isnull=True, available_at__lte=now)
+        .order_by("available_at", "id")
+    )
+    with transaction.atomic():
+        if connection.features.has_select_for_update_skip_locked:
+            ready = ready.select_for_update(skip_locked=True)
+        ids = list(ready.values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            return []
+        OutboxJob.objects.filter(
+            pk__in=ids, failed_at__isnull=True, available_at__lte=now
+        ).update(
+            locked_by=token,
+            attempts=F("attempts") + 1,
+            available_at=now + timedelta(seconds=_setting("OUTBOX_LEASE", 300)),
+        )
+    return list(OutboxJob.objects.filter(locked_by=token).order_by("available_at", "id"))
+
+
+def backoff(attempts: int) -> float:
+    """Segundos de espera antes del intento `attempts + 1` (±20 % de jitter)."""
+    base = _setting("OUTBOX_BACKOFF", 10) * 2 ** max(attempts - 1, 0)
+    return min(base, _setting("OUTBOX_BACKOFF_MAX", 3600)) * random.uniform(0.8, 1.2)
+
+
+def run_job(job: OutboxJob) -> bool:
+    """
+    Ejecuta una tarea tomada por `claim`, en su propia transacción.
+
+    Si termina bien se borra; si falla se reprograma con espera o, agotados
+    los intentos, queda marcada. Las escrituras filtran por el token: si la
+    toma venció y otro worker la retomó, éste no pisa su estado.
+    """
+    mine = OutboxJob.objects.filter(pk=job.pk, locked_by=job.locked_by)
+    try:
+        func = HANDLERS.get(job.task)
+        if func is None:
+            raise LookupError(f"Tarea de outbox desconocida: {job.task!r}")
+        with transaction.atomic():
+            func(**job.payload)
+    except Exception as exc:  # noqa: BLE001 – el error queda en la tarea
+        logger.exception("Falló la tarea de outbox %s", job)
+        now = timezone.now()
+        if job.attempts >= _setting("OUTBOX_MAX_ATTEMPTS", 5):
+            mine.update(failed_at=now, last_error=repr(exc))
+        else:
+            mine.update(
+                available_at=now + timedelta(seconds=backoff(job.attempts)),
+                last_error=repr(exc),
+            )
+        return False
+    mine.delete()
+    return True
+
+
+def _run_in_thread(job: OutboxJob) -> bool:
+    """`run_job` desde un hilo del pool: conexión propia, como un request."""
+    close_old_connections()
+    try:
+        return run_job(job)
+    finally:
+        close_old_connections()
+
+
+def process_batch(
+    batch_size: int = BATCH_SIZE, executor: Optional[Executor] = None
+) -> Tuple[int, int]:
+    """
+    Toma un lote y lo ejecuta; devuelve `(completadas, fallidas)`.
+
+    Sin `executor` corre en el hilo actual; con un `ThreadPoolExecutor`
+    (el worker) las tareas del lote corren en paralelo.
+    """
+    jobs = claim(batch_size)
+    if executor is None:
+        results = [run_job(job) for job in jobs]
+    else:
+        results = list(executor.map(_run_in_thread, jobs))
+    done = sum(results)
+    return done, len(results) - done
@@ -0,0 +1,349 @@
+"""
+core/pagination.py
+──────────────────
+Paginación por cursor (keyset) reutilizable en todo el proyecto.
+
+A diferencia del `Paginator` de Django, no usa `OFFSET` ni `COUNT(*)`:
+cada página se obtiene con un filtro sobre las columnas de orden
+(`WHERE (title, id) > (:último_title, :último_id)`) y un `LIMIT`, de modo
+que la página 1 000 cuesta lo mismo que la primera.
+
+Incluye:
+- KeysetPaginator        : arma páginas a partir de un queryset ordenado.
+- KeysetPage             : página resultante con cursores opacos.
+- KeysetPaginationMixin  : integra el paginador en cualquier `ListView`.
+- EstimatedCountPaginator: `Paginator` por páginas (admin) con conteo acotado.
+
+Convenciones
+────────────
+- El orden se toma del queryset (o de `Meta.ordering`) y siempre se agrega
+  la PK como desempate para que el cursor sea único.
+- Los cursores son base64 de un JSON; no contienen datos sensibles.
+- Funciona tanto con instancias de modelo como con filas de `values()`.
+"""
+
+import base64
+import binascii
+import datetime
+import json
+from typing import Any, List, Optional, Sequence, Tuple
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
+from django.http import Http404
+
+__all__ = [
+    "InvalidCursor",
+    "KeysetPage",
+    "KeysetPaginator",
+    "KeysetPaginationMixin",
+    "EstimatedCountPaginator",
+]
+
+FORWARD = "n"   # página siguiente
+BACKWARD = "p"  # página anterior
+
+
+class InvalidCursor(ValueError):
+    """El cursor recibido no se puede decodificar."""
+
+
+class _CursorEncoder(DjangoJSONEncoder):
+    """
+    Como `DjangoJSONEncoder`, pero sin recortar microsegundos: el cursor
+    debe reproducir exactamente el valor de la última fila.
+    """
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+class KeysetPage:
+    """
+    Página de resultados obtenida por cursor.
+
+    Atributos:
+        object_list (list)       : Filas de la página (ya evaluadas).
+        has_next (bool)          : Hay resultados posteriores.
+        has_previous (bool)      : Hay resultados anteriores.
+        next_cursor (str|None)   : Cursor para pedir la página siguiente.
+        previous_cursor (str|None): Cursor para pedir la página anterior.
+    """
+
+    def __init__(
+        self,
+        object_list: List[Any],
+        paginator: "KeysetPaginator",
+        has_next: bool,
+        has_previous: bool,
+    ) -> None:
+        self.object_list = object_list
+        self.paginator = paginator
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.next_cursor: Optional[str] = None
+        self.previous_cursor: Optional[str] = None
+        if object_list and has_next:
+            self.next_cursor = paginator.encode_cursor(FORWARD, object_list[-1])
+        if object_list and has_previous:
+            self.previous_cursor = paginator.encode_cursor(BACKWARD, object_list[0])
+        # Querystrings completos (los completa KeysetPaginationMixin)
+        self.next_query: str = ""
+        self.previous_query: str = ""
+
+    # Compatibilidad mínima con la API de `django.core.paginator.Page`
+    def has_other_pages(self) -> bool:
+        return self.has_next or self.has_previous
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __repr__(self) -> str:
+        return f"<KeysetPage ({len(self)} filas)>"
+
+
+class KeysetPaginator:
+    """
+    Pagina un queryset por cursor sobre sus columnas de orden.
+
+    Ejemplo:
+        paginator = KeysetPaginator(Product.objects.all(), per_page=12)
+        page = paginator.page(request.GET.get("cursor"))
+
+    Parámetros:
+        queryset (QuerySet) : Queryset a paginar (modelos o `values()`).
+        per_page (int)      : Filas por página.
+        ordering (list)     : Orden explícito; por defecto el del queryset
+                              o el `Meta.ordering` del modelo.
+    """
+
+    def __init__(
+        self,
+        queryset: QuerySet,
+        per_page: int,
+        ordering: Optional[Sequence[str]] = None,
+    ) -> None:
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.model = queryset.model
+        self.keys = self._resolve_keys(ordering)
+
+    # ------------------------------------------------------------------
+    # Orden
+    # ------------------------------------------------------------------
+    def _resolve_keys(self, ordering: Optional[Sequence[str]]) -> List[Tuple[str, bool]]:
+        """Devuelve [(campo, descendente)] y agrega la PK como desempate."""
+        ordering = list(
+            ordering
+            or self.queryset.query.order_by
+            or self.model._meta.ordering
+            or []
+        )
+        pk_name = self.model._meta.pk.attname
+        keys: List[Tuple[str, bool]] = []
+        for item in ordering:
+            if not isinstance(item, str) or item == "?":
+                raise ValueError("KeysetPaginator solo admite orden por nombre de campo.")
+            desc = item.startswith("-")
+            name = item.lstrip("-+")
+            if name == "pk":
+                name = pk_name
+            keys.append((name, desc))
+        if pk_name not in {name for name, _ in keys}:
+            last_desc = keys[-1][1] if keys else False
+            keys.append((pk_name, last_desc))
+        return keys
+
+    def _order_by(self, reverse: bool) -> List[str]:
+        return [
+            ("-" if desc != reverse else "") + name
+            for name, desc in self.keys
+        ]
+
+    # ------------------------------------------------------------------
+    # Cursores
+    # ------------------------------------------------------------------
+    def _row_values(self, row: Any) -> List[Any]:
+        if isinstance(row, dict):
+            return [row[name] for name, _ in self.keys]
+        return [getattr(row, name) for name, _ in self.keys]
+
+    def encode_cursor(self, direction: str, row: Any) -> str:
+        """Serializa la posición de `row` en un token opaco."""
+        payload = json.dumps(
+            [direction, self._row_values(row)],
+            cls=_CursorEncoder,
+            separators=(",", ":"),
+        )
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor: str) -> Tuple[str, List[Any]]:
+        """Inverso de `encode_cursor`; lanza `InvalidCursor` si no es válido."""
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            direction, raw_values = json.loads(base64.urlsafe_b64decode(padded))
+        except (binascii.Error, ValueError, TypeError) as exc:
+            raise InvalidCursor(cursor) from exc
+        if (
+            direction not in (FORWARD, BACKWARD)
+            or not isinstance(raw_values, list)
+            or len(raw_values) != len(self.keys)
+        ):
+            raise InvalidCursor(cursor)
+
+        values = []
+        for (name, _), raw in zip(self.keys, raw_values):
+            try:
+                field = self.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                values.append(raw)  # anotación: se usa tal cual
+                continue
+            try:
+                values.append(None if raw is None else field.to_python(raw))
+            except ValidationError as exc:
+                raise InvalidCursor(cursor) from exc
+        return direction, values
+
+    def _after(self, values: List[Any], reverse: bool) -> Q:
+        """
+        Condición «fila posterior al cursor» según el orden.
+
+        Equivale a `(k1, k2, …) > (v1, v2, …)` y se antepone `k1 >= v1`
+        para que el motor pueda resolverla con un rango sobre el índice.
+        """
+        condition = Q()
+        for i, (name, desc) in enumerate(self.keys):
+            lookup = "lt" if desc != reverse else "gt"
+            clause = Q(**{f"{name}__{lookup}": values[i]})
+            for j, (prev_name, _) in enumerate(self.keys[:i]):
+                clause &= Q(**{prev_name: values[j]})
+            condition |= clause
+        first_name, first_desc = self.keys[0]
+        bound = "lte" if first_desc != reverse else "gte"
+        return Q(**{f"{first_name}__{bound}": values[0]}) & condition
+
+    # ------------------------------------------------------------------
+    # API pública
+    # ------------------------------------------------------------------
+    def page(self, cursor: Optional[str] = None) -> KeysetPage:
+        """Devuelve la página indicada por `cursor` (o la primera)."""
+        direction, values = (FORWARD, None)
+        if cursor:
+            direction, values = self.decode_cursor(cursor)
+        reverse = direction == BACKWARD
+
+        qs = self.queryset.order_by(*self._order_by(reverse))
+        if values is not None:
+            qs = qs.filter(self._after(values, reverse))
+        rows = list(qs[: self.per_page + 1])
+
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if reverse:
+            rows.reverse()
+            return KeysetPage(rows, self, has_next=True, has_previous=has_more)
+        return KeysetPage(rows, self, has_next=has_more, has_previous=values is not None)
+
+
+class KeysetPaginationMixin:
+    """
+    Reemplaza la paginación por número de página de `ListView` por cursores.
+
+    Ejemplo de uso:
+        class CatalogListView(KeysetPaginationMixin, ListView):
+            model = Product
+            ordering = ["title"]
+            paginate_by = 12
+
+    El cursor viaja en `?cursor=`; el resto de los parámetros GET (p. ej.
+    `search`) se conservan en los enlaces `page_obj.next_query` y
+    `page_obj.previous_query`.
+    """
+
+    cursor_kwarg = "cursor"
+
+    def paginate_queryset(self, queryset, page_size):  # type: ignore[override]
+        paginator = KeysetPaginator(queryset, page_size)
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidCursor:
+            raise Http404("Cursor de paginación inválido.")
+        page.next_query = self._cursor_query(page.next_cursor)
+        page.previous_query = self._cursor_query(page.previous_cursor)
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def _cursor_query(self, cursor: Optional[str]) -> str:
+        """Querystring actual con el cursor reemplazado."""
+        if not cursor:
+            return ""
+        params = self.request.GET.copy()
+        params[self.cursor_kwarg] = cursor
+        return params.urlencode()
+
+
+# ──────────────────────────────────────────────────────────────
+# Paginación numerada con conteo estimado (admin)
+# ──────────────────────────────────────────────────────────────
+def estimated_table_rows(model) -> Optional[int]:
+    """
+    Filas aproximadas de la tabla de `model` sin recorrerla, o `None`.
+
+    PostgreSQL: estadística `reltuples`. SQLite: `MAX(rowid)` (lectura
+    del extremo del árbol; cuenta de más si hubo bajas).
+    """
+    connection = connections[model.objects.db]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [table])
+        elif connection.vendor == "sqlite":
+            cursor.execute(f'SELECT MAX(rowid) FROM "{table}"')
+        else:
+            return None
+        row = cursor.fetchone()
+    return int(row[0]) if row and row[0] is not None and row[0] >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    `Paginator` que nunca cuenta más de `exact_limit` filas.
+
+    El conteo es un `COUNT(*)` sobre una subconsulta con `LIMIT
+    exact_limit + 1`: exacto para listados chicos y de costo acotado para
+    los grandes. Si se supera el límite y el queryset no tiene filtros se
+    usa la estimación de la tabla (`estimated_table_rows`); con filtros,
+    el límite (las páginas posteriores se alcanzan refinando la búsqueda).
+
+    Ejemplo de uso:
+        class ProductAdmin(admin.ModelAdmin):
+            paginator = EstimatedCountPaginator
+            show_full_result_count = False
+    """
+
+    exact_limit = 10_000
+
+    @cached_property
+    def count(self) -> int:  # type: ignore[override]
+        qs = self.object_list
+        if not isinstance(qs, QuerySet):
+            return super().count
+        capped = qs.order_by()[: self.exact_limit + 1].count()
+        if capped <= self.exact_limit:
+            return capped
+        if not qs.query.where:
+            estimate = estimated_table_rows(qs.model)
+            if estimate:
+                return max(estimate, capped)
+        return self.exact_limit
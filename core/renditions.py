@@ -0,0 +1,290 @@
+"""
+core/renditions.py
+──────────────────
+Variantes reducidas («renditions») de las imágenes subidas.
+
+Por cada imagen (`Product.image`, `Post.image`) se generan versiones de
+ancho fijo en WebP y, si Pillow lo soporta, AVIF, más una miniatura de
+tamaño fijo (recorte centrado, JPEG) para listados compactos:
+
+    media/renditions/<ruta original sin extensión>/<ancho>.<formato>
+    media/renditions/<ruta original sin extensión>/thumb-<ancho>x<alto>.jpg
+
+La generación corre fuera del ciclo request/response: al confirmarse la
+transacción se encola en un `ProcessPoolExecutor` (Pillow es CPU-bound).
+Mientras tanto las plantillas siguen usando el original.
+
+Incluye:
+- RENDITION_WIDTHS     : anchos disponibles por nombre.
+- schedule_renditions  : encola la generación (post-commit, en background).
+- generate_renditions  : genera las variantes y su manifiesto (idempotente).
+- get_manifest         : dimensiones originales y variantes disponibles.
+- get_dimensions       : (ancho, alto) del original, con o sin manifiesto.
+- discard_renditions   : borra variantes y manifiesto (imagen reemplazada o borrada).
+
+Las imágenes subidas antes de existir este módulo se procesan con
+`python manage.py generate_renditions`.
+
+Ajustes opcionales (settings)
+─────────────────────────────
+• RENDITIONS_ASYNC   (bool, True) – False genera en el mismo proceso.
+• RENDITION_WORKERS  (int, 2)     – procesos del pool.
+"""
+
+import atexit
+import json
+import logging
+import posixpath
+from concurrent.futures import Future, ProcessPoolExecutor
+from io import BytesIO
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.images import get_image_dimensions
+from django.core.files.storage import default_storage
+from django.db import transaction
+from PIL import Image, ImageOps, features
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "RENDITION_WIDTHS",
+    "rendition_formats",
+    "schedule_renditions",
+    "generate_renditions",
+    "get_manifest",
+    "get_dimensions",
+    "discard_renditions",
+]
+
+# nombre → ancho máximo en píxeles (se conserva la proporción)
+RENDITION_WIDTHS: Dict[str, int] = {
+    "thumb": 240,
+    "card": 480,
+    "large": 960,
+}
+
+# Miniatura de tamaño fijo (recorte centrado): listados del panel
+THUMBNAIL_SIZE = (120, 120)
+
+# Soporte del Pillow instalado: se consulta una vez, al importar
+AVIF_SUPPORTED = bool(features.check("avif"))
+WEBP_SUPPORTED = bool(features.check("webp"))
+
+QUALITY = {"webp": 80, "avif": 60, "jpeg": 85}
+RENDITIONS_PREFIX = "renditions"
+
+# Caché de manifiestos: positiva sin vencimiento, negativa por poco tiempo
+CACHE_PREFIX = "rendition:"
+SIZE_CACHE_PREFIX = "rendition-size:"
+MISSING_TIMEOUT = 60
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def rendition_formats() -> Tuple[str, ...]:
+    """Formatos soportados por el Pillow instalado, del más liviano al más compatible."""
+    formats = []
+    if AVIF_SUPPORTED:
+        formats.append("avif")
+    if WEBP_SUPPORTED:
+        formats.append("webp")
+    return tuple(formats)
+
+
+def rendition_name(name: str, width: int, fmt: str) -> str:
+    """Ruta en el storage de la variante `width`/`fmt` de la imagen `name`."""
+    stem, _ = posixpath.splitext(name)
+    return posixpath.join(RENDITIONS_PREFIX, stem, f"{width}.{fmt}")
+
+
+# ------------------------------------------------------------------
+# Generación (corre en el pool de procesos)
+# ------------------------------------------------------------------
+def thumbnail_name(name: str) -> str:
+    """Ruta en el storage de la miniatura de tamaño fijo de `name`."""
+    stem, _ = posixpath.splitext(name)
+    width, height = THUMBNAIL_SIZE
+    return posixpath.join(RENDITIONS_PREFIX, stem, f"thumb-{width}x{height}.jpg")
+
+
+def manifest_name(name: str) -> str:
+    """Ruta del manifiesto JSON con las variantes y dimensiones de `name`."""
+    stem, _ = posixpath.splitext(name)
+    return posixpath.join(RENDITIONS_PREFIX, stem, "manifest.json")
+
+
+def generate_renditions(name: str) -> Dict[str, Any]:
+    """
+    Genera las variantes de `name` que falten y devuelve su manifiesto.
+
+    Es idempotente: las variantes ya existentes no se recalculan. No se
+    amplía: los anchos mayores que el original se omiten. El manifiesto
+    (`{"width", "height", "renditions": {formato: [[ancho, ruta], …]},
+    "thumbnail": [ancho, alto, ruta]}`) se guarda junto a las variantes
+    para no volver a abrir la imagen.
+    """
+    formats = rendition_formats()
+    with default_storage.open(name, "rb") as original:
+        image = ImageOps.exif_transpose(Image.open(original))
+        image.load()
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+
+    manifest: Dict[str, Any] = {
+        "width": image.width,
+        "height": image.height,
+        "renditions": {fmt: [] for fmt in formats},
+    }
+    for width in sorted(set(RENDITION_WIDTHS.values())):
+        if width > image.width:
+            continue
+        resized = image.copy()
+        resized.thumbnail((width, width * 4), Image.Resampling.LANCZOS)
+        for fmt in formats:
+            target = rendition_name(name, width, fmt)
+            if not default_storage.exists(target):
+                buffer = BytesIO()
+                resized.save(buffer, format=fmt.upper(), quality=QUALITY[fmt])
+                target = default_storage.save(target, ContentFile(buffer.getvalue()))
+            manifest["renditions"][fmt].append([resized.width, target])
+
+    target = thumbnail_name(name)
+    if not default_storage.exists(target):
+        thumb = ImageOps.fit(image, THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
+        if thumb.mode == "RGBA":  # JPEG no admite transparencia: fondo blanco
+            background = Image.new("RGB", thumb.size, "white")
+            background.paste(thumb, mask=thumb.getchannel("A"))
+            thumb = background
+        buffer = BytesIO()
+        thumb.save(buffer, format="JPEG", quality=QUALITY["jpeg"])
+        target = default_storage.save(target, ContentFile(buffer.getvalue()))
+    manifest["thumbnail"] = [*THUMBNAIL_SIZE, target]
+
+    target = manifest_name(name)
+    if default_storage.exists(target):
+        default_storage.delete(target)
+    default_storage.save(target, ContentFile(json.dumps(manifest).encode()))
+    return manifest
+
+
+def _init_worker() -> None:
+    """Inicializa Django en procesos creados con `spawn` (macOS / Windows)."""
+    import django
+
+    django.setup()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=getattr(settings, "RENDITION_WORKERS", 2),
+            initializer=_init_worker,
+        )
+        atexit.register(_executor.shutdown, wait=False)
+    return _executor
+
+
+def schedule_renditions(name: str, on_ready: Optional[Callable[[], None]] = None) -> None:
+    """
+    Encola la generación de variantes de `name` al confirmar la transacción.
+
+    `on_ready` se ejecuta en este proceso cuando las variantes existen
+    (p. ej. para invalidar fragmentos cacheados que usaban el original).
+    """
+    if not name or not rendition_formats() or cache.get(CACHE_PREFIX + name):
+        return  # sin imagen, sin soporte o ya generadas
+
+    def finish(manifest: Dict[str, Any]) -> None:
+        cache.set(CACHE_PREFIX + name, manifest, timeout=None)
+        if on_ready is not None:
+            on_ready()
+
+    def done(future: Future) -> None:
+        try:
+            finish(future.result())
+        except Exception:  # noqa: BLE001 – el original sigue sirviéndose
+            logger.exception("No se pudieron generar las variantes de %s", name)
+
+    def submit() -> None:
+        if getattr(settings, "RENDITIONS_ASYNC", True):
+            _get_executor().submit(generate_renditions, name).add_done_callback(done)
+        else:
+            finish(generate_renditions(name))
+
+    transaction.on_commit(submit)
+
+
+# ------------------------------------------------------------------
+# Consulta (camino del request: nunca abre la imagen)
+# ------------------------------------------------------------------
+def get_manifest(name: str) -> Dict[str, Any]:
+    """
+    Manifiesto de `name` (memoizado en caché) o `{}` si aún no existe.
+
+    Ante un fallo de caché (otro proceso lo generó, o se vació) se lee el
+    JSON del storage una sola vez; la ausencia se recuerda unos segundos.
+    """
+    if not name:
+        return {}
+    manifest = cache.get(CACHE_PREFIX + name)
+    if manifest is None:
+        try:
+            with default_storage.open(manifest_name(name), "rb") as fh:
+                manifest = json.loads(fh.read())
+        except (OSError, ValueError):
+            cache.set(CACHE_PREFIX + name, {}, MISSING_TIMEOUT)
+            return {}
+        cache.set(CACHE_PREFIX + name, manifest, timeout=None)
+    return manifest
+
+
+def get_dimensions(name: str) -> Optional[Tuple[int, int]]:
+    """
+    (ancho, alto) de la imagen `name`, o `None` si no se puede leer.
+
+    Salen del manifiesto; mientras no exista se lee la cabecera del
+    original una sola vez (`get_image_dimensions` no decodifica la imagen)
+    y el resultado queda en caché.
+    """
+    manifest = get_manifest(name)
+    if manifest:
+        return manifest["width"], manifest["height"]
+    if not name:
+        return None
+    size = cache.get(SIZE_CACHE_PREFIX + name)
+    if size is None:
+        try:
+            with default_storage.open(name, "rb") as fh:
+                size = get_image_dimensions(fh)
+        except OSError:
+            size = (None, None)
+        if None in size:
+            cache.set(SIZE_CACHE_PREFIX + name, (), MISSING_TIMEOUT)
+            return None
+        cache.set(SIZE_CACHE_PREFIX + name, tuple(size), timeout=None)
+    return tuple(size) or None
+
+
+# ------------------------------------------------------------------
+# Limpieza
+# ------------------------------------------------------------------
+def delete_renditions(name: str) -> None:
+    """Borra del storage las variantes, la miniatura y el manifiesto de `name`."""
+    folder = posixpath.dirname(manifest_name(name))
+    try:
+        _, files = default_storage.listdir(folder)
+    except OSError:  # nunca se generaron
+        files = []
+    for filename in files:
+        default_storage.delete(posixpath.join(folder, filename))
+    cache.delete_many([CACHE_PREFIX + name, SIZE_CACHE_PREFIX + name])
+
+
+def discard_renditions(name: str) -> None:
+    """Programa `delete_renditions(name)` para cuando se confirme la transacción."""
+    if name:
+        transaction.on_commit(lambda: delete_renditions(name))
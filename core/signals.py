@@ -1,14 +1,44 @@
+"""
+core/signals.py
+───────────────
+Señales de la app Core.
+
+• Crea el `Profile` de cada usuario nuevo.
+• Copia nombre, apellido, correo, teléfono y dirección de `User` +
+  `Profile` a la ficha `Client` que ven los empleados.
+
+Sincronización de `Client`
+──────────────────────────
+No se hace en el request: se encola una tarea `client.sync` en el outbox
+(`core/outbox.py`), en la misma transacción y **una sola por usuario**
+mientras no se haya tomado (`dedupe_key`): un alta (User + Profile) o una
+edición de perfil (User y Profile en el mismo POST) dejan una tarea. El
+worker lee User, Profile y Client en una consulta y escribe solo las
+columnas que cambiaron (`update_fields`), o nada. Los guardados que no
+tocan campos copiados (p. ej. `last_login` al iniciar sesión) no encolan.
+
+`Profile` sí se crea en el momento: el registro y la edición de perfil
+lo usan en el mismo request.
+"""
+
+from typing import Dict
+
+from django.contrib.auth.models import User
 from django.db.models.signals import post_save
 from django.dispatch import receiver
-from django.contrib.auth.models import User
-from .models import Profile
+
 from client.models import Client
+from . import outbox
+from .models import Profile
 
 #@receiver(post_save, sender=User)
 #def create_profile(sender, instance, created, **kwargs):
 #    if created:
 #        Profile.objects.create(user=instance)
 
+USER_SYNC_FIELDS = {"first_name", "last_name", "email"}
+PROFILE_SYNC_FIELDS = {"phone", "address"}
+
 
 # ── crear Profile cuando se crea el usuario ──────────────────────────────────
 @receiver(post_save, sender=User)
@@ -18,18 +48,69 @@ def create_profile(sender, instance, created, **kwargs):
 
 
 # ── sincronizar Client con cambios en Profile y User ─────────────────────────
+def client_values(user: User) -> Dict[str, str]:
+    """Valores de `Client` que se copian de `user` (y de su Profile, si tiene)."""
+    values = {
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "email": user.email,
+    }
+    try:
+        profile = user.profile
+    except Profile.DoesNotExist:
+        return values
+    values.update(phone=profile.phone, address=profile.address)
+    return values
+
+
+@outbox.handler("client.sync")
+def sync_client(user_id: int) -> None:
+    """
+    Crea o actualiza el Client de `user_id` escribiendo solo lo que cambió.
+
+    Una consulta (User + Profile + Client por `select_related`) y, a lo
+    sumo, un INSERT o un UPDATE de las columnas distintas.
+    """
+    user = (
+        User.objects.select_related("profile", "client_record")
+        .filter(pk=user_id)
+        .first()
+    )
+    if user is None:
+        return  # borrado antes de que corriera la tarea
+    values = client_values(user)
+    try:
+        client = user.client_record
+    except Client.DoesNotExist:
+        Client.objects.create(user=user, **values)
+        return
+    changed = [field for field, value in values.items() if getattr(client, field) != value]
+    for field in changed:
+        setattr(client, field, values[field])
+    if changed:
+        client.save(update_fields=changed)
+
+
+def schedule_client_sync(user_id: int) -> None:
+    """Encola `client.sync` para `user_id` (sin duplicar una pendiente)."""
+    outbox.enqueue(
+        "client.sync", {"user_id": user_id}, dedupe_key=f"client.sync:{user_id}"
+    )
+
+
+@receiver(post_save, sender=User)
+def sync_client_with_user(sender, instance, created, update_fields=None, **kwargs):
+    """Nombre, apellido o correo del usuario cambiaron (o pudieron cambiar)."""
+    if created:
+        return  # la encola el Profile recién creado
+    if update_fields is not None and not USER_SYNC_FIELDS & set(update_fields):
+        return
+    schedule_client_sync(instance.pk)
+
+
 @receiver(post_save, sender=Profile)
-def sync_client_with_profile(sender, instance, **kwargs):
-    """Actualiza o crea el registro Client cada vez que se guarda Profile."""
-    user = instance.user
-
-    # crea Client si no existe
-    client, _ = Client.objects.get_or_create(user=user)
-
-    # copia datos
-    client.first_name = user.first_name
-    client.last_name  = user.last_name
-    client.email      = user.email
-    client.phone      = instance.phone
-    client.address    = instance.address
-    client.save()
+def sync_client_with_profile(sender, instance, update_fields=None, **kwargs):
+    """Teléfono o dirección del perfil cambiaron (o pudieron cambiar)."""
+    if update_fields is not None and not PROFILE_SYNC_FIELDS & set(update_fields):
+        return
+    schedule_client_sync(instance.user_id)
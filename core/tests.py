@@ -1,6 +1,12 @@
-from django.test import TestCase
+import re
+
+from django.db.models import Q
+from django.test import TestCase, override_settings
 from django.urls import reverse
-from .models import Profile
+from . import outbox
+from .models import OutboxJob, Profile
+from .pagination import EstimatedCountPaginator
+from .text import normalize_text, prefix_q
 from django.contrib.auth import get_user_model
 
 class ProfileModelTest(TestCase):
@@ -28,3 +34,318 @@ class AboutViewTest(TestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
         self.assertIn(b'Acerca de', response.content)
+
+class TextNormalizationTest(TestCase):
+    def test_normalize_text_folds_accents_case_and_spaces(self):
+        self.assertEqual(normalize_text("  García   MÁRQUEZ "), "garcia marquez")
+        self.assertEqual(normalize_text(""), "")
+
+    def test_prefix_q_builds_half_open_range(self):
+        self.assertEqual(
+            prefix_q("name_norm", "Garc"),
+            Q(name_norm__gte="garc", name_norm__lt="gard"),
+        )
+
+
+class EstimatedCountPaginatorTest(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        for i in range(5):
+            User.objects.create_user(username=f"u{i}")
+        self.qs = User.objects.order_by("pk")
+
+    def test_exact_below_limit(self):
+        self.assertEqual(EstimatedCountPaginator(self.qs, 2).count, 5)
+
+    def test_capped_count_above_limit(self):
+        paginator = EstimatedCountPaginator(self.qs.filter(username__startswith="u"), 2)
+        paginator.exact_limit = 3
+        with self.assertNumQueries(1):
+            self.assertEqual(paginator.count, 3)
+
+    def test_unfiltered_uses_table_estimate(self):
+        paginator = EstimatedCountPaginator(self.qs, 2)
+        paginator.exact_limit = 3
+        self.assertGreaterEqual(paginator.count, 5)
+
+
+class ListQueryPlanTest(TestCase):
+    """Los listados se resuelven por índice: sin recorrer la tabla ni ordenar aparte."""
+
+    @classmethod
+    def setUpTestData(cls):
+        from blog.models import Category as PostCategory, Post
+        from client.models import Client
+        from product.models import Category, Product
+
+        cls.staff = get_user_model().objects.create_user(
+            username="staff", password="pass", is_staff=True
+        )
+        cls.category = Category.objects.create(name="Novela")
+        cls.post_category = PostCategory.objects.create(name="Reseñas")
+        for i in range(15):
+            Product.objects.create(
+                title=f"Libro {i:02d}", author="Autor", description="-",
+                price=10, stock=i % 4, category=cls.category,
+            )
+            Post.objects.create(title=f"Post {i}", content="-", category=cls.post_category)
+            Client.objects.create(first_name=f"Ana {i}", last_name="Pérez")
+
+    # Recorridos aceptados a sabiendas: (consulta, paso del plan, motivo)
+    ALLOWED_STEPS = [
+        (
+            r'^SELECT COUNT\("product_product"\."id"\) FILTER', r"^SCAN product_product$",
+            "conteos de facetas: una pasada agregada, cacheada por versión del catálogo",
+        ),
+        (
+            r"\w+_fts MATCH", r"^USE TEMP B-TREE FOR ORDER BY$",
+            "orden por relevancia (BM25) de las coincidencias del índice FTS",
+        ),
+        (
+            r"instr\(", r"^USE TEMP B-TREE FOR ORDER BY$",
+            "clientes: reordena por ranking los ids ya acotados (SEARCH_LIMIT)",
+        ),
+    ]
+
+    def _plans(self, url, table):
+        """GET `url` y el plan de cada SELECT que toca `table` (o su índice FTS)."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        plans = []
+        with connection.cursor() as cursor:
+            for query in ctx.captured_queries:
+                sql = query["sql"]
+                if sql.startswith("SELECT") and table in sql:
+                    cursor.execute("EXPLAIN QUERY PLAN " + sql)
+                    plans.append((sql, [row[-1] for row in cursor.fetchall()]))
+        self.assertTrue(plans, f"{url} no consultó {table}")
+        return response, plans
+
+    def _allowed(self, sql, step):
+        return any(
+            re.search(query, sql) and re.search(allowed, step)
+            for query, allowed, _reason in self.ALLOWED_STEPS
+        )
+
+    def assert_indexed(self, url, table):
+        """
+        Falla ante un recorrido completo u ordenamiento aparte no listado;
+        devuelve la respuesta y las consultas revisadas.
+        """
+        response, plans = self._plans(url, table)
+        for sql, plan in plans:
+            for step in plan:
+                if self._allowed(sql, step):
+                    continue
+                self.assertNotRegex(step, r"^SCAN \w+$", f"{url}: {plan}\n{sql}")
+                self.assertNotIn("TEMP B-TREE", step, f"{url}: {plan}\n{sql}")
+        return response, [sql for sql, _plan in plans]
+
+    def test_list_views_use_indexes(self):
+        from django.core.cache import cache
+
+        cache.clear()  # los feeds y las facetas se sirven desde caché
+        self.client.login(username="staff", password="pass")
+        catalog = reverse("product:catalog_view")
+        response, checked = self.assert_indexed(catalog, "product_product")
+        self.assertTrue([sql for sql in checked if " FILTER " in sql])  # facetas
+        self.assert_indexed(f"{catalog}?{response.context['page_obj'].next_query}", "product_product")
+        self.assert_indexed(f"{catalog}?category={self.category.pk}", "product_product")
+        self.assert_indexed(reverse("product:product_list"), "product_product")
+        self.assert_indexed(reverse("blog:post_list"), "blog_post")
+        self.assert_indexed(reverse("client:client_list"), "client_client")
+        self.assert_indexed(reverse("product:new_products_feed"), "product_product")
+        self.assert_indexed(reverse("blog:post_feed"), "blog_post")
+        self.assert_indexed(
+            reverse("blog:post_category_feed", args=[self.post_category.pk]), "blog_post"
+        )
+
+    def test_searches_use_indexes(self):
+        self.client.login(username="staff", password="pass")
+        searches = [
+            (reverse("product:catalog_view"), "libro", "product_product"),
+            (reverse("product:product_list"), "libro", "product_product"),
+            (reverse("blog:post_list"), "post", "blog_post"),
+            (reverse("client:client_list"), "ana", "client_client"),
+            (reverse("client:client_list"), "perez", "client_client"),
+        ]
+        for url, query, table in searches:
+            _response, checked = self.assert_indexed(f"{url}?search={query}", table)
+            self.assertTrue([sql for sql in checked if f"{table}_fts" in sql], url)
+
+
+@override_settings(OUTBOX_ASYNC=True)  # como en producción: encola para el worker
+class ClientSyncTest(TestCase):
+    """Profile/User → Client: una tarea de outbox por usuario, solo lo que cambió."""
+
+    PROFILE_DATA = {
+        "first_name": "Ana", "last_name": "Pérez", "email": "ana@correo.com",
+        "phone": "3515551234", "address": "Calle 123",
+    }
+
+    def register(self):
+        from .forms import CustomUserCreationForm
+        form = CustomUserCreationForm({
+            **self.PROFILE_DATA, "first_name": "ana", "email": "Ana@Correo.com",
+            "username": "ana", "password1": "Zx9!kqpwLm", "password2": "Zx9!kqpwLm",
+        })
+        self.assertTrue(form.is_valid(), form.errors)
+        # Savepoint, User, Profile, tarea, teléfono/dirección, tarea (ya
+        # encolada: no inserta), release. Client no se toca en el request.
+        with self.assertNumQueries(7):
+            user = form.save()
+        self.assertEqual(OutboxJob.objects.count(), 1)
+        return user
+
+    def run_outbox(self):
+        self.assertEqual(outbox.process_batch(), (1, 0))
+        self.assertFalse(OutboxJob.objects.exists())
+
+    def test_registration_creates_client_in_worker(self):
+        from client.models import Client
+        user = self.register()
+        self.assertFalse(Client.objects.exists())
+        self.run_outbox()
+        client = Client.objects.get(user=user)
+        self.assertEqual(
+            (client.first_name, client.last_name, client.email, client.phone, client.address),
+            ("Ana", "Pérez", "ana@correo.com", "3515551234", "Calle 123"),
+        )
+
+    def test_profile_edit_writes_only_changed_columns(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from client.models import Client
+        self.client.force_login(self.register())
+        self.run_outbox()
+        url = reverse("core:profile")
+
+        # Sin cambios: sesión, usuario y perfil; ninguna escritura
+        with self.assertNumQueries(3):
+            self.client.post(url, self.PROFILE_DATA)
+        self.assertFalse(OutboxJob.objects.exists())
+
+        # Solo el teléfono: UPDATE de Profile y, en el worker, de Client
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.post(url, {**self.PROFILE_DATA, "phone": "3515559999"})
+            self.run_outbox()
+        updates = [
+            q["sql"] for q in ctx.captured_queries
+            if q["sql"].startswith(("UPDATE \"core_profile\"", "UPDATE \"client_client\""))
+        ]
+        self.assertEqual(len(updates), 2)
+        self.assertTrue(all('SET "phone"' in sql and "address" not in sql for sql in updates))
+        self.assertEqual(Client.objects.get().phone, "3515559999")
+
+    def test_invalid_edit_loads_profile_once(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        self.client.force_login(self.register())
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(
+                reverse("core:profile"), {**self.PROFILE_DATA, "email": "no-es-correo"}
+            )
+        self.assertEqual(response.status_code, 200)  # se re-renderiza con errores
+        profile_selects = [
+            q for q in ctx.captured_queries if q["sql"].startswith('SELECT "core_profile"')
+        ]
+        self.assertEqual(len(profile_selects), 1)
+
+    def test_user_changes_sync_and_login_does_not(self):
+        from client.models import Client
+        user = self.register()
+        self.run_outbox()
+        user.save(update_fields=["last_login"])
+        self.assertFalse(OutboxJob.objects.exists())
+
+        user.last_name = "Gómez"
+        user.save()
+        self.run_outbox()
+        self.assertEqual(Client.objects.get().last_name, "Gómez")
+
+
+class UserLookupTest(TestCase):
+    """Correo y usuario únicos sin distinguir mayúsculas, por índice."""
+
+    def setUp(self):
+        from django.contrib.auth.models import User
+        self.user = User.objects.create_user("Ana", email="Ana@Correo.com", password="x")
+
+    def test_lookups_ignore_case_and_use_indexes(self):
+        from django.db import connection
+        from .models import USER_EMAIL_INDEX, USER_USERNAME_INDEX, users_by_email, users_by_username
+        self.assertEqual(list(users_by_email("ana@CORREO.com")), [self.user])
+        self.assertEqual(list(users_by_username("ANA")), [self.user])
+        if connection.vendor != "sqlite":
+            return
+        for qs, index in (
+            (users_by_email("x@y.com"), USER_EMAIL_INDEX),
+            (users_by_username("x"), USER_USERNAME_INDEX),
+        ):
+            sql, params = qs.query.sql_with_params()
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+                plan = " ".join(row[-1] for row in cursor.fetchall())
+            self.assertIn(index, plan)
+
+    def test_registration_and_password_reset_use_lookups(self):
+        from .forms import CustomUserCreationForm, EmailPasswordResetForm
+        form = CustomUserCreationForm({
+            "username": "ANA", "first_name": "Otra", "last_name": "Ana",
+            "email": "ANA@correo.com", "password1": "Zx9!kqpwLm", "password2": "Zx9!kqpwLm",
+        })
+        self.assertFalse(form.is_valid())
+        self.assertEqual(set(form.errors), {"username", "email"})
+        self.assertEqual(list(EmailPasswordResetForm().get_users("ana@correo.COM")), [self.user])
+
+
+@outbox.handler("tests.flaky")
+def flaky_task(fail: bool = True) -> None:
+    if fail:
+        raise RuntimeError("falla de prueba")
+
+
+@override_settings(OUTBOX_ASYNC=True)  # como en producción: encola para el worker
+class OutboxTest(TestCase):
+    def test_dedupe_until_claimed(self):
+        outbox.enqueue("tests.flaky", {"fail": False}, dedupe_key="k")
+        outbox.enqueue("tests.flaky", {"fail": False}, dedupe_key="k")
+        self.assertEqual(OutboxJob.objects.count(), 1)
+        self.assertEqual(len(outbox.claim()), 1)
+        self.assertEqual(outbox.claim(), [])  # tomada: otro worker no la ve
+        outbox.enqueue("tests.flaky", {"fail": False}, dedupe_key="k")
+        self.assertEqual(OutboxJob.objects.count(), 2)
+
+    def test_unknown_task_is_rejected(self):
+        with self.assertRaises(ValueError):
+            outbox.enqueue("tests.inexistente")
+
+    @override_settings(OUTBOX_MAX_ATTEMPTS=2)
+    def test_retry_with_backoff_then_fail(self):
+        from django.utils import timezone
+        outbox.enqueue("tests.flaky")
+        with self.assertLogs("core.outbox", "ERROR"):
+            self.assertEqual(outbox.process_batch(), (0, 1))
+        job = OutboxJob.objects.get()
+        self.assertEqual(job.attempts, 1)
+        self.assertGreater(job.available_at, timezone.now())
+        self.assertIn("falla de prueba", job.last_error)
+        self.assertIsNone(job.failed_at)
+
+        OutboxJob.objects.update(available_at=timezone.now())
+        with self.assertLogs("core.outbox", "ERROR"):
+            outbox.process_batch()
+        job.refresh_from_db()
+        self.assertEqual(job.attempts, 2)
+        self.assertIsNotNone(job.failed_at)
+        self.assertEqual(outbox.claim(), [])
+
+    @override_settings(OUTBOX_ASYNC=False)
+    def test_sync_mode_runs_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            outbox.enqueue("tests.flaky", {"fail": False})
+        self.assertFalse(OutboxJob.objects.exists())
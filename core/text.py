@@ -0,0 +1,71 @@
+"""
+core/text.py
+────────────
+Utilidades de texto: normalización para búsquedas y resúmenes.
+
+Incluye:
+- normalize_text  : quita tildes, pasa a minúsculas y colapsa espacios.
+- prefix_q        : búsqueda por prefijo resuelta como rango sobre un índice.
+- plain_text      : HTML → texto plano (sin etiquetas ni entidades).
+- excerpt         : primeras palabras de un texto, con «…» si se recorta.
+- reading_minutes : minutos estimados de lectura.
+
+Ejemplo:
+    >>> normalize_text("  García  Márquez ")
+    'garcia marquez'
+    >>> Client.objects.filter(prefix_q("last_name_norm", "Garc"))
+"""
+
+import html
+import math
+import unicodedata
+
+from django.db.models import Q
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+__all__ = ["normalize_text", "prefix_q", "plain_text", "excerpt", "reading_minutes"]
+
+WORDS_PER_MINUTE = 200
+
+
+def normalize_text(value: str) -> str:
+    """Devuelve `value` sin diacríticos, en minúsculas y con espacios simples."""
+    if not value:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", value)
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(stripped.casefold().split())
+
+
+def prefix_q(field: str, value: str) -> Q:
+    """
+    Condición «`field` empieza con `value`» como rango semiabierto.
+
+    `LIKE 'abc%'` no siempre aprovecha el índice (SQLite lo descarta con
+    `ESCAPE` o collation NOCASE); un rango `>= 'abc' AND < 'abd'` sí.
+    El valor se normaliza con `normalize_text`, igual que las columnas
+    `*_norm` contra las que se compara.
+    """
+    value = normalize_text(value)
+    if not value:
+        return Q()
+    upper = value[:-1] + chr(min(ord(value[-1]) + 1, 0x10FFFF))
+    return Q(**{f"{field}__gte": value, f"{field}__lt": upper})
+
+
+def plain_text(value: str) -> str:
+    """Quita etiquetas HTML, resuelve entidades (`&amp;` → `&`) y colapsa espacios."""
+    if not value:
+        return ""
+    return " ".join(html.unescape(strip_tags(value)).split())
+
+
+def excerpt(text: str, words: int, max_length: int) -> str:
+    """Primeras `words` palabras de `text` (a lo sumo `max_length` caracteres)."""
+    return Truncator(Truncator(text).words(words)).chars(max_length)
+
+
+def reading_minutes(text: str) -> int:
+    """Minutos de lectura de `text` a `WORDS_PER_MINUTE` (al menos 1)."""
+    return max(1, math.ceil(len(text.split()) / WORDS_PER_MINUTE))
@@ -1,21 +1,45 @@
 """
 core/view_mixins.py
 ───────────────────
-Mixins de autorización reutilizables en todo el proyecto.
+Mixins reutilizables en todo el proyecto.
+
+Incluye:
+- StaffRequiredMixin    : autorización para personal `is_staff`.
+- MemoizedObjectMixin   : `get_object()` consulta una sola vez por request.
+- memoize_per_request   : ídem para otros métodos de búsqueda de la vista.
+- ConditionalGetMixin   : GET condicional (ETag) en detalles.
+- CsvExportMixin        : exportación CSV en streaming de un queryset.
 
 Convenciones
 ────────────
-- Solo contienen lógica de permisos (no vistas completas).
+- Solo contienen lógica transversal (no vistas completas).
 - Identificadores en inglés; docstrings y mensajes al usuario en español.
 """
 
-from typing import Any
+import csv
+import hashlib
+from datetime import datetime
+from functools import wraps
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple, TypeVar
 
 from django.contrib.auth.mixins import UserPassesTestMixin
-from django.http import HttpResponseRedirect
+from django.db.models import QuerySet
+from django.http import HttpResponseRedirect, StreamingHttpResponse
 from django.urls import reverse_lazy
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils import timezone
+
+from .cache import get_versions
+
+__all__ = [  # Export explícito
+    "StaffRequiredMixin",
+    "MemoizedObjectMixin",
+    "memoize_per_request",
+    "ConditionalGetMixin",
+    "CsvExportMixin",
+]
 
-__all__ = ["StaffRequiredMixin"]  # Export explícito
+T = TypeVar("T")
 
 
 # ──────────────────────────────────────────────────────────────
@@ -45,3 +69,205 @@ class StaffRequiredMixin(UserPassesTestMixin):
         - Redirige a la ruta “home” sin mostrar mensaje.
         """
         return HttpResponseRedirect(reverse_lazy("core:home"))
+
+
+# ──────────────────────────────────────────────────────────────
+# Memoización por request
+# ──────────────────────────────────────────────────────────────
+# Django crea una instancia de la vista por request (`as_view`): lo que se
+# guarda en ella vive exactamente lo que dura el request.
+def memoize_per_request(method: Callable[[Any], T]) -> Callable[[Any], T]:
+    """
+    Memoiza un método sin argumentos de la vista durante el request.
+
+    Ejemplo de uso:
+        @memoize_per_request
+        def _get_or_create_profile(self) -> Profile:
+            return Profile.objects.get_or_create(user=self.request.user)[0]
+    """
+    attr = f"_memo_{method.__name__}"
+
+    @wraps(method)
+    def wrapper(self) -> T:
+        if attr not in self.__dict__:
+            self.__dict__[attr] = method(self)
+        return self.__dict__[attr]
+
+    return wrapper
+
+
+class MemoizedObjectMixin:
+    """
+    `get_object()` consulta la base una sola vez por request.
+
+    Los mixins de permisos que revisan el objeto (`test_func`) y después
+    `UpdateView` / `DeleteView` piden el mismo objeto: la segunda llamada
+    reutiliza la instancia. Con un `queryset` explícito no se memoiza.
+    Debe ir antes de la vista genérica en las bases.
+
+    Ejemplo de uso:
+        class AuthorOrStaffRequiredMixin(MemoizedObjectMixin, UserPassesTestMixin):
+            def test_func(self):
+                return self.get_object().author == ...
+    """
+
+    def get_object(self, queryset=None):
+        if queryset is not None:
+            return super().get_object(queryset)  # type: ignore[misc]
+        if "_memoized_object" not in self.__dict__:
+            self._memoized_object = super().get_object()  # type: ignore[misc]
+        return self._memoized_object
+
+
+# ──────────────────────────────────────────────────────────────
+# Mixins de caché HTTP
+# ──────────────────────────────────────────────────────────────
+class ConditionalGetMixin:
+    """
+    Responde `304 Not Modified` a un GET/HEAD condicional sin renderizar.
+
+    Antes de despachar la vista se lee **solo** la marca de tiempo del
+    objeto (`SELECT updated_at ... WHERE pk = ...`), se arma la ETag y se
+    compara con `If-None-Match`. Si el cliente ya tiene la página, no se
+    carga el objeto ni se renderiza la plantilla.
+
+    La ETag incluye al usuario (la página muestra su nombre y botones de
+    staff) y la respuesta agrega `Vary: Cookie` para los proxies. También
+    incluye la versión de cada etiqueta de `etag_version_tags` (ver
+    `core/cache.py`), p. ej. el catálogo si la página muestra la barra de
+    navegación con los conteos por categoría.
+
+    No se envía `Last-Modified`: la representación depende de más cosas
+    que la fecha del objeto (usuario, etiquetas) y un `If-Modified-Since`
+    solo daría 304 con una página vieja. El único validador es la ETag.
+
+    Ejemplo de uso:
+        class ProductDetailView(ConditionalGetMixin, DetailView):
+            model = Product
+            last_modified_field = "updated_at"
+            etag_version_tags = (CATALOG_TAG,)
+    """
+
+    last_modified_field = "updated_at"
+    etag_version_tags: Sequence[str] = ()
+
+    # ----------------------------------------------------------
+    # Hooks
+    # ----------------------------------------------------------
+    def get_last_modified(self) -> Optional[datetime]:
+        """Marca de tiempo del objeto pedido (una consulta liviana)."""
+        return (
+            self.model._default_manager.filter(pk=self.kwargs.get("pk"))  # type: ignore[attr-defined]
+            .values_list(self.last_modified_field, flat=True)
+            .first()
+        )
+
+    def get_etag_parts(self, last_modified: datetime) -> List[Any]:
+        """Valores que identifican la representación; extensible en subclases."""
+        user = self.request.user  # type: ignore[attr-defined]
+        return [
+            self.model._meta.label,  # type: ignore[attr-defined]
+            self.kwargs.get("pk"),  # type: ignore[attr-defined]
+            last_modified.isoformat(),
+            user.pk,
+            user.is_staff,
+            *sorted(get_versions(self.etag_version_tags).items()),
+        ]
+
+    # ----------------------------------------------------------
+    # Dispatch
+    # ----------------------------------------------------------
+    def dispatch(self, request, *args: Any, **kwargs: Any):
+        if request.method not in ("GET", "HEAD"):
+            return super().dispatch(request, *args, **kwargs)  # type: ignore[misc]
+
+        last_modified = self.get_last_modified()
+        if last_modified is None:  # no existe: que la vista devuelva 404
+            return super().dispatch(request, *args, **kwargs)  # type: ignore[misc]
+
+        raw = "|".join(str(part) for part in self.get_etag_parts(last_modified))
+        etag = '"%s"' % hashlib.md5(raw.encode()).hexdigest()
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)  # type: ignore[misc]
+        if response.status_code in (200, 304):
+            response.headers.setdefault("ETag", etag)
+        patch_vary_headers(response, ("Cookie",))
+        return response
+
+
+# ──────────────────────────────────────────────────────────────
+# Mixins de exportación
+# ──────────────────────────────────────────────────────────────
+class _Echo:
+    """Pseudo-archivo para `csv.writer`: devuelve la línea en vez de guardarla."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+class CsvExportMixin:
+    """
+    Exporta un queryset como CSV con `StreamingHttpResponse`.
+
+    Las filas se leen con `values_list(...).iterator(chunk_size=...)`
+    (cursor del servidor donde el motor lo soporta) y se escriben a
+    medida que llegan: la memoria no depende del total de filas y el
+    encabezado sale antes de ejecutar la consulta.
+
+    Las celdas de texto que empiezan con `=`, `+`, `-` o `@` se prefijan
+    con `'` para que las planillas no las interpreten como fórmulas.
+
+    Ejemplo de uso:
+        class ProductExportView(LoginRequiredMixin, StaffRequiredMixin,
+                                CsvExportMixin, View):
+            export_filename = "productos"
+            export_columns = [("Título", "title"), ("Precio", "price")]
+
+            def get_export_queryset(self):
+                return Product.objects.order_by("title")
+    """
+
+    export_filename = "export"
+    export_columns: Sequence[Tuple[str, str]] = ()  # (encabezado, lookup)
+    export_chunk_size = 2000
+
+    # ----------------------------------------------------------
+    # Hooks
+    # ----------------------------------------------------------
+    def get_export_queryset(self) -> QuerySet:
+        raise NotImplementedError("Definí get_export_queryset() en la vista.")
+
+    def get_export_filename(self) -> str:
+        return f"{self.export_filename}-{timezone.localdate():%Y%m%d}.csv"
+
+    # ----------------------------------------------------------
+    # Streaming
+    # ----------------------------------------------------------
+    @staticmethod
+    def _safe_cell(value: Any) -> Any:
+        if value is None:
+            return ""
+        if isinstance(value, str) and value[:1] in ("=", "+", "-", "@"):
+            return "'" + value
+        return value
+
+    def iter_csv(self) -> Iterator[str]:
+        writer = csv.writer(_Echo())
+        yield "\ufeff"  # BOM: Excel detecta UTF-8
+        yield writer.writerow([header for header, _ in self.export_columns])
+        rows = self.get_export_queryset().values_list(
+            *[lookup for _, lookup in self.export_columns]
+        )
+        for row in rows.iterator(chunk_size=self.export_chunk_size):
+            yield writer.writerow([self._safe_cell(value) for value in row])
+
+    def get(self, request, *args: Any, **kwargs: Any) -> StreamingHttpResponse:
+        response = StreamingHttpResponse(
+            self.iter_csv(), content_type="text/csv; charset=utf-8"
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{self.get_export_filename()}"'
+        )
+        return response
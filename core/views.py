@@ -19,12 +19,14 @@ from typing import Any, Dict
 
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db import transaction
 from django.shortcuts import redirect
 from django.urls import reverse_lazy
 from django.views.generic import TemplateView, UpdateView
 
 from .forms import UserEditForm, ProfileEditForm
 from .models import Profile
+from .view_mixins import memoize_per_request
 
 
 class HomeView(TemplateView):
@@ -43,6 +45,8 @@ class ProfileUpdateView(LoginRequiredMixin, UpdateView):
     Notas:
         - Si el usuario aún no posee `Profile`, se crea automáticamente.
         - Se manejan dos formularios independientes dentro del mismo template.
+        - Se guardan solo los campos modificados, en una transacción: se
+          encola una sola sincronización de la ficha `Client` (outbox).
     """
 
     template_name = "core/profile.html"
@@ -52,9 +56,11 @@ class ProfileUpdateView(LoginRequiredMixin, UpdateView):
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
+    @memoize_per_request
     def _get_or_create_profile(self) -> Profile:
-        """Devuelve el Profile del usuario, creándolo si no existe."""
+        """Devuelve el Profile del usuario, creándolo si no existe (una vez por request)."""
         profile, _ = Profile.objects.get_or_create(user=self.request.user)
+        self.request.user.profile = profile  # `user.profile` en la plantilla no consulta
         return profile
 
     # ------------------------------------------------------------------
@@ -92,8 +98,12 @@ class ProfileUpdateView(LoginRequiredMixin, UpdateView):
         profile_form = ProfileEditForm(request.POST, instance=profile)
 
         if user_form.is_valid() and profile_form.is_valid():
-            user_form.save()
-            profile_form.save()
+            # Solo las columnas editadas; sin cambios no hay escrituras
+            changed = [form for form in (user_form, profile_form) if form.has_changed()]
+            if changed:
+                with transaction.atomic():
+                    for form in changed:
+                        form.save(commit=False).save(update_fields=form.changed_data)
             return redirect(self.success_url)
 
         # Si algún formulario falla, se re-renderiza la página con errores.
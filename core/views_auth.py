@@ -56,7 +56,8 @@ class UserRegisterView(CreateView):
     """
     Vista de registro extendido.
 
-    • Usa `CustomUserCreationForm`, que guarda `User`, `Profile` y `Client`.
+    • Usa `CustomUserCreationForm`, que guarda `User` y `Profile` (la ficha
+      `Client` la completa el worker del outbox).
     • Inicia sesión automáticamente tras el alta.
     """
 
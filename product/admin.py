@@ -1,11 +1,169 @@
-from django.contrib import admin
-from .models import Product, Category
+"""
+product/admin.py
+────────────────
+Administración del catálogo, pensada para cientos de miles de productos.
 
+- Sin N+1: `list_select_related` para la categoría.
+- Sin `COUNT(*)` completo: `FastChangeListAdmin` (conteo estimado).
+- Búsqueda por prefijo sobre `title_norm` / `author_norm` (indexadas).
+- Acciones masivas de un solo UPDATE: precio por porcentaje y stock
+  (`product/stock.py` mantiene contadores y cachés).
+- En la edición `stock` y `reserved` son de solo lectura: el stock se
+  cambia con «Nuevo stock», que aplica la diferencia (`stock.adjust`).
+"""
+
+from decimal import Decimal
+
+from django import forms
+from django.contrib import admin, messages
+from django.db import transaction
+from django.db.models import DecimalField, F, Value
+from django.db.models.functions import Round
+from django.utils import timezone
+
+from core.admin import FastChangeListAdmin
+
+from . import cards, stock
+from .cache import invalidate_catalog
+from .models import Category, Product
+
+MSG_STOCK_CONFLICT = (
+    "El stock no se modificó: cambió mientras editabas (ahora hay {stock} "
+    "unidades disponibles). Revisá la cantidad y volvé a guardar."
+)
+
+
+# ------------------------------------------------------------------
+# Acciones masivas
+# ------------------------------------------------------------------
+def _price_action(percent: int):
+    """Acción que multiplica el precio de la selección por `1 + percent/100`."""
+    factor = Decimal(100 + percent) / 100
+
+    @admin.action(description=f"{'Subir' if percent > 0 else 'Bajar'} precio {abs(percent)} %%")
+    def action(modeladmin, request, queryset):
+        with transaction.atomic():
+            category_ids = set(queryset.order_by().values_list("category_id", flat=True).distinct())
+            updated = queryset.update(
+                price=Round(
+                    F("price") * Value(factor, output_field=DecimalField()), 2,
+                    output_field=DecimalField(max_digits=8, decimal_places=2),
+                ),
+                updated_at=timezone.now(),
+            )
+
+        def run():
+            for pk in category_ids:
+                cards.invalidate_category(pk)
+            invalidate_catalog()
+
+        transaction.on_commit(run)
+        modeladmin.message_user(request, f"Precio actualizado en {updated} productos.")
+
+    action.__name__ = f"price_{'up' if percent > 0 else 'down'}_{abs(percent)}"
+    return action
+
+
+@admin.action(description="Sumar 10 unidades al stock")
+def add_ten_units(modeladmin, request, queryset):
+    updated = stock.bulk_add(queryset, 10)
+    modeladmin.message_user(request, f"Stock actualizado en {updated} productos.")
+
+
+@admin.action(description="Dejar sin stock")
+def clear_stock(modeladmin, request, queryset):
+    updated = stock.bulk_clear(queryset)
+    modeladmin.message_user(
+        request, f"{updated} productos quedaron sin stock.", messages.WARNING
+    )
+
+
+# ------------------------------------------------------------------
+# Formulario
+# ------------------------------------------------------------------
+class ProductAdminForm(forms.ModelForm):
+    """
+    Formulario del admin con el stock editable por diferencia.
+
+    Campos extra (solo en la edición):
+        • new_stock   – Stock deseado; vacío no lo cambia.
+        • stock_seen  – Stock que mostraba el formulario al abrirse.
+    `ProductAdmin.save_model` aplica `new_stock - stock_seen` con
+    `stock.adjust`, igual que `ProductUpdateView`.
+    """
+
+    new_stock = forms.IntegerField(
+        label="Nuevo stock", min_value=0, required=False,
+        help_text="Se suma o resta la diferencia con el stock mostrado.",
+    )
+    stock_seen = forms.IntegerField(widget=forms.HiddenInput, required=False)
+
+    class Meta:
+        model = Product
+        fields = "__all__"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.pk:
+            self.fields["stock_seen"].initial = self.instance.stock
+
+
+STOCK_FORM_FIELDS = ("new_stock", "stock_seen")
+
+
+# ------------------------------------------------------------------
+# ModelAdmins
+# ------------------------------------------------------------------
 @admin.register(Product)
-class ProductAdmin(admin.ModelAdmin):
-    list_display = ('title', 'author', 'price', 'stock', 'category')
+class ProductAdmin(FastChangeListAdmin):
+    form = ProductAdminForm
+    list_display = ("title", "author", "price", "stock", "reserved", "category")
+    list_select_related = ("category",)
+    list_filter = ("category",)
+    ordering = ("-pk",)
+    search_fields = ("title_norm", "author_norm")
+    autocomplete_fields = ("category",)
+    actions = [
+        _price_action(10), _price_action(5), _price_action(-10),
+        add_ten_units, clear_stock,
+    ]
 
-@admin.register(Category)
-class CategoryAdmin(admin.ModelAdmin):
-    list_display = ('name',)
+    def get_fields(self, request, obj=None):
+        fields = ["title", "author", "description", "price", "stock", "category", "image"]
+        if obj is not None:  # en el alta el stock inicial se escribe tal cual
+            fields[5:5] = ["reserved", *STOCK_FORM_FIELDS]
+        return fields
+
+    def get_readonly_fields(self, request, obj=None):
+        return ("reserved",) if obj is None else ("stock", "reserved")
 
+    def save_model(self, request, obj, form, change):
+        """
+        En la edición no escribe `stock` ni `reserved`: guarda el resto de
+        los campos y aplica la diferencia pedida con un UPDATE condicional.
+        """
+        if not change:
+            super().save_model(request, obj, form, change)
+            return
+        obj.save(update_fields=[
+            name for name in form.fields if name not in STOCK_FORM_FIELDS
+        ] + ["updated_at"])
+        new_stock = form.cleaned_data.get("new_stock")
+        if new_stock is None:
+            return
+        seen = form.cleaned_data.get("stock_seen")
+        if seen is None:
+            seen = obj.stock
+        try:
+            stock.adjust(obj.pk, new_stock - seen)
+        except stock.InsufficientStock:
+            current = Product.objects.values_list("stock", flat=True).get(pk=obj.pk)
+            self.message_user(
+                request, MSG_STOCK_CONFLICT.format(stock=current), messages.ERROR
+            )
+
+
+@admin.register(Category)
+class CategoryAdmin(FastChangeListAdmin):
+    list_display = ("name", "product_count", "in_stock_count")
+    search_fields = ("name_norm",)
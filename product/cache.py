@@ -0,0 +1,26 @@
+"""
+product/cache.py
+────────────────
+Etiquetas de caché del catálogo.
+
+Toda entrada derivada del catálogo (conteos de facetas, etc.) incluye en
+su clave `catalog_version()`; las señales de `product/signals.py` llaman a
+`invalidate_catalog()` ante cualquier cambio de `Product` o `Category`.
+
+Las operaciones masivas que no disparan señales (UPDATE por queryset,
+`bulk_create`, …) deben llamar a `invalidate_catalog()` explícitamente.
+"""
+
+from core.cache import bump_version, get_version
+
+CATALOG_TAG = "product:catalog"
+
+
+def catalog_version() -> int:
+    """Versión actual del catálogo completo."""
+    return get_version(CATALOG_TAG)
+
+
+def invalidate_catalog() -> None:
+    """Marca como obsoletas todas las entradas dependientes del catálogo."""
+    bump_version(CATALOG_TAG)
@@ -0,0 +1,118 @@
+"""
+product/cards.py
+────────────────
+Caché de fragmentos para las tarjetas del catálogo.
+
+Cada tarjeta (`product/_product_card.html`) se guarda en caché con una
+clave que incluye la versión del producto y la de su categoría:
+
+    product:card:<id>:<versión producto>:<versión categoría>
+
+Las señales de `product/signals.py` incrementan esas versiones, así que
+editar un producto invalida solo su tarjeta y renombrar una categoría solo
+las de sus productos. Una página del catálogo se arma con dos lecturas a
+la caché (versiones y fragmentos) y renderiza únicamente los faltantes.
+
+Incluye:
+- render_cards      : HTML de cada tarjeta, desde caché o renderizado.
+- invalidate_product / invalidate_category : incrementan versiones.
+- card_cache_stats  : contadores de aciertos y fallos.
+"""
+
+from typing import Dict, Iterable, List
+
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import SafeString, mark_safe
+
+from core.cache import bump_version, get_versions
+
+CARD_TEMPLATE = "product/_product_card.html"
+CARD_CACHE_TIMEOUT = 60 * 60 * 24  # las versiones ya invalidan; TTL solo libera memoria
+
+HITS_KEY = "product:card:stats:hits"
+MISSES_KEY = "product:card:stats:misses"
+
+
+def _product_tag(pk) -> str:
+    return f"product:card:{pk}"
+
+
+def _category_tag(pk) -> str:
+    return f"product:category:{pk}"
+
+
+def invalidate_product(pk) -> None:
+    """Invalida la tarjeta del producto `pk`."""
+    bump_version(_product_tag(pk))
+
+
+def invalidate_category(pk) -> None:
+    """Invalida las tarjetas de todos los productos de la categoría `pk`."""
+    bump_version(_category_tag(pk))
+
+
+def _count(key: str, amount: int) -> None:
+    if not amount:
+        return
+    try:
+        cache.incr(key, amount)
+    except ValueError:
+        if not cache.add(key, amount, timeout=None):
+            cache.incr(key, amount)
+
+
+def render_cards(products: Iterable) -> List[SafeString]:
+    """
+    Devuelve el HTML de la tarjeta de cada producto, en el mismo orden.
+
+    Los productos deben traer `category` precargada (`select_related`)
+    para que los fallos de caché no generen consultas extra.
+    """
+    products = list(products)
+    if not products:
+        return []
+
+    tags = set()
+    for product in products:
+        tags.add(_product_tag(product.pk))
+        tags.add(_category_tag(product.category_id))
+    versions = get_versions(tags)
+
+    keys = [
+        "product:card:{}:{}:{}".format(
+            product.pk,
+            versions[_product_tag(product.pk)],
+            versions[_category_tag(product.category_id)],
+        )
+        for product in products
+    ]
+    cached: Dict[str, str] = cache.get_many(keys)
+
+    rendered = {}
+    cards = []
+    for product, key in zip(products, keys):
+        html = cached.get(key)
+        if html is None:
+            html = render_to_string(CARD_TEMPLATE, {"product": product})
+            rendered[key] = html
+        cards.append(mark_safe(html))
+    if rendered:
+        cache.set_many(rendered, CARD_CACHE_TIMEOUT)
+
+    _count(HITS_KEY, len(products) - len(rendered))
+    _count(MISSES_KEY, len(rendered))
+    return cards
+
+
+def card_cache_stats() -> Dict[str, float]:
+    """Aciertos, fallos y tasa de aciertos acumulados de la caché de tarjetas."""
+    values = cache.get_many([HITS_KEY, MISSES_KEY])
+    hits = values.get(HITS_KEY, 0)
+    misses = values.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / total, 4) if total else 0.0,
+    }
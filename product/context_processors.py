@@ -0,0 +1,27 @@
+"""
+product/context_processors.py
+─────────────────────────────
+Datos del catálogo disponibles en todas las plantillas.
+
+Incluye:
+- catalog_categories : categorías con sus contadores para el menú
+  («Aventura (124)»). Se evalúa solo si la plantilla lo usa y sale de la
+  caché del catálogo, sin consultas por página.
+"""
+
+from django.utils.functional import SimpleLazyObject
+
+from .facets import category_rows
+
+
+def catalog_categories(request):
+    """Agrega `nav_categories`: [{id, name, product_count, in_stock_count}]."""
+
+    def rows():
+        return [
+            {"id": pk, "name": name, "product_count": total, "in_stock_count": in_stock}
+            for pk, name, total, in_stock in category_rows()
+            if total
+        ]
+
+    return {"nav_categories": SimpleLazyObject(rows)}
@@ -0,0 +1,116 @@
+"""
+product/counters.py
+───────────────────
+Contadores desnormalizados por categoría (`Category.product_count` y
+`Category.in_stock_count`).
+
+Mostrar «Aventura (124)» no debería costar un `COUNT … GROUP BY` por
+página: los contadores se mantienen con UPDATE incrementales (`F()`)
+cada vez que un producto se crea, se borra, cambia de categoría o su
+stock cruza el cero.
+
+Quién los mantiene
+──────────────────
+• `product/signals.py`  : altas, bajas y ediciones con `save()`/`delete()`.
+• `product/stock.py`    : reservas y ajustes (UPDATE sin señales).
+• `product/importer.py` : importación masiva (`bulk_create`/`bulk_update`).
+
+Las cargas `raw` (fixtures) recalculan las categorías afectadas en lugar
+de sumar, así `loaddata` es idempotente. Ante cualquier desvío,
+`manage.py repair_category_counters` recalcula todo en una pasada.
+
+Incluye:
+- apply_deltas        : suma deltas {categoría: (total, con stock)}.
+- product_delta       : deltas de un cambio (categoría/stock viejo → nuevo).
+- stock_changed       : ajusta `in_stock_count` si un UPDATE de stock cruzó el cero.
+- recount             : recalcula los contadores (todas o algunas categorías).
+"""
+
+from collections import defaultdict
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from .models import Category, Product
+
+# categoría → (delta total, delta con stock)
+Deltas = Dict[int, Tuple[int, int]]
+
+
+def product_delta(
+    old: Optional[Tuple[Optional[int], int]],
+    new: Optional[Tuple[Optional[int], int]],
+) -> Deltas:
+    """
+    Deltas por pasar de `old` a `new`, cada uno `(category_id, stock)`
+    o `None` (producto inexistente: alta o baja).
+    """
+    deltas: Dict[int, list] = defaultdict(lambda: [0, 0])
+    for state, sign in ((old, -1), (new, 1)):
+        if state is None or state[0] is None:
+            continue
+        category_id, stock = state
+        deltas[category_id][0] += sign
+        deltas[category_id][1] += sign if stock > 0 else 0
+    return {pk: (total, in_stock) for pk, (total, in_stock) in deltas.items() if total or in_stock}
+
+
+def merge(target: Dict[int, list], deltas: Deltas) -> None:
+    """Acumula `deltas` en `target` (para aplicar muchos cambios juntos)."""
+    for pk, (total, in_stock) in deltas.items():
+        target[pk][0] += total
+        target[pk][1] += in_stock
+
+
+def apply_deltas(deltas: Deltas) -> None:
+    """Un UPDATE con `F()` por categoría afectada (en orden de id)."""
+    for pk, (total, in_stock) in sorted(deltas.items()):
+        if total or in_stock:
+            Category.objects.filter(pk=pk).update(
+                product_count=F("product_count") + total,
+                in_stock_count=F("in_stock_count") + in_stock,
+            )
+
+
+def stock_changed(product_id: int, delta: int) -> None:
+    """
+    Corrige `in_stock_count` tras `stock = stock + delta` (ya aplicado).
+
+    El cruce se detecta en el mismo UPDATE, sin leer el stock:
+    restar y quedar en 0 → −1; sumar y quedar exactamente en `delta` → +1.
+    """
+    if not delta:
+        return
+    crossed_at, step = (0, -1) if delta < 0 else (delta, 1)
+    category = Product.objects.filter(pk=product_id, stock=crossed_at).values("category_id")
+    Category.objects.filter(pk__in=Subquery(category)).update(
+        in_stock_count=F("in_stock_count") + step
+    )
+
+
+def _count(condition: Q) -> Coalesce:
+    subquery = (
+        Product.objects.filter(condition, category=OuterRef("pk"))
+        .order_by()
+        .values("category")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return Coalesce(Subquery(subquery, output_field=IntegerField()), Value(0))
+
+
+def recount(category_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Recalcula los contadores desde `Product` con un único UPDATE.
+
+    Sin `category_ids` repara todas las categorías. Devuelve cuántas filas
+    se actualizaron.
+    """
+    qs = Category.objects.all()
+    if category_ids is not None:
+        qs = qs.filter(pk__in=[pk for pk in category_ids if pk is not None])
+    return qs.update(
+        product_count=_count(Q()),
+        in_stock_count=_count(Q(stock__gt=0)),
+    )
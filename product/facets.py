@@ -0,0 +1,175 @@
+"""
+product/facets.py
+─────────────────
+Filtros por facetas del catálogo público y sus conteos.
+
+Facetas disponibles (parámetros GET):
+• category – id de categoría.
+• price    – rango de precio (`PRICE_BUCKETS`).
+• stock    – estado de stock, con los mismos cortes que muestra la
+             plantilla: «En stock» (> 5), «Últimas unidades» (1-5),
+             «Sin stock» (0).
+
+Conteos
+───────
+Todos los conteos de todas las facetas salen de **una** consulta
+`aggregate()` con `Count(filter=...)`. Cada conteo respeta la búsqueda y
+las demás facetas elegidas, pero no la propia (así se ve cuántos
+resultados habría al cambiar de opción). El resultado se guarda en caché
+con la versión del catálogo en la clave, de modo que se invalida ante
+cualquier cambio de `Product` o `Category`.
+"""
+
+import hashlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from django.core.cache import cache
+from django.db.models import Count, Q, QuerySet
+from django.http import QueryDict
+
+from .cache import catalog_version
+from .models import Category
+
+FACET_CACHE_TIMEOUT = 60 * 10  # segundos
+
+# (valor en la URL, etiqueta, condición)
+PRICE_BUCKETS: List[Tuple[str, str, Q]] = [
+    ("hasta-20", "Hasta $20", Q(price__lt=20)),
+    ("20-40", "$20 a $40", Q(price__gte=20, price__lt=40)),
+    ("40-80", "$40 a $80", Q(price__gte=40, price__lt=80)),
+    ("desde-80", "Más de $80", Q(price__gte=80)),
+]
+
+STOCK_STATES: List[Tuple[str, str, Q]] = [
+    ("disponible", "En stock", Q(stock__gt=5)),
+    ("ultimas", "Últimas unidades", Q(stock__gt=0, stock__lte=5)),
+    ("agotado", "Sin stock", Q(stock=0)),
+]
+
+FACET_PARAMS = ("category", "price", "stock")
+FACET_LABELS = {"category": "Categoría", "price": "Precio", "stock": "Disponibilidad"}
+
+
+@dataclass
+class FacetOption:
+    value: str
+    label: str
+    count: int = 0
+    selected: bool = False
+
+
+@dataclass
+class FacetGroup:
+    param: str
+    label: str
+    options: List[FacetOption] = field(default_factory=list)
+
+
+def category_rows() -> List[Tuple[int, str, int, int]]:
+    """
+    Categorías como `(id, nombre, productos, con stock)`, cacheadas por
+    versión de catálogo. Los conteos son los contadores mantenidos de
+    `Category` (ver `product/counters.py`): no hay `COUNT … GROUP BY`.
+    """
+    key = f"product:facets:categories:{catalog_version()}"
+    rows = cache.get(key)
+    if rows is None:
+        rows = list(
+            Category.objects.order_by("name").values_list(
+                "id", "name", "product_count", "in_stock_count"
+            )
+        )
+        cache.set(key, rows, FACET_CACHE_TIMEOUT)
+    return rows
+
+
+def _category_options() -> List[Tuple[str, str, Q]]:
+    """Categorías como opciones de faceta."""
+    return [(str(pk), name, Q(category_id=pk)) for pk, name, _, _ in category_rows()]
+
+
+def _options(param: str) -> List[Tuple[str, str, Q]]:
+    if param == "category":
+        return _category_options()
+    return PRICE_BUCKETS if param == "price" else STOCK_STATES
+
+
+def parse_facets(params: QueryDict) -> Dict[str, str]:
+    """Facetas elegidas y válidas en `params` ({param: valor})."""
+    selected = {}
+    for param in FACET_PARAMS:
+        value = params.get(param, "").strip()
+        if value and any(value == option[0] for option in _options(param)):
+            selected[param] = value
+    return selected
+
+
+def _condition(param: str, value: str) -> Optional[Q]:
+    for option_value, _, condition in _options(param):
+        if option_value == value:
+            return condition
+    return None
+
+
+def _selected_q(selected: Dict[str, str], skip: Optional[str] = None) -> Q:
+    """Condición combinada de las facetas elegidas, salvo `skip`."""
+    combined = Q()
+    for param, value in selected.items():
+        if param != skip:
+            combined &= _condition(param, value)
+    return combined
+
+
+def apply_facets(qs: "QuerySet", selected: Dict[str, str]) -> "QuerySet":
+    """Filtra `qs` por todas las facetas elegidas."""
+    return qs.filter(_selected_q(selected)) if selected else qs
+
+
+def facet_groups(
+    base_qs: "QuerySet", selected: Dict[str, str], cache_key: str
+) -> List[FacetGroup]:
+    """
+    Arma las facetas con sus conteos.
+
+    `base_qs` es el queryset ya filtrado por búsqueda (sin facetas) y
+    `cache_key` identifica esa búsqueda (p. ej. el término normalizado).
+    """
+    options = {param: _options(param) for param in FACET_PARAMS}
+    digest = hashlib.md5(
+        repr((cache_key, sorted(selected.items()))).encode()
+    ).hexdigest()
+    key = f"product:facets:counts:{catalog_version()}:{digest}"
+    counts = cache.get(key)
+    if counts is None:
+        flat = [
+            (param, value, condition & _selected_q(selected, skip=param))
+            for param, param_options in options.items()
+            for value, _, condition in param_options
+        ]
+        # Alias cortos (c0, c1, …): los valores pueden tener guiones
+        result = base_qs.order_by().aggregate(
+            **{f"c{i}": Count("pk", filter=cond) for i, (_, _, cond) in enumerate(flat)}
+        ) if flat else {}
+        counts = {
+            f"{param}:{value}": result[f"c{i}"]
+            for i, (param, value, _) in enumerate(flat)
+        }
+        cache.set(key, counts, FACET_CACHE_TIMEOUT)
+
+    return [
+        FacetGroup(
+            param=param,
+            label=FACET_LABELS[param],
+            options=[
+                FacetOption(
+                    value=value,
+                    label=label,
+                    count=counts.get(f"{param}:{value}", 0),
+                    selected=selected.get(param) == value,
+                )
+                for value, label, _ in param_options
+            ],
+        )
+        for param, param_options in options.items()
+    ]
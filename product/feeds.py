@@ -0,0 +1,75 @@
+"""
+product/feeds.py
+────────────────
+Feeds RSS y Atom de las novedades del catálogo (productos recién dados
+de alta, por `created_at`).
+
+- `/productos/novedades/feed/`      : RSS 2.0.
+- `/productos/novedades/feed/atom/` : Atom 1.0.
+
+Se sirven desde caché (`core.feeds.CachedFeed`) hasta el próximo cambio
+del catálogo (`product/cache.py`). Regenerarlos cuesta una consulta:
+los productos con su categoría por el índice `product_created_idx`.
+"""
+
+from typing import List
+
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.text import Truncator
+
+from core.feeds import CachedFeed
+
+from .cache import CATALOG_TAG
+from .models import Product
+
+FEED_ITEMS = 20
+DESCRIPTION_WORDS = 50
+
+
+class NewProductsFeed(CachedFeed):
+    """Últimos `FEED_ITEMS` productos agregados al catálogo."""
+
+    cache_version_tags = (CATALOG_TAG,)
+    title = "Tienda de Historias · Novedades del catálogo"
+    description = "Los últimos libros y juegos que llegaron a la tienda."
+
+    def link(self) -> str:
+        return reverse("product:catalog_view")
+
+    def feed_url(self) -> str:
+        return reverse("product:new_products_feed")
+
+    def items(self) -> List[Product]:
+        return list(
+            Product.objects.select_related("category")
+            .order_by("-created_at", "-id")[:FEED_ITEMS]
+        )
+
+    def item_title(self, item: Product) -> str:
+        return f"{item.title} — {item.author}"
+
+    def item_description(self, item: Product) -> str:
+        return Truncator(item.description).words(DESCRIPTION_WORDS)
+
+    def item_link(self, item: Product) -> str:
+        return reverse("product:product_detail", args=[item.pk])
+
+    def item_pubdate(self, item: Product):
+        return item.created_at
+
+    def item_updateddate(self, item: Product):
+        return item.updated_at
+
+    def item_categories(self, item: Product) -> List[str]:
+        return [item.category.name] if item.category else []
+
+
+class NewProductsAtomFeed(NewProductsFeed):
+    """Las mismas novedades en formato Atom 1.0."""
+
+    feed_type = Atom1Feed
+    subtitle = NewProductsFeed.description
+
+    def feed_url(self) -> str:
+        return reverse("product:new_products_atom_feed")
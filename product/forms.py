@@ -24,8 +24,15 @@ class ProductForm(forms.ModelForm):
         • price        – Precio en pesos argentinos.
         • category     – Categoría literaria.
         • image        – Imagen de portada (opcional).
+
+    Campo extra:
+        • stock_seen   – Stock que mostraba el formulario al abrirse. La
+                         vista de edición aplica la diferencia con
+                         `product/stock.py` en lugar de pisar el valor.
     """
 
+    stock_seen = forms.IntegerField(widget=forms.HiddenInput, required=False)
+
     class Meta:
         model = Product
         fields = "__all__"  # Usa todos los campos definidos en Product
@@ -48,6 +55,11 @@ class ProductForm(forms.ModelForm):
             "image": forms.ClearableFileInput(attrs={"class": "form-control"}),
         }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.pk:
+            self.fields["stock_seen"].initial = self.instance.stock
+
     # ------------------------------------------------------------------
     # Validaciones
     # ------------------------------------------------------------------
@@ -0,0 +1,310 @@
+"""
+product/importer.py
+───────────────────
+Importación masiva del catálogo desde CSV o JSONL.
+
+Columnas / claves por fila:
+    title, author, price, stock  (obligatorias)
+    description, category        (opcionales; `category` es el nombre.
+                                  Si vienen vacías no pisan el valor actual)
+
+Cada producto se identifica por su clave natural `(title, author)`:
+si ya existe se actualiza, si no se crea. Las filas idénticas a lo que ya
+hay en la base no se tocan, así que reimportar el mismo archivo no cambia
+nada (ni siquiera `updated_at`).
+
+El archivo se lee en streaming y se procesa por bloques de `chunk_size`
+filas, cada bloque en su propia transacción:
+
+1. Categorías: se crean de una vez las que falten (`bulk_create`).
+2. Productos: una consulta trae los existentes del bloque; los nuevos van
+   a `bulk_create` y los modificados a `bulk_update`.
+3. Índice FTS, contadores y cachés: como las operaciones masivas no
+   disparan señales, se reindexan los productos tocados, se ajustan los
+   contadores por categoría, se marcan las tiras de relacionados a
+   recalcular y se invalidan catálogo, tarjetas y sugerencias del buscador.
+
+Incluye:
+- read_rows        : itera las filas de un archivo (formato por extensión).
+- import_products  : aplica las filas y devuelve un `ImportStats`.
+"""
+
+import csv
+import json
+from collections import defaultdict
+from dataclasses import dataclass
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from . import cards, counters, related, search, suggest
+from .cache import invalidate_catalog
+from .models import Category, Product
+
+FORMATS = ("csv", "jsonl")
+REQUIRED_FIELDS = ("title", "author", "price", "stock")
+# Campos de `Product` que se cargan desde el archivo (además de la categoría)
+DATA_FIELDS = ("title", "author", "description", "price", "stock")
+DEFAULT_CHUNK_SIZE = 500  # `title__in` por bloque: SQLite antiguo admite 999 parámetros
+
+# (número de línea, fila cruda)
+Row = Tuple[int, Dict[str, object]]
+# (fila rechazada, motivo)
+RejectHandler = Callable[[Row, str], None]
+
+
+class RowError(ValueError):
+    """Fila inválida: se rechaza sin abortar la importación."""
+
+
+@dataclass
+class ImportStats:
+    """Totales de una importación."""
+
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    rejected: int = 0
+    categories: int = 0
+
+    @property
+    def processed(self) -> int:
+        return self.created + self.updated + self.unchanged + self.rejected
+
+
+# ------------------------------------------------------------------
+# Lectura
+# ------------------------------------------------------------------
+def detect_format(path: str) -> str:
+    """Formato según la extensión del archivo (`csv` o `jsonl`)."""
+    extension = path.rsplit(".", 1)[-1].lower()
+    if extension in ("jsonl", "ndjson"):
+        return "jsonl"
+    if extension == "csv":
+        return "csv"
+    raise ValueError(f"No se reconoce el formato de «{path}» (usar .csv o .jsonl).")
+
+
+def read_rows(fh, fmt: str) -> Iterator[Row]:
+    """
+    Itera `(línea, fila)` de un archivo abierto en modo texto.
+
+    Las líneas de JSONL que no son un objeto válido se devuelven como
+    `{"_raw": línea, "_error": motivo}` para que terminen en los rechazos.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(fh)
+        for row in reader:
+            yield reader.line_num, row
+        return
+
+    for line_number, line in enumerate(fh, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield line_number, {"_raw": line, "_error": f"JSON inválido: {exc}"}
+            continue
+        if not isinstance(row, dict):
+            row = {"_raw": line, "_error": "Se esperaba un objeto JSON."}
+        yield line_number, row
+
+
+# ------------------------------------------------------------------
+# Validación
+# ------------------------------------------------------------------
+def _text(value) -> str:
+    """Texto sin espacios sobrantes (también internos)."""
+    return " ".join(str(value if value is not None else "").split())
+
+
+def clean_row(raw: Dict[str, object]) -> Dict[str, object]:
+    """Valida una fila con las reglas de los campos del modelo."""
+    if "_error" in raw:
+        raise RowError(raw["_error"])
+
+    missing = [name for name in REQUIRED_FIELDS if _text(raw.get(name)) == ""]
+    if missing:
+        raise RowError(f"Faltan campos obligatorios: {', '.join(missing)}.")
+
+    data: Dict[str, object] = {}
+    values = {
+        "title": _text(raw["title"]),
+        "author": _text(raw["author"]),
+        "price": _text(raw["price"]).replace(",", "."),
+        "stock": _text(raw["stock"]),
+    }
+    # Descripción opcional: vacía al crear y sin cambios al actualizar
+    description = str(raw.get("description") or "").strip()
+    data["description"] = description or None
+    for name, value in values.items():
+        field = Product._meta.get_field(name)
+        try:
+            data[name] = field.clean(value, None)
+        except ValidationError as exc:
+            raise RowError(f"{name}: {' '.join(exc.messages)}") from exc
+    if data["price"] < 0:
+        raise RowError("price: El precio no puede ser negativo.")
+
+    category = _text(raw.get("category"))
+    max_length = Category._meta.get_field("name").max_length
+    if len(category) > max_length:
+        raise RowError(f"category: máximo {max_length} caracteres.")
+    data["category"] = category or None
+    return data
+
+
+# ------------------------------------------------------------------
+# Escritura
+# ------------------------------------------------------------------
+def _chunks(iterable: Iterable[Row], size: int) -> Iterator[List[Row]]:
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _category_ids(names: Iterable[str], known: Dict[str, int]) -> int:
+    """
+    Completa `known` ({nombre: id}) con las categorías `names`,
+    creando en bloque las que no existan. Devuelve cuántas se crearon.
+    """
+    pending = {name for name in names if name and name not in known}
+    if not pending:
+        return 0
+    known.update(Category.objects.filter(name__in=pending).values_list("name", "id"))
+
+    new = []
+    for name in pending - known.keys():
+        category = Category(name=name)
+        category.refresh_normalized_fields()  # bulk_create no dispara pre_save
+        new.append(category)
+    if new:
+        # ignore_conflicts: otra importación concurrente pudo crearla
+        Category.objects.bulk_create(new, ignore_conflicts=True)
+        known.update(
+            Category.objects.filter(name__in=[c.name for c in new]).values_list("name", "id")
+        )
+    return len(new)
+
+
+def _apply_chunk(
+    rows: List[Row], categories: Dict[str, int], stats: ImportStats, on_reject: RejectHandler
+) -> List[int]:
+    """Importa un bloque ya dentro de una transacción; devuelve los ids modificados."""
+    cleaned: Dict[Tuple[str, str], Dict[str, object]] = {}
+    for row in rows:
+        try:
+            data = clean_row(row[1])
+        except RowError as exc:
+            stats.rejected += 1
+            on_reject(row, str(exc))
+            continue
+        # Dentro del bloque, la última fila con la misma clave gana
+        key = (data["title"], data["author"])
+        if key in cleaned:
+            stats.unchanged += 1
+        cleaned[key] = data
+    if not cleaned:
+        return []
+
+    stats.categories += _category_ids((d["category"] for d in cleaned.values()), categories)
+
+    existing: Dict[Tuple[str, str], Product] = {}
+    titles = {title for title, _ in cleaned}
+    for product in Product.objects.filter(title__in=titles).only(
+        "id", *DATA_FIELDS, "category_id"
+    ):
+        existing.setdefault((product.title, product.author), product)
+
+    now = timezone.now()
+    to_create: List[Product] = []
+    to_update: List[Product] = []
+    moved: List[Product] = []  # cambiaron de categoría
+    deltas: Dict[int, list] = defaultdict(lambda: [0, 0])
+    for key, data in cleaned.items():
+        category_id: Optional[int] = categories.get(data["category"])
+        product = existing.get(key)
+        if product is None:
+            product = Product(
+                category_id=category_id, **{name: data[name] for name in DATA_FIELDS}
+            )
+            product.description = product.description or ""
+            product.refresh_normalized_fields()
+            to_create.append(product)
+            counters.merge(deltas, counters.product_delta(None, (category_id, product.stock)))
+            continue
+
+        before = (product.category_id, product.stock)
+        changed = False
+        if data["category"] is not None and product.category_id != category_id:
+            product.category_id = category_id
+            moved.append(product)
+            changed = True
+        for name in ("description", "price", "stock"):
+            if data[name] is not None and getattr(product, name) != data[name]:
+                setattr(product, name, data[name])
+                changed = True
+        if changed:
+            product.updated_at = now  # bulk_update no aplica auto_now
+            to_update.append(product)
+            counters.merge(
+                deltas, counters.product_delta(before, (product.category_id, product.stock))
+            )
+        else:
+            stats.unchanged += 1
+
+    if to_create:
+        Product.objects.bulk_create(to_create)
+    if to_update:
+        Product.objects.bulk_update(
+            to_update, ["description", "price", "stock", "category", "updated_at"]
+        )
+    stats.created += len(to_create)
+    stats.updated += len(to_update)
+    counters.apply_deltas({pk: tuple(delta) for pk, delta in deltas.items()})
+    related.mark_stale(
+        product_ids=[product.pk for product in moved],
+        authors=[product.author_norm for product in to_create],
+        categories=[product.category_id for product in to_create + moved],
+    )
+
+    touched = [product.pk for product in to_create + to_update]
+    if search.search_available():
+        search.index_products(touched)
+    return [product.pk for product in to_update]
+
+
+def import_products(
+    rows: Iterable[Row],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    on_reject: Optional[RejectHandler] = None,
+    on_chunk: Optional[Callable[[ImportStats], None]] = None,
+) -> ImportStats:
+    """
+    Importa `rows` por bloques de `chunk_size`, cada uno en una transacción.
+
+    `on_reject(fila, motivo)` recibe cada fila rechazada y `on_chunk(stats)`
+    se llama al terminar cada bloque (para informar el progreso).
+    """
+    stats = ImportStats()
+    categories: Dict[str, int] = {}
+    on_reject = on_reject or (lambda row, reason: None)
+
+    for chunk in _chunks(rows, chunk_size):
+        created_before = (stats.created, stats.categories)
+        with transaction.atomic():
+            updated_ids = _apply_chunk(chunk, categories, stats, on_reject)
+        for pk in updated_ids:
+            cards.invalidate_product(pk)
+        invalidate_catalog()
+        if (stats.created, stats.categories) != created_before:
+            suggest.invalidate()  # títulos o categorías nuevas
+        if on_chunk is not None:
+            on_chunk(stats)
+    return stats
+
@@ -0,0 +1,105 @@
+"""
+product/management/commands/benchmark_stock.py
+──────────────────────────────────────────────
+Prueba de carga del servicio de stock (`product/stock.py`).
+
+Crea un producto temporal con `--stock` unidades y lanza `--workers`
+hilos (cada uno con su propia conexión) que intentan reservar una unidad
+por vez hasta agotar `--attempts` intentos en total. Al terminar verifica
+que no haya sobreventa (reservas exitosas == unidades descontadas <=
+stock inicial) e informa reservas por segundo.
+
+Uso:
+    python manage.py benchmark_stock --workers 8 --stock 500 --attempts 2000
+
+⚠️  Escribe en la base configurada; el producto temporal se elimina al final.
+"""
+
+import threading
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection
+
+from product import stock
+from product.models import Product
+
+
+class Command(BaseCommand):
+    help = "Mide reservas concurrentes de stock y verifica que no haya sobreventa."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=8, help="Hilos en paralelo.")
+        parser.add_argument("--stock", type=int, default=500, help="Stock inicial.")
+        parser.add_argument(
+            "--attempts", type=int, default=2000, help="Intentos de reserva en total."
+        )
+
+    def handle(self, *args, **options):
+        workers, initial, attempts = options["workers"], options["stock"], options["attempts"]
+        if min(workers, initial, attempts) < 1:
+            raise CommandError("--workers, --stock y --attempts deben ser mayores que cero.")
+
+        product = Product.objects.create(
+            title="Benchmark de stock", author="benchmark_stock",
+            description="Producto temporal.", price=0, stock=initial,
+        )
+        results: Counter = Counter()
+        lock = threading.Lock()
+        remaining = [attempts]
+        barrier = threading.Barrier(workers)
+
+        def take_attempt() -> bool:
+            with lock:
+                if remaining[0] <= 0:
+                    return False
+                remaining[0] -= 1
+                return True
+
+        def worker():
+            local: Counter = Counter()
+            try:
+                barrier.wait()
+                while take_attempt():
+                    try:
+                        stock.reserve({product.pk: 1})
+                        local["reserved"] += 1
+                    except stock.InsufficientStock:
+                        local["rejected"] += 1
+                    except OperationalError:  # p. ej. SQLite «database is locked»
+                        local["errors"] += 1
+            finally:
+                connection.close()
+                with lock:
+                    results.update(local)
+
+        try:
+            threads = [threading.Thread(target=worker) for _ in range(workers)]
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+            product.refresh_from_db()
+        finally:
+            # Siempre se borra el producto temporal (también ante error o Ctrl-C)
+            Product.objects.filter(pk=product.pk).delete()
+
+        reserved = results["reserved"]
+        oversold = (
+            reserved > initial
+            or product.stock != initial - reserved
+            or product.reserved != reserved
+        )
+        self.stdout.write(
+            f"{workers} hilos · {attempts} intentos en {elapsed:.2f} s "
+            f"({attempts / elapsed:,.0f} intentos/s, {reserved / elapsed:,.0f} reservas/s)\n"
+            f"  reservadas: {reserved}  sin stock: {results['rejected']}  "
+            f"errores de bloqueo: {results['errors']}\n"
+            f"  stock final: {product.stock}  reservado: {product.reserved}"
+        )
+        if oversold:
+            raise CommandError("¡Inconsistencia! Las reservas no coinciden con el stock.")
+        self.stdout.write(self.style.SUCCESS("Sin sobreventa."))
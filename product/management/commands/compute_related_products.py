@@ -0,0 +1,36 @@
+"""
+product/management/commands/compute_related_products.py
+───────────────────────────────────────────────────────
+Recalcula las tiras de productos relacionados (`product/related.py`).
+
+Por defecto solo recalcula los productos marcados por las señales o el
+importador (`related_stale`); pensado para correr periódicamente (cron).
+`--full` recalcula el catálogo completo.
+
+Uso:
+    python manage.py compute_related_products
+    python manage.py compute_related_products --full
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from product import related
+
+
+class Command(BaseCommand):
+    help = "Recalcula los productos relacionados (solo los marcados, o todos con --full)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full", action="store_true", help="Recalcular todos los productos."
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        count = related.refresh(full=options["full"])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Relacionados recalculados: {count} productos en {elapsed:.2f} s."
+        ))
@@ -0,0 +1,78 @@
+"""
+product/management/commands/generate_renditions.py
+──────────────────────────────────────────────────
+Genera variantes, miniatura y manifiesto de las imágenes ya subidas.
+
+Las señales solo procesan imágenes nuevas o reemplazadas; este comando
+recorre las existentes (`Product.image` y `Post.image`) y genera lo que
+falte con `core.renditions.generate_renditions` en un pool de procesos.
+Las imágenes que ya tienen manifiesto se omiten salvo con `--force`.
+
+Uso:
+    python manage.py generate_renditions
+    python manage.py generate_renditions --workers 4 --force
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.models import Post
+from core import renditions
+from product import cards
+from product.models import Product
+
+
+class Command(BaseCommand):
+    help = "Genera las variantes de imagen faltantes de productos y posts."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=2, help="Procesos en paralelo.")
+        parser.add_argument(
+            "--force", action="store_true", help="Regenerar también las que tienen manifiesto."
+        )
+
+    def handle(self, *args, **options):
+        if not renditions.rendition_formats():
+            raise CommandError("El Pillow instalado no soporta WebP ni AVIF.")
+        if options["workers"] < 1:
+            raise CommandError("--workers debe ser mayor que cero.")
+
+        # nombre de imagen → ids de productos que la usan (para sus tarjetas)
+        pending = {}
+        for pk, name in Product.objects.exclude(image="").exclude(image=None).values_list("pk", "image"):
+            pending.setdefault(name, []).append(pk)
+        for name in Post.objects.exclude(image="").exclude(image=None).values_list("image", flat=True):
+            pending.setdefault(name, [])
+        if not options["force"]:
+            pending = {
+                name: pks for name, pks in pending.items() if not renditions.get_manifest(name)
+            }
+
+        started = time.perf_counter()
+        done = failed = 0
+        with ProcessPoolExecutor(
+            max_workers=options["workers"], initializer=renditions._init_worker
+        ) as executor:
+            futures = {
+                executor.submit(renditions.generate_renditions, name): name for name in pending
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    manifest = future.result()
+                except Exception as exc:  # noqa: BLE001 – seguir con las demás
+                    failed += 1
+                    self.stderr.write(f"  {name}: {exc}")
+                    continue
+                cache.set(renditions.CACHE_PREFIX + name, manifest, timeout=None)
+                for pk in pending[name]:
+                    cards.invalidate_product(pk)
+                done += 1
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Variantes generadas: {done} imágenes en {elapsed:.1f} s ({failed} con error)."
+        ))
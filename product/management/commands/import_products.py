@@ -0,0 +1,115 @@
+"""
+product/management/commands/import_products.py
+──────────────────────────────────────────────
+Importa (o actualiza) productos desde un archivo CSV o JSONL.
+
+Uso:
+    python manage.py import_products catalogo.csv
+    python manage.py import_products catalogo.jsonl --chunk-size 2000
+    python manage.py import_products datos.txt --format csv --rejects malos.csv
+
+El archivo se procesa en streaming con memoria constante. Las filas
+inválidas no cortan la importación: se escriben en el archivo de
+rechazos (por defecto `<archivo>.rejects.<formato>`) con el motivo en la
+columna/clave `error`. Volver a ejecutar el comando es idempotente.
+"""
+
+import csv
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from product import importer
+
+
+class RejectWriter:
+    """Escribe las filas rechazadas en el mismo formato que la entrada."""
+
+    def __init__(self, path: str, fmt: str):
+        self.path = path
+        self.fmt = fmt
+        self.count = 0
+        self._fh = None
+        self._csv = None
+
+    def __call__(self, row, reason: str) -> None:
+        line_number, raw = row
+        if self._fh is None:  # el archivo solo se crea si hay rechazos
+            self._fh = open(self.path, "w", encoding="utf-8", newline="")
+        self.count += 1
+        if self.fmt == "jsonl":
+            record = {"line": line_number, "error": reason, "row": raw.get("_raw", raw)}
+            self._fh.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            return
+        if self._csv is None:
+            fields = [name for name in raw if name is not None]
+            self._csv = csv.DictWriter(
+                self._fh, fieldnames=["line", "error", *fields], extrasaction="ignore"
+            )
+            self._csv.writeheader()
+        self._csv.writerow({**raw, "line": line_number, "error": reason})
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+
+
+class Command(BaseCommand):
+    help = "Importa productos desde un archivo CSV o JSONL (upsert por título y autor)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Archivo .csv o .jsonl a importar.")
+        parser.add_argument(
+            "--format", choices=importer.FORMATS,
+            help="Formato del archivo (por defecto, según la extensión).",
+        )
+        parser.add_argument(
+            "--chunk-size", type=int, default=importer.DEFAULT_CHUNK_SIZE,
+            help="Filas por transacción (por defecto %(default)s).",
+        )
+        parser.add_argument(
+            "--rejects", help="Archivo para las filas rechazadas.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        try:
+            fmt = options["format"] or importer.detect_format(path)
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size debe ser mayor que cero.")
+
+        rejects = RejectWriter(options["rejects"] or f"{path}.rejects.{fmt}", fmt)
+        started = time.perf_counter()
+
+        def progress(stats):
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"  {stats.processed} filas · {stats.processed / elapsed:,.0f} filas/s"
+            )
+
+        try:
+            with open(path, encoding="utf-8-sig", newline="") as fh:
+                stats = importer.import_products(
+                    importer.read_rows(fh, fmt),
+                    chunk_size=options["chunk_size"],
+                    on_reject=rejects,
+                    on_chunk=progress if options["verbosity"] > 0 else None,
+                )
+        except OSError as exc:
+            raise CommandError(f"No se pudo leer «{path}»: {exc}") from exc
+        finally:
+            rejects.close()
+
+        elapsed = time.perf_counter() - started
+        rate = stats.processed / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Importación terminada: {stats.created} creados, {stats.updated} actualizados, "
+            f"{stats.unchanged} sin cambios, {stats.rejected} rechazados, "
+            f"{stats.categories} categorías nuevas "
+            f"({stats.processed} filas en {elapsed:.1f} s, {rate:,.0f} filas/s)."
+        ))
+        if rejects.count:
+            self.stdout.write(self.style.WARNING(f"Filas rechazadas en {rejects.path}"))
@@ -0,0 +1,27 @@
+"""
+product/management/commands/rebuild_product_index.py
+────────────────────────────────────────────────────
+Reconstruye desde cero el índice FTS5 del catálogo.
+
+Uso:
+    python manage.py rebuild_product_index
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from product import search
+
+
+class Command(BaseCommand):
+    help = "Reconstruye el índice de búsqueda de texto completo de productos."
+
+    def handle(self, *args, **options):
+        if not search.search_available():
+            raise CommandError(
+                "El índice FTS5 solo está disponible con SQLite; "
+                "en este motor la búsqueda es por prefijo sobre las columnas *_norm."
+            )
+        with transaction.atomic():
+            total = search.rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"Índice reconstruido: {total} productos."))
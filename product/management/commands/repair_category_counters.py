@@ -0,0 +1,43 @@
+"""
+product/management/commands/repair_category_counters.py
+────────────────────────────────────────────────────────
+Recalcula los contadores de productos por categoría desde cero.
+
+Los contadores se mantienen solos (`product/counters.py`); este comando
+corrige cualquier desvío (ediciones por SQL, restauraciones parciales…)
+con un único UPDATE e informa qué categorías estaban mal.
+
+Uso:
+    python manage.py repair_category_counters
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from product import counters
+from product.cache import invalidate_catalog
+from product.models import Category
+
+
+class Command(BaseCommand):
+    help = "Recalcula product_count e in_stock_count de todas las categorías."
+
+    def handle(self, *args, **options):
+        fields = ("name", "product_count", "in_stock_count")
+        with transaction.atomic():
+            before = {pk: row for pk, *row in Category.objects.values_list("pk", *fields)}
+            total = counters.recount()
+            after = {pk: row for pk, *row in Category.objects.values_list("pk", *fields)}
+        invalidate_catalog()
+
+        drifted = [pk for pk in after if before.get(pk) != after[pk]]
+        for pk in drifted:
+            name, old_total, old_stock = before[pk]
+            _, new_total, new_stock = after[pk]
+            self.stdout.write(
+                f"  {name}: {old_total}/{old_stock} → {new_total}/{new_stock} "
+                "(productos / con stock)"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"Contadores recalculados: {total} categorías, {len(drifted)} corregidas."
+        ))
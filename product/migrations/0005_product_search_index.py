@@ -0,0 +1,41 @@
+"""
+Crea la tabla virtual FTS5 `product_product_fts` y la puebla con el
+catálogo existente. Solo aplica en SQLite; en otros motores no hace nada.
+"""
+
+from django.db import migrations
+
+FTS_TABLE = "product_product_fts"
+
+
+def create_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+        "USING fts5(title, author, category, "
+        "tokenize = 'unicode61 remove_diacritics 2')"
+    )
+    schema_editor.execute(
+        f"INSERT INTO {FTS_TABLE}(rowid, title, author, category) "
+        "SELECT p.id, p.title, p.author, COALESCE(c.name, '') "
+        "FROM product_product p "
+        "LEFT JOIN product_category c ON c.id = p.category_id"
+    )
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0004_alter_product_options_alter_product_category'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
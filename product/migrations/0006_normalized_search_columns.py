@@ -0,0 +1,51 @@
+# Generated by Django 5.2.2 on 2026-10-18 13:46
+
+from django.db import migrations, models
+
+from core.text import normalize_text
+
+
+def backfill(apps, schema_editor):
+    """Completa las columnas normalizadas de las filas existentes."""
+    Category = apps.get_model("product", "Category")
+    Product = apps.get_model("product", "Product")
+    categories = list(Category.objects.only("id", "name"))
+    for category in categories:
+        category.name_norm = normalize_text(category.name)[:100]
+    Category.objects.bulk_update(categories, ["name_norm"], batch_size=500)
+
+    products = []
+    for product in Product.objects.only("id", "title", "author").iterator(chunk_size=2000):
+        product.title_norm = normalize_text(product.title)[:200]
+        product.author_norm = normalize_text(product.author)[:100]
+        products.append(product)
+        if len(products) >= 2000:
+            Product.objects.bulk_update(products, ["title_norm", "author_norm"])
+            products = []
+    Product.objects.bulk_update(products, ["title_norm", "author_norm"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0005_product_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='name_norm',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='author_norm',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='title_norm',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=200),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
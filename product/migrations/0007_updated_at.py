@@ -0,0 +1,26 @@
+# Generated by Django 5.2.2 on 2026-10-18 13:50
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill(apps, schema_editor):
+    """Las filas existentes toman como última modificación su fecha de alta."""
+    Product = apps.get_model("product", "Product")
+    Product.objects.update(updated_at=F("created_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0006_normalized_search_columns'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
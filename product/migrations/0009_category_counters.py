@@ -0,0 +1,47 @@
+# Generated by Django 5.2.2 on 2026-10-18 14:06
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def recount(apps, schema_editor):
+    """Calcula los contadores de las categorías existentes."""
+    Category = apps.get_model("product", "Category")
+    Product = apps.get_model("product", "Product")
+
+    def count(condition):
+        subquery = (
+            Product.objects.filter(condition, category=OuterRef("pk"))
+            .order_by()
+            .values("category")
+            .annotate(total=Count("pk"))
+            .values("total")
+        )
+        return Coalesce(Subquery(subquery, output_field=IntegerField()), Value(0))
+
+    Category.objects.update(
+        product_count=count(Q()),
+        in_stock_count=count(Q(stock__gt=0)),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0008_stock_reserved'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='in_stock_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='product_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(recount, migrations.RunPython.noop),
+    ]
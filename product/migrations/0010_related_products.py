@@ -0,0 +1,35 @@
+# Generated by Django 5.2.2 on 2026-10-18 14:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0009_category_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='related_stale',
+            field=models.BooleanField(db_index=True, default=True, editable=False),
+        ),
+        migrations.CreateModel(
+            name='RelatedProduct',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('reason', models.CharField(choices=[('author', 'Mismo autor'), ('category', 'Misma categoría')], max_length=10)),
+                ('product', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='related_links', to='product.product')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='product.product')),
+            ],
+            options={
+                'verbose_name': 'Related product',
+                'verbose_name_plural': 'Related products',
+                'ordering': ['product', 'rank'],
+                'constraints': [models.UniqueConstraint(fields=('product', 'rank'), name='product_related_rank_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.2 on 2026-10-18 14:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0010_related_products'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='product',
+            name='category',
+            field=models.ForeignKey(db_index=False, help_text='Categoría temática del producto (opcional).', null=True, on_delete=django.db.models.deletion.SET_NULL, to='product.category'),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='related_stale',
+            field=models.BooleanField(default=True, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['title', 'id'], name='product_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['category', 'title', 'id'], name='product_category_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(condition=models.Q(('stock__gt', 0)), fields=['category'], name='product_in_stock_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(condition=models.Q(('related_stale', True)), fields=['id'], name='product_related_stale_idx'),
+        ),
+    ]
@@ -6,20 +6,34 @@ Modelos para el catálogo de la Tienda de Historias.
 Incluye:
 - Category: clasificación temática (Aventura, Romance, etc.).
 - Product : ítems disponibles para la venta (libros, juegos u otros).
+- RelatedProduct: «más de este autor / esta categoría», precalculado.
 """
 
 from django.db import models
 
+from core.models import ManagedFieldsMixin, NormalizedFieldsMixin
 
-class Category(models.Model):
+
+class Category(ManagedFieldsMixin, NormalizedFieldsMixin, models.Model):
     """
     Categoría del catálogo (ej.: Aventura, Romance, Misterio).
 
     Campos:
-        name (CharField): Nombre único de la categoría.
+        name (CharField)     : Nombre único de la categoría.
+        name_norm (CharField): `name` sin tildes y en minúsculas (auto, indexado).
+        product_count (int)  : Productos de la categoría (contador mantenido).
+        in_stock_count (int) : Productos con `stock > 0` (contador mantenido).
+
+    Los contadores los actualiza `product/counters.py`; no editarlos a mano.
     """
 
     name = models.CharField(max_length=100, unique=True)
+    name_norm = models.CharField(max_length=100, editable=False, db_index=True, default="")
+    product_count = models.PositiveIntegerField(default=0, editable=False)
+    in_stock_count = models.PositiveIntegerField(default=0, editable=False)
+
+    normalized_fields = {"name_norm": "name"}
+    managed_fields = ("product_count", "in_stock_count")
 
     class Meta:
         ordering = ["name"]
@@ -34,7 +48,7 @@ class Category(models.Model):
         return self.name
 
 
-class Product(models.Model):
+class Product(ManagedFieldsMixin, NormalizedFieldsMixin, models.Model):
     """
     Producto del catálogo.
 
@@ -46,9 +60,15 @@ class Product(models.Model):
         description (TextField)  : Descripción corta.
         price (DecimalField)     : Precio (máx. 999 999,99).
         stock (PositiveInteger)  : Unidades disponibles.
+        reserved (PositiveInt.)  : Unidades apartadas por compras en curso;
+                                   se modifican solo vía `product/stock.py`.
         category (ForeignKey)    : Categoría temática (opcional).
         image (ImageField)       : Imagen de portada (opcional).
         created_at (DateTime)    : Fecha de alta (auto).
+        updated_at (DateTime)    : Última modificación (auto); base del GET condicional.
+        title_norm / author_norm : Título y autor normalizados (auto, indexados).
+        related_stale (Boolean)  : Sus relacionados deben recalcularse
+                                   (`product/related.py`).
     """
 
     title = models.CharField(max_length=200)
@@ -56,10 +76,13 @@ class Product(models.Model):
     description = models.TextField()
     price = models.DecimalField(max_digits=8, decimal_places=2)
     stock = models.PositiveIntegerField()
+    reserved = models.PositiveIntegerField(default=0, editable=False)
+    # Sin índice propio: lo cubre `product_category_title_idx` (ver Meta)
     category = models.ForeignKey(
         Category,
         on_delete=models.SET_NULL,
         null=True,
+        db_index=False,
         help_text="Categoría temática del producto (opcional).",
     )
     image = models.ImageField(
@@ -68,9 +91,32 @@ class Product(models.Model):
         null=True,
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    title_norm = models.CharField(max_length=200, editable=False, db_index=True, default="")
+    author_norm = models.CharField(max_length=100, editable=False, db_index=True, default="")
+    related_stale = models.BooleanField(default=True, editable=False)
+
+    normalized_fields = {"title_norm": "title", "author_norm": "author"}
+    managed_fields = ("reserved", "related_stale")
 
     class Meta:
         ordering = ["title"]
+        # Orden de los listados: `title` más la PK que agrega el cursor
+        indexes = [
+            models.Index(fields=["title", "id"], name="product_title_idx"),
+            models.Index(fields=["category", "title", "id"], name="product_category_title_idx"),
+            # Novedades (feeds): los más nuevos primero
+            models.Index(fields=["-created_at", "-id"], name="product_created_idx"),
+            # Parciales: solo las filas que consultan los contadores y `related`
+            models.Index(
+                fields=["category"], condition=models.Q(stock__gt=0),
+                name="product_in_stock_idx",
+            ),
+            models.Index(
+                fields=["id"], condition=models.Q(related_stale=True),
+                name="product_related_stale_idx",
+            ),
+        ]
         verbose_name = "Product"
         verbose_name_plural = "Products"
 
@@ -81,3 +127,46 @@ class Product(models.Model):
         """Devuelve el título del producto."""
         return self.title
 
+
+class RelatedProduct(models.Model):
+    """
+    Entrada precalculada de la tira «más de este autor / esta categoría».
+
+    La escribe en bloque `product/related.py` (nunca a mano); el detalle
+    del producto la lee con una sola consulta sobre `(product, rank)`.
+
+    Campos:
+        product (ForeignKey) : Producto cuya página muestra la tira.
+        related (ForeignKey) : Producto sugerido.
+        rank (PositiveSmall) : Posición en la tira (1 = primero).
+        reason (CharField)   : Por qué se sugiere: mismo autor o categoría.
+    """
+
+    REASON_AUTHOR = "author"
+    REASON_CATEGORY = "category"
+    REASON_CHOICES = [
+        (REASON_AUTHOR, "Mismo autor"),
+        (REASON_CATEGORY, "Misma categoría"),
+    ]
+
+    # Sin índice propio: lo cubre la restricción única (product, rank)
+    product = models.ForeignKey(
+        Product, on_delete=models.CASCADE, related_name="related_links", db_index=False
+    )
+    related = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="+")
+    rank = models.PositiveSmallIntegerField()
+    reason = models.CharField(max_length=10, choices=REASON_CHOICES)
+
+    class Meta:
+        ordering = ["product", "rank"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["product", "rank"], name="product_related_rank_unique"
+            ),
+        ]
+        verbose_name = "Related product"
+        verbose_name_plural = "Related products"
+
+    def __str__(self) -> str:  # noqa: D401
+        """Devuelve «producto → relacionado»."""
+        return f"{self.product_id} → {self.related_id}"
@@ -0,0 +1,227 @@
+"""
+product/related.py
+──────────────────
+Productos relacionados precalculados («más de este autor / esta categoría»).
+
+La tira del detalle no se consulta en vivo: por cada producto se guardan
+en `RelatedProduct` hasta `RELATED_LIMIT` ids, primero del mismo autor y
+después de la misma categoría, los más nuevos primero. El detalle la lee
+con una consulta sobre el índice `(product, rank)` y un `in_bulk`.
+
+Cálculo (conjuntos, sin recorrer productos en Python)
+─────────────────────────────────────────────────────
+Un solo `INSERT … SELECT` con funciones de ventana:
+
+1. «Pozos»: los `RELATED_LIMIT + 1` productos más nuevos de cada autor
+   y de cada categoría (`ROW_NUMBER() OVER (PARTITION BY …)`).
+2. Candidatos: cada producto a recalcular contra los pozos de su autor y
+   su categoría (menos él mismo); si aparece en ambos gana «autor».
+3. Ranking por producto y se guardan los primeros `RELATED_LIMIT`.
+
+El costo es lineal en la cantidad de productos: cada uno se cruza con a
+lo sumo dos pozos acotados, nunca con su categoría entera.
+
+Recálculo incremental
+─────────────────────
+Las señales (y el importador) marcan `Product.related_stale` en los
+productos cuya tira puede cambiar: el producto nuevo o editado, los de su
+autor y categoría, y los que hoy lo muestran. `refresh()` recalcula solo
+los marcados, por bloques; `refresh(full=True)` recalcula todo de una vez.
+
+Incluye:
+- mark_stale        : marca tiras a recalcular (un UPDATE por criterio).
+- refresh           : recalcula las tiras marcadas (o todas).
+- related_products  : productos relacionados de uno, ya ordenados.
+"""
+
+from typing import Iterable, List, Optional, Tuple
+
+from django.db import connection, transaction
+from django.db.models import Q
+
+from .cache import invalidate_catalog
+from .models import Product, RelatedProduct
+
+__all__ = ["RELATED_LIMIT", "mark_stale", "refresh", "related_products"]
+
+RELATED_LIMIT = 6
+REFRESH_CHUNK = 200  # ids por bloque: se repiten 4 veces como parámetros
+
+_PRODUCT = Product._meta.db_table
+_RELATED = RelatedProduct._meta.db_table
+
+_INSERT_SQL = f"""
+INSERT INTO {_RELATED} (product_id, related_id, rank, reason)
+WITH author_pool AS (
+    SELECT id, author_norm, created_at FROM (
+        SELECT id, author_norm, created_at,
+               ROW_NUMBER() OVER (
+                   PARTITION BY author_norm ORDER BY created_at DESC, id DESC
+               ) AS pos
+          FROM {_PRODUCT}
+         WHERE {{author_scope}}
+    ) AS ranked_authors
+     WHERE pos <= %s
+),
+category_pool AS (
+    SELECT id, category_id, created_at FROM (
+        SELECT id, category_id, created_at,
+               ROW_NUMBER() OVER (
+                   PARTITION BY category_id ORDER BY created_at DESC, id DESC
+               ) AS pos
+          FROM {_PRODUCT}
+         WHERE {{category_scope}}
+    ) AS ranked_categories
+     WHERE pos <= %s
+),
+candidates AS (
+    SELECT t.id AS product_id, a.id AS related_id, 0 AS source, a.created_at
+      FROM author_pool a
+     CROSS JOIN {_PRODUCT} t
+     WHERE t.author_norm = a.author_norm AND t.id <> a.id {{target}}
+    UNION ALL
+    SELECT t.id, c.id, 1, c.created_at
+      FROM category_pool c
+     CROSS JOIN {_PRODUCT} t
+     WHERE t.category_id = c.category_id AND t.id <> c.id {{target}}
+),
+best AS (
+    SELECT product_id, related_id, MIN(source) AS source, MAX(created_at) AS created_at
+      FROM candidates
+     GROUP BY product_id, related_id
+),
+ranked AS (
+    SELECT product_id, related_id, source,
+           ROW_NUMBER() OVER (
+               PARTITION BY product_id ORDER BY source, created_at DESC, related_id DESC
+           ) AS position
+      FROM best
+)
+SELECT product_id, related_id, position,
+       CASE source WHEN 0 THEN '{RelatedProduct.REASON_AUTHOR}'
+                   ELSE '{RelatedProduct.REASON_CATEGORY}' END
+  FROM ranked
+ WHERE position <= %s
+"""
+
+
+def _insert_statement(ids: Optional[List[int]] = None) -> Tuple[str, List[object]]:
+    """
+    SQL y parámetros del `INSERT … SELECT` para `ids` (todos si es `None`).
+
+    Los pozos se arman solo con los autores y categorías de esos productos
+    y se recorren como tabla externa (`CROSS JOIN` fija ese orden en
+    SQLite), buscando a sus productos por los índices de `author_norm` /
+    `category_id`: el costo crece con lo recalculado, no con el catálogo.
+    """
+    pool = RELATED_LIMIT + 1
+    if ids is None:
+        sql = _INSERT_SQL.format(
+            author_scope="1 = 1", category_scope="category_id IS NOT NULL", target=""
+        )
+        return sql, [pool, pool, RELATED_LIMIT]
+    marks = ", ".join(["%s"] * len(ids))
+    sql = _INSERT_SQL.format(
+        author_scope=f"author_norm IN (SELECT author_norm FROM {_PRODUCT} WHERE id IN ({marks}))",
+        category_scope=f"category_id IN (SELECT category_id FROM {_PRODUCT} WHERE id IN ({marks}))",
+        target=f"AND t.id IN ({marks})",
+    )
+    return sql, [*ids, pool, *ids, pool, *ids, *ids, RELATED_LIMIT]
+
+
+# ------------------------------------------------------------------
+# Invalidación
+# ------------------------------------------------------------------
+def mark_stale(
+    product_ids: Iterable[int] = (),
+    authors: Iterable[str] = (),
+    categories: Iterable[Optional[int]] = (),
+) -> None:
+    """
+    Marca para recalcular las tiras afectadas por un cambio.
+
+    - `product_ids`: esos productos y los que hoy los muestran en su tira.
+    - `authors` (normalizados) / `categories`: todos los productos de esos
+      autores y categorías (un alta o un cambio puede entrar en sus pozos).
+    """
+    product_ids = list(product_ids)
+    authors = [author for author in set(authors) if author]
+    categories = [pk for pk in set(categories) if pk is not None]
+    stale = Product.objects.filter(related_stale=False)
+    if product_ids:
+        shown_in = RelatedProduct.objects.filter(related_id__in=product_ids)
+        stale.filter(
+            Q(pk__in=product_ids) | Q(pk__in=shown_in.values("product_id"))
+        ).update(related_stale=True)
+    if authors:
+        stale.filter(author_norm__in=authors).update(related_stale=True)
+    if categories:
+        stale.filter(category_id__in=categories).update(related_stale=True)
+
+
+# ------------------------------------------------------------------
+# Cálculo
+# ------------------------------------------------------------------
+def refresh(full: bool = False) -> int:
+    """
+    Recalcula las tiras marcadas (o todas con `full=True`).
+
+    Primero se leen los ids marcados y se desmarcan **solo esos**, antes
+    de calcular: si otro proceso vuelve a marcar uno mientras tanto (en
+    PostgreSQL espera el bloqueo de la fila), la marca sobrevive y entra
+    en la próxima corrida. Cada bloque de `REFRESH_CHUNK` ids son tres
+    sentencias. Devuelve cuántos productos se recalcularon.
+    """
+    if full:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"UPDATE {_PRODUCT} SET related_stale = %s", [False])
+            count = cursor.rowcount
+            cursor.execute(f"DELETE FROM {_RELATED}")
+            cursor.execute(*_insert_statement())
+        transaction.on_commit(invalidate_catalog)  # el detalle incluye la tira en su ETag
+        return count
+
+    ids = list(
+        Product.objects.filter(related_stale=True).order_by("pk").values_list("pk", flat=True)
+    )
+    for start in range(0, len(ids), REFRESH_CHUNK):
+        chunk = ids[start:start + REFRESH_CHUNK]
+        marks = ", ".join(["%s"] * len(chunk))
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {_PRODUCT} SET related_stale = %s WHERE id IN ({marks})",
+                [False, *chunk],
+            )
+            cursor.execute(f"DELETE FROM {_RELATED} WHERE product_id IN ({marks})", chunk)
+            cursor.execute(*_insert_statement(chunk))
+    if ids:
+        transaction.on_commit(invalidate_catalog)
+    return len(ids)
+
+
+# ------------------------------------------------------------------
+# Lectura (detalle del producto)
+# ------------------------------------------------------------------
+def related_products(product: Product) -> List[Product]:
+    """
+    Relacionados de `product` en orden, con `category` precargada.
+
+    Cada uno trae `related_reason` (`RelatedProduct.REASON_*`). Dos
+    consultas: las filas de la tira por índice y un `in_bulk`.
+    """
+    links = list(
+        RelatedProduct.objects.filter(product=product)
+        .order_by("rank")
+        .values_list("related_id", "reason")
+    )
+    if not links:
+        return []
+    found = Product.objects.select_related("category").in_bulk(
+        [pk for pk, _ in links]
+    )
+    result = []
+    for pk, reason in links:
+        if pk in found:
+            found[pk].related_reason = reason
+            result.append(found[pk])
+    return result
@@ -0,0 +1,152 @@
+"""
+product/search.py
+─────────────────
+Búsqueda de texto completo del catálogo sobre SQLite FTS5.
+
+La tabla virtual `product_product_fts` replica, por cada `Product`
+(`rowid = product.id`), su título, autor y el nombre de su categoría.
+El tokenizador `unicode61 remove_diacritics 2` ignora mayúsculas y tildes,
+de modo que «arbol» encuentra «Árbol».
+
+Incluye:
+- filter_products_fts : filtra y ordena un queryset por relevancia (BM25).
+- index_products      : (re)indexa productos puntuales.
+- unindex_products    : quita productos del índice.
+- reindex_category    : refresca el nombre de categoría de sus productos.
+- rebuild_index       : reconstruye el índice completo.
+
+Notas
+─────
+- La sincronización la hacen las señales de `product/signals.py`; las
+  operaciones masivas (que no disparan señales) deben llamar a
+  `index_products` o al comando `rebuild_product_index`.
+- `search_available` y `build_match_query` vienen de `core/fts.py`
+  (compartidas con el blog).
+- En motores distintos de SQLite (`search_available() == False`) las vistas
+  buscan por prefijo sobre las columnas normalizadas `*_norm`
+  (`core.text.prefix_q`), resuelto como rango sobre sus índices.
+"""
+
+from typing import Iterable, List
+
+from django.db import connection
+from django.db.models import QuerySet
+from django.db.models.expressions import RawSQL
+
+from core.fts import build_match_query, search_available
+
+FTS_TABLE = "product_product_fts"
+
+CREATE_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+    "USING fts5(title, author, category, "
+    "tokenize = 'unicode61 remove_diacritics 2')"
+)
+DROP_SQL = f"DROP TABLE IF EXISTS {FTS_TABLE}"
+
+# Filas a indexar: producto + nombre de categoría (LEFT JOIN por categoría nula)
+_SELECT_ROWS = """
+    SELECT p.id, p.title, p.author, COALESCE(c.name, '')
+    FROM product_product p
+    LEFT JOIN product_category c ON c.id = p.category_id
+"""
+
+# SQLite admite hasta 999 parámetros en versiones antiguas
+_CHUNK = 500
+
+def _chunks(ids: Iterable[int]) -> Iterable[List[int]]:
+    ids = list(ids)
+    for start in range(0, len(ids), _CHUNK):
+        yield ids[start:start + _CHUNK]
+
+
+# ------------------------------------------------------------------
+# Consulta
+# ------------------------------------------------------------------
+def filter_products_fts(qs: "QuerySet", query: str) -> "QuerySet":
+    """
+    Restringe `qs` a los productos que coinciden con `query`.
+
+    Anota `search_rank` (BM25: más negativo = más relevante) y ordena por
+    relevancia, con título e id como desempate estable.
+    """
+    match = build_match_query(query)
+    if not match:
+        return qs.none()
+    table = qs.model._meta.db_table
+    return (
+        qs.filter(
+            pk__in=RawSQL(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+                [match],
+            )
+        )
+        .annotate(
+            search_rank=RawSQL(
+                f"SELECT bm25({FTS_TABLE}, 10.0, 5.0, 1.0) FROM {FTS_TABLE} "
+                f'WHERE {FTS_TABLE} MATCH %s AND rowid = "{table}"."id"',
+                [match],
+            )
+        )
+        .order_by("search_rank", "title", "id")
+    )
+
+
+# ------------------------------------------------------------------
+# Mantenimiento del índice
+# ------------------------------------------------------------------
+def index_products(ids: Iterable[int]) -> None:
+    """Inserta o reemplaza en el índice los productos indicados."""
+    if not search_available():
+        return
+    with connection.cursor() as cursor:
+        for chunk in _chunks(ids):
+            marks = ", ".join(["%s"] * len(chunk))
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({marks})", chunk)
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE}(rowid, title, author, category) "
+                f"{_SELECT_ROWS} WHERE p.id IN ({marks})",
+                chunk,
+            )
+
+
+def unindex_products(ids: Iterable[int]) -> None:
+    """Elimina del índice los productos indicados."""
+    if not search_available():
+        return
+    with connection.cursor() as cursor:
+        for chunk in _chunks(ids):
+            marks = ", ".join(["%s"] * len(chunk))
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({marks})", chunk)
+
+
+def reindex_category(category_id: int, name: str = "") -> None:
+    """
+    Actualiza el nombre de categoría de todos sus productos en un solo UPDATE.
+
+    Se usa al renombrar una categoría (`name` = nombre nuevo) y antes de
+    borrarla (`name` = "" porque sus productos quedan sin categoría).
+    """
+    if not search_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {FTS_TABLE} SET category = %s WHERE rowid IN "
+            "(SELECT id FROM product_product WHERE category_id = %s)",
+            [name, category_id],
+        )
+
+
+def rebuild_index() -> int:
+    """Vacía y vuelve a poblar el índice; devuelve la cantidad de filas."""
+    if not search_available():
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(CREATE_SQL)
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}(rowid, title, author, category) {_SELECT_ROWS}"
+        )
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+        cursor.execute(f"SELECT COUNT(*) FROM {FTS_TABLE}")
+        return cursor.fetchone()[0]
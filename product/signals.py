@@ -0,0 +1,240 @@
+"""
+product/signals.py
+──────────────────
+Señales de la app Product.
+
+Ante cada alta, edición o baja de `Product` y `Category`:
+• mantienen sincronizado el índice de búsqueda FTS5 (`product/search.py`);
+• invalidan la caché del catálogo (`product/cache.py`) y las tarjetas
+  afectadas (`product/cards.py`);
+• encolan la generación de variantes de la portada y borran las de
+  portadas reemplazadas o eliminadas (`core/renditions.py`);
+• anotan el cambio para el índice de sugerencias (`product/suggest.py`);
+• mantienen los contadores por categoría (`product/counters.py`);
+• marcan las tiras de relacionados a recalcular (`product/related.py`).
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from core.renditions import discard_renditions, schedule_renditions
+
+from . import cards, counters, related, search, suggest
+from .cache import invalidate_catalog
+from .models import Category, Product
+
+
+# ── índice de búsqueda: productos ────────────────────────────────────────────
+@receiver(post_save, sender=Product)
+def index_product(sender, instance, **kwargs):
+    """Reindexa el producto guardado (título, autor o categoría pueden cambiar)."""
+    search.index_products([instance.pk])
+
+
+@receiver(post_delete, sender=Product)
+def unindex_product(sender, instance, **kwargs):
+    """Quita el producto eliminado del índice."""
+    search.unindex_products([instance.pk])
+
+
+# ── índice de búsqueda: categorías ───────────────────────────────────────────
+@receiver(post_save, sender=Category)
+def reindex_category_products(sender, instance, created, **kwargs):
+    """Propaga el nombre de la categoría a sus productos indexados."""
+    if not created:
+        search.reindex_category(instance.pk, instance.name)
+
+
+@receiver(pre_delete, sender=Category)
+def clear_category_from_index(sender, instance, **kwargs):
+    """
+    Borra el nombre de la categoría del índice antes de eliminarla.
+
+    `on_delete=SET_NULL` se aplica con un UPDATE masivo que no dispara
+    señales de `Product`, por eso se resuelve aquí.
+    """
+    search.reindex_category(instance.pk, "")
+
+
+# ── caché del catálogo ───────────────────────────────────────────────────────
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_catalog_cache(sender, **kwargs):
+    """Cualquier cambio del catálogo deja obsoletos facetas y conteos."""
+    invalidate_catalog()
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_product_card(sender, instance, **kwargs):
+    """Invalida solo la tarjeta del producto modificado."""
+    cards.invalidate_product(instance.pk)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_cards(sender, instance, **kwargs):
+    """Invalida las tarjetas de los productos de la categoría."""
+    cards.invalidate_category(instance.pk)
+
+
+# ── variantes de imagen ──────────────────────────────────────────────────────
+@receiver(post_save, sender=Product)
+def schedule_product_renditions(sender, instance, created, raw, **kwargs):
+    """Genera en background las variantes de la portada nueva o cambiada."""
+    if raw or not instance.image:
+        return
+    old = getattr(instance, "_image_old", None)
+    if not created and (old is False or old == instance.image.name):
+        return  # misma portada (o `update_fields` no la incluye)
+    pk = instance.pk
+    schedule_renditions(instance.image.name, on_ready=lambda: cards.invalidate_product(pk))
+
+
+@receiver(post_save, sender=Product)
+def discard_replaced_renditions(sender, instance, **kwargs):
+    """La portada cambió: las variantes de la anterior ya no se usan."""
+    old = getattr(instance, "_image_old", None)
+    if old and old != instance.image.name:
+        discard_renditions(old)
+
+
+@receiver(post_delete, sender=Product)
+def discard_deleted_renditions(sender, instance, **kwargs):
+    """Borra las variantes de la portada del producto eliminado."""
+    if instance.image:
+        discard_renditions(instance.image.name)
+
+
+# ── sugerencias del buscador ─────────────────────────────────────────────────
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def record_suggest_change(sender, instance, update_fields=None, **kwargs):
+    """Anota el cambio (al confirmar) para que cada proceso actualice su índice."""
+    if update_fields is not None and not {"title", "author", "name"} & set(update_fields):
+        return
+    model, pk = sender._meta.model_name, instance.pk
+    transaction.on_commit(lambda: suggest.record_change(model, pk))
+
+
+# ── contadores por categoría (y estado previo: relacionados, portada) ──────
+COUNTER_FIELDS = {"category", "category_id", "stock"}
+RELATED_FIELDS = {"author", "category", "category_id"}
+IMAGE_FIELDS = {"image"}
+
+
+@receiver(pre_save, sender=Product)
+def remember_previous_state(sender, instance, update_fields=None, **kwargs):
+    """
+    Lee en una consulta los valores previos que usan los receptores de abajo.
+
+    `_counter_old` = (categoría, stock), `_related_old` = (autor
+    normalizado, categoría) e `_image_old` = nombre de la portada; `None`
+    si el producto es nuevo y `False` si `update_fields` no toca nada que
+    los afecte.
+    """
+    fields = set(update_fields) if update_fields is not None else None
+
+    def skipped(watched):
+        return False if fields is not None and not watched & fields else None
+
+    instance._counter_old = skipped(COUNTER_FIELDS)
+    instance._related_old = skipped(RELATED_FIELDS)
+    instance._image_old = skipped(IMAGE_FIELDS)
+    if instance.pk is None or instance._state.adding:
+        return
+    if instance._counter_old is instance._related_old is instance._image_old is False:
+        return
+    row = (
+        Product.objects.filter(pk=instance.pk)
+        .values_list("category_id", "stock", "author_norm", "image")
+        .first()
+    )
+    if row is None:
+        return
+    if instance._counter_old is None:
+        instance._counter_old = (row[0], row[1])
+    if instance._related_old is None:
+        instance._related_old = (row[2], row[0])
+    if instance._image_old is None:
+        instance._image_old = row[3]
+
+
+@receiver(post_save, sender=Product)
+def update_category_counters(sender, instance, raw, update_fields=None, **kwargs):
+    """Aplica los deltas del alta o edición (o recalcula si es una carga raw)."""
+    old = getattr(instance, "_counter_old", None)
+    if old is False:
+        return
+    new = (instance.category_id, instance.stock)
+    if old and update_fields is not None:  # lo que no se guardó sigue como estaba
+        new = (
+            new[0] if {"category", "category_id"} & set(update_fields) else old[0],
+            new[1] if "stock" in update_fields else old[1],
+        )
+    if raw:  # fixtures: recalcular es idempotente
+        counters.recount({new[0], old[0] if old else None})
+        return
+    counters.apply_deltas(counters.product_delta(old, new))
+
+
+@receiver(post_delete, sender=Product)
+def decrement_category_counters(sender, instance, **kwargs):
+    """Descuenta el producto eliminado de su categoría."""
+    counters.apply_deltas(
+        counters.product_delta((instance.category_id, instance.stock), None)
+    )
+
+
+@receiver(post_save, sender=Category)
+def recount_loaded_category(sender, instance, raw, **kwargs):
+    """Una categoría cargada desde fixture trae contadores que no valen aquí."""
+    if raw:
+        counters.recount([instance.pk])
+
+
+# ── productos relacionados ───────────────────────────────────────────────────
+@receiver(post_save, sender=Product)
+def mark_related_stale(sender, instance, **kwargs):
+    """
+    Un alta o un cambio de autor/categoría altera las tiras de sus vecinos.
+
+    Solo se marcan los grupos que cambiaron (el viejo y el nuevo): editar
+    el autor no toca a la categoría, que sigue igual. Un alta marca ambos.
+    """
+    old = getattr(instance, "_related_old", None)
+    if old is False:
+        return
+    new = (instance.author_norm, instance.category_id)
+    if old == new:
+        return
+    if old is None:  # alta
+        authors, categories = [new[0]], [new[1]]
+    else:
+        authors = [old[0], new[0]] if old[0] != new[0] else []
+        categories = [old[1], new[1]] if old[1] != new[1] else []
+    related.mark_stale(
+        product_ids=[instance.pk], authors=authors, categories=categories
+    )
+
+
+@receiver(pre_delete, sender=Product)
+def mark_related_stale_before_delete(sender, instance, **kwargs):
+    """
+    Marca las tiras que muestran al producto antes de borrarlo.
+
+    Después del borrado ya no se sabe quién lo mostraba: el CASCADE elimina
+    esas filas de `RelatedProduct`.
+    """
+    related.mark_stale(product_ids=[instance.pk])
+
+
+@receiver(pre_delete, sender=Category)
+def mark_category_related_stale(sender, instance, **kwargs):
+    """Los productos de la categoría borrada pierden sus «misma categoría»."""
+    related.mark_stale(categories=[instance.pk])
@@ -0,0 +1,196 @@
+"""
+product/stock.py
+────────────────
+Servicio de stock sin pérdida de actualizaciones.
+
+Cada operación es un UPDATE condicional resuelto por la base de datos,
+sin leer el valor antes de escribirlo:
+
+    UPDATE product_product
+       SET stock = stock - n, reserved = reserved + n
+     WHERE id = ... AND stock >= n
+
+Si la condición no se cumple no se modifica ninguna fila y la operación
+falla con `InsufficientStock`. Dos pedidos concurrentes nunca pueden
+vender la misma unidad.
+
+Ciclo de una compra:
+    reserve(items) → commit(items)    (venta confirmada)
+                   → release(items)   (carrito abandonado / pago rechazado)
+
+`items` es un mapeo {id de producto: cantidad}. Un lote se aplica en una
+sola transacción y en orden de id (evita interbloqueos entre lotes que
+comparten productos): o se aplican todas las líneas o ninguna.
+
+Incluye:
+- reserve / release / commit : ciclo de reserva.
+- adjust                     : suma o resta unidades (edición de staff).
+- bulk_add / bulk_clear      : un UPDATE sobre una selección (acciones del admin).
+- InsufficientStock          : error con los ids que no alcanzaron.
+"""
+
+from typing import Dict, Iterable, List, Mapping
+
+from django.db import transaction
+from django.db.models import F, Q, QuerySet
+from django.utils import timezone
+
+from . import cards, counters
+from .cache import invalidate_catalog
+from .models import Product
+
+__all__ = [
+    "InsufficientStock", "reserve", "release", "commit", "adjust", "bulk_add", "bulk_clear",
+]
+
+
+class InsufficientStock(Exception):
+    """No hay unidades (o reservas) suficientes para alguno de los productos."""
+
+    def __init__(self, product_ids: Iterable[int]):
+        self.product_ids: List[int] = list(product_ids)
+        super().__init__(
+            "Stock insuficiente para: " + ", ".join(map(str, self.product_ids))
+        )
+
+
+def _normalize(items: Mapping[int, int]) -> Dict[int, int]:
+    """Valida cantidades positivas y ordena por id."""
+    normalized = {}
+    for pk, quantity in sorted(items.items()):
+        if not isinstance(quantity, int) or quantity <= 0:
+            raise ValueError(f"Cantidad inválida para el producto {pk}: {quantity!r}")
+        normalized[int(pk)] = quantity
+    return normalized
+
+
+def _invalidate(product_ids: Iterable[int]) -> None:
+    """Tarjetas y facetas de stock quedan obsoletas (al confirmar)."""
+    ids = list(product_ids)
+
+    def run() -> None:
+        for pk in ids:
+            cards.invalidate_product(pk)
+        invalidate_catalog()
+
+    transaction.on_commit(run)
+
+
+def _apply(items: Mapping[int, int], condition, changes, stock_sign: int = 0) -> None:
+    """
+    Aplica `changes(n)` a cada línea con `condition(n)` como guarda.
+
+    `stock_sign` indica si el stock baja (-1), sube (+1) o no cambia (0),
+    para corregir `Category.in_stock_count` cuando cruza el cero.
+
+    Las actualizaciones por queryset no disparan señales: la invalidación
+    de cachés y los contadores se resuelven aquí de forma explícita.
+    """
+    items = _normalize(items)
+    if not items:
+        return
+    now = timezone.now()
+    with transaction.atomic():
+        failed = [
+            pk
+            for pk, quantity in items.items()
+            if not Product.objects.filter(condition(quantity), pk=pk).update(
+                updated_at=now, **changes(quantity)
+            )
+        ]
+        if failed:
+            raise InsufficientStock(failed)  # revierte todo el lote
+        if stock_sign:
+            for pk, quantity in items.items():
+                counters.stock_changed(pk, stock_sign * quantity)
+        _invalidate(items)
+
+
+# ------------------------------------------------------------------
+# API pública
+# ------------------------------------------------------------------
+def reserve(items: Mapping[int, int]) -> None:
+    """Aparta unidades: pasan de `stock` a `reserved`."""
+    _apply(
+        items,
+        lambda n: Q(stock__gte=n),
+        lambda n: {"stock": F("stock") - n, "reserved": F("reserved") + n},
+        stock_sign=-1,
+    )
+
+
+def release(items: Mapping[int, int]) -> None:
+    """Devuelve al stock unidades reservadas que no se vendieron."""
+    _apply(
+        items,
+        lambda n: Q(reserved__gte=n),
+        lambda n: {"stock": F("stock") + n, "reserved": F("reserved") - n},
+        stock_sign=1,
+    )
+
+
+def commit(items: Mapping[int, int]) -> None:
+    """Confirma la venta de unidades reservadas (salen de `reserved`)."""
+    _apply(
+        items,
+        lambda n: Q(reserved__gte=n),
+        lambda n: {"reserved": F("reserved") - n},
+    )
+
+
+def adjust(product_id: int, delta: int) -> None:
+    """
+    Suma (`delta > 0`) o resta unidades al stock disponible.
+
+    Es la forma de editar el stock desde el panel: se aplica la diferencia
+    y no el valor absoluto, así no pisa reservas ni otras ediciones
+    concurrentes. Restar más de lo disponible lanza `InsufficientStock`.
+    """
+    if delta > 0:
+        _apply(
+            {product_id: delta},
+            lambda n: Q(),
+            lambda n: {"stock": F("stock") + n},
+            stock_sign=1,
+        )
+    elif delta < 0:
+        _apply(
+            {product_id: -delta},
+            lambda n: Q(stock__gte=n),
+            lambda n: {"stock": F("stock") - n},
+            stock_sign=-1,
+        )
+
+
+# ------------------------------------------------------------------
+# Operaciones sobre selecciones (admin)
+# ------------------------------------------------------------------
+def _bulk_update(queryset: "QuerySet[Product]", **changes) -> int:
+    """
+    Un solo UPDATE sobre `queryset` y recálculo de los contadores de las
+    categorías tocadas (exacto aunque haya reservas concurrentes).
+    """
+    with transaction.atomic():
+        category_ids = set(queryset.order_by().values_list("category_id", flat=True).distinct())
+        updated = queryset.update(updated_at=timezone.now(), **changes)
+        counters.recount(category_ids - {None})
+
+    def run() -> None:
+        for pk in category_ids:
+            cards.invalidate_category(pk)  # una versión por categoría, no por producto
+        invalidate_catalog()
+
+    transaction.on_commit(run)
+    return updated
+
+
+def bulk_add(queryset: "QuerySet[Product]", quantity: int) -> int:
+    """Suma `quantity` unidades a cada producto de `queryset`; devuelve cuántos."""
+    if quantity <= 0:
+        raise ValueError(f"Cantidad inválida: {quantity!r}")
+    return _bulk_update(queryset, stock=F("stock") + quantity)
+
+
+def bulk_clear(queryset: "QuerySet[Product]") -> int:
+    """Deja sin stock disponible a los productos de `queryset` (no toca reservas)."""
+    return _bulk_update(queryset.filter(stock__gt=0), stock=0)
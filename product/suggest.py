@@ -0,0 +1,206 @@
+"""
+product/suggest.py
+──────────────────
+Índice de prefijos en memoria para las sugerencias del buscador.
+
+Cada proceso mantiene una lista ordenada y sin repetidos de tuplas
+
+    (clave normalizada, texto a mostrar, tipo)
+
+con una entrada por cada palabra de títulos, autores y nombres de
+categoría («el principito» y «principito»; «saint-exupery» y «exupery»).
+Buscar un prefijo es un `bisect` más un recorrido de a lo sumo `limit`
+entradas (un autor con cien libros aparece una sola vez, con un contador
+de referencias): no toca la base.
+
+Sincronización entre procesos
+─────────────────────────────
+La etiqueta `product:suggest` (ver `core/cache.py`) se incrementa en cada
+cambio y el cambio se anota en la caché como `product:suggest:change:<v>`
+→ (modelo, id). Antes de cada consulta el proceso compara su versión con
+la compartida y:
+
+• si le faltan pocos cambios y están todos anotados, relee solo esas
+  filas y actualiza la lista en el lugar (`bisect.insort` / `del`);
+• si no (caché vaciada, demasiados cambios, `invalidate()`), reconstruye
+  el índice completo con dos consultas livianas (`values_list`).
+
+Incluye:
+- suggest        : hasta `limit` sugerencias para un prefijo.
+- record_change  : anota el alta/edición/baja de un producto o categoría.
+- invalidate     : fuerza la reconstrucción en todos los procesos.
+"""
+
+import re
+import threading
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from django.core.cache import cache
+
+from core.cache import bump_version, get_version
+from core.text import normalize_text
+
+from .models import Category, Product
+
+__all__ = ["suggest", "record_change", "invalidate"]
+
+SUGGEST_TAG = "product:suggest"
+CHANGE_PREFIX = "product:suggest:change:"
+CHANGE_TIMEOUT = 60 * 60
+MAX_INCREMENTAL = 200  # más cambios pendientes → reconstrucción completa
+
+DEFAULT_LIMIT = 8
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+# (clave normalizada, texto, tipo)
+Entry = Tuple[str, str, str]
+# (modelo, id) — modelo: "product" | "category"
+Owner = Tuple[str, int]
+
+
+def _entries_for(owner: Owner, values: Dict[str, str]) -> List[Entry]:
+    """Entradas de un objeto: una por cada palabra de cada texto."""
+    entries = []
+    for kind, text in values.items():
+        normalized = normalize_text(text)
+        for match in _WORD_RE.finditer(normalized):
+            entries.append((normalized[match.start():], text, kind))
+    return entries
+
+
+def _load(owners: Optional[List[Owner]] = None) -> Dict[Owner, List[Entry]]:
+    """
+    Entradas de la base: todas (`owners=None`) o solo las de `owners`.
+
+    Los objetos que ya no existen quedan con lista vacía.
+    """
+    wanted = {"product": None, "category": None}
+    if owners is not None:
+        wanted = {
+            model: [pk for kind, pk in owners if kind == model] for model in wanted
+        }
+    result: Dict[Owner, List[Entry]] = {owner: [] for owner in owners or []}
+
+    if wanted["product"] != []:
+        qs = Product.objects.values_list("id", "title", "author")
+        if wanted["product"] is not None:
+            qs = qs.filter(pk__in=wanted["product"])
+        for pk, title, author in qs.iterator(chunk_size=2000):
+            owner = ("product", pk)
+            result[owner] = _entries_for(owner, {"title": title, "author": author})
+    if wanted["category"] != []:
+        qs = Category.objects.values_list("id", "name")
+        if wanted["category"] is not None:
+            qs = qs.filter(pk__in=wanted["category"])
+        for pk, name in qs:
+            owner = ("category", pk)
+            result[owner] = _entries_for(owner, {"category": name})
+    return result
+
+
+class PrefixIndex:
+    """Lista ordenada de entradas con actualización incremental por dueño."""
+
+    def __init__(self) -> None:
+        self.version: Optional[int] = None
+        self._entries: List[Entry] = []
+        self._refs: Counter = Counter()  # entrada → cantidad de dueños
+        self._owned: Dict[Owner, List[Entry]] = {}
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # Sincronización
+    # ------------------------------------------------------------------
+    def rebuild(self, version: int) -> None:
+        owned = _load()
+        refs = Counter(entry for group in owned.values() for entry in group)
+        entries = sorted(refs)
+        with self._lock:
+            self._owned, self._refs, self._entries = owned, refs, entries
+            self.version = version
+
+    def apply(self, changes: Dict[Owner, List[Entry]], version: int) -> None:
+        with self._lock:
+            for owner, new_entries in changes.items():
+                for entry in self._owned.pop(owner, []):
+                    self._refs[entry] -= 1
+                    if self._refs[entry] <= 0:
+                        del self._refs[entry]
+                        index = bisect_left(self._entries, entry)
+                        if index < len(self._entries) and self._entries[index] == entry:
+                            del self._entries[index]
+                for entry in new_entries:
+                    self._refs[entry] += 1
+                    if self._refs[entry] == 1:
+                        insort(self._entries, entry)
+                if new_entries:
+                    self._owned[owner] = new_entries
+            self.version = version
+
+    def sync(self) -> None:
+        """Alinea el índice con la versión compartida (una lectura de caché)."""
+        current = get_version(SUGGEST_TAG)
+        local = self.version
+        if local == current:
+            return
+        if local is not None and 0 < current - local <= MAX_INCREMENTAL:
+            keys = [f"{CHANGE_PREFIX}{v}" for v in range(local + 1, current + 1)]
+            found = cache.get_many(keys)
+            if len(found) == len(keys):
+                owners = list(dict.fromkeys(tuple(owner) for owner in found.values()))
+                self.apply(_load(owners), current)
+                return
+        self.rebuild(current)
+
+    # ------------------------------------------------------------------
+    # Consulta
+    # ------------------------------------------------------------------
+    def lookup(self, prefix: str, limit: int) -> List[Dict[str, str]]:
+        results: List[Dict[str, str]] = []
+        seen = set()
+        with self._lock:
+            entries = self._entries
+            index = bisect_left(entries, (prefix,))
+            while index < len(entries) and len(results) < limit:
+                key, text, kind = entries[index]
+                if not key.startswith(prefix):
+                    break
+                if (kind, text) not in seen:
+                    seen.add((kind, text))
+                    results.append({"text": text, "kind": kind})
+                index += 1
+        return results
+
+
+_index = PrefixIndex()
+
+
+# ------------------------------------------------------------------
+# API pública
+# ------------------------------------------------------------------
+def suggest(query: str, limit: int = DEFAULT_LIMIT) -> List[Dict[str, str]]:
+    """Sugerencias cuyo texto (o alguna de sus palabras) empieza con `query`."""
+    prefix = normalize_text(query)
+    if not prefix:
+        return []
+    _index.sync()
+    return _index.lookup(prefix, limit)
+
+
+def record_change(model: str, pk: int) -> None:
+    """
+    Anota que el `model` ("product" o "category") `pk` cambió o se borró.
+
+    Llamar después de confirmar la transacción, para que los demás
+    procesos relean el dato ya guardado.
+    """
+    version = bump_version(SUGGEST_TAG)
+    cache.set(f"{CHANGE_PREFIX}{version}", (model, pk), CHANGE_TIMEOUT)
+
+
+def invalidate() -> None:
+    """Fuerza una reconstrucción completa (p. ej. tras una importación masiva)."""
+    bump_version(SUGGEST_TAG)
@@ -0,0 +1,142 @@
+"""
+product/templatetags/responsive_images.py
+─────────────────────────────────────────
+Etiquetas `responsive_img` (imágenes con `srcset`, dimensiones
+intrínsecas y carga diferida) y `thumbnail_img` (miniatura de tamaño fijo).
+
+Uso:
+    {% load responsive_images %}
+    {% responsive_img product.image sizes="(min-width: 992px) 25vw, 100vw" alt=product.title %}
+    {% responsive_img "tienda/img/principito.jpg" alt="El Principito" loading="eager" %}
+    {% responsive_img post.image fallback="tienda/img/no_image.jpg" alt=post.title %}
+    {% thumbnail_img product.image alt=product.title class="img-thumbnail" %}
+
+`source` puede ser un `ImageField` (archivo subido) o una ruta de
+`static`. Si está vacío se usa `fallback` (otra ruta de `static`).
+
+• ImageField → `<picture>` con un `<source>` por formato (AVIF/WebP) y un
+  `srcset` con todos los anchos de `core/renditions.py`. Las dimensiones
+  salen del manifiesto de variantes (caché). Mientras las variantes se
+  generan, sale solo el `<img>` original, con las dimensiones leídas una
+  vez de su cabecera (`get_dimensions`).
+• static     → `<img>` con `width`/`height` leídos una vez por proceso
+  (solo la cabecera del archivo, memoizado con `lru_cache`).
+
+`thumbnail_img` usa la miniatura recortada de `core/renditions.py`
+(`THUMBNAIL_SIZE`) y, hasta que exista, el original con ese tamaño.
+
+`loading` es "lazy" por defecto; usar "eager" para la imagen principal
+de la página (también agrega `fetchpriority="high"`).
+"""
+
+import struct
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from django import template
+from django.contrib.staticfiles import finders
+from django.core.files.storage import default_storage
+from django.forms.utils import flatatt
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+from PIL import Image, UnidentifiedImageError
+
+from core.renditions import (
+    AVIF_SUPPORTED,
+    THUMBNAIL_SIZE,
+    get_dimensions,
+    get_manifest,
+    rendition_formats,
+)
+
+register = template.Library()
+
+DEFAULT_SIZES = "100vw"
+
+
+@lru_cache(maxsize=256)
+def static_dimensions(path: str) -> Optional[Tuple[int, int]]:
+    """(ancho, alto) de un archivo de `static`, o `None` si no se puede leer."""
+    found = finders.find(path)
+    if not found:
+        return None
+    if not AVIF_SUPPORTED and found.lower().endswith(".avif"):
+        return _avif_dimensions(found)  # Pillow no puede abrirlo
+    try:
+        with Image.open(found) as image:  # solo lee la cabecera
+            return image.size
+    except (OSError, UnidentifiedImageError):
+        return None
+
+
+def _avif_dimensions(filename: str) -> Optional[Tuple[int, int]]:
+    """Lee la caja `ispe` de un AVIF (Pillow sin soporte AVIF no puede abrirlo)."""
+    with open(filename, "rb") as fh:
+        header = fh.read(4096)
+    index = header.find(b"ispe")
+    if index < 0 or len(header) < index + 16:
+        return None
+    return struct.unpack(">II", header[index + 8:index + 16])
+
+
+def _img(src: str, size: Optional[Tuple[int, int]], loading: str, attrs: dict) -> str:
+    final = {}
+    if size:
+        final["width"], final["height"] = size
+    final["loading"] = loading
+    final["decoding"] = "async"
+    if loading == "eager":
+        final["fetchpriority"] = "high"
+    final.update(attrs)
+    return format_html("<img src=\"{}\"{}>", src, flatatt(final))
+
+
+@register.simple_tag
+def responsive_img(
+    source,
+    sizes: str = DEFAULT_SIZES,
+    loading: str = "lazy",
+    fallback: str = "",
+    **attrs,
+):
+    """`<picture>`/`<img>` responsivo para un `ImageField` o una ruta de `static`."""
+    if not source:
+        if not fallback:
+            return ""
+        source = fallback
+
+    if isinstance(source, str):
+        return _img(static(source), static_dimensions(source), loading, attrs)
+
+    manifest = get_manifest(source.name)
+    img = _img(source.url, get_dimensions(source.name), loading, attrs)
+
+    sources = []
+    renditions = manifest.get("renditions", {})
+    for fmt in rendition_formats():
+        if renditions.get(fmt):
+            srcset = ", ".join(
+                f"{default_storage.url(path)} {width}w" for width, path in renditions[fmt]
+            )
+            sources.append((f"image/{fmt}", srcset, sizes))
+    if not sources:
+        return img
+    return format_html(
+        "<picture>{}{}</picture>",
+        format_html_join(
+            "", "<source type=\"{}\" srcset=\"{}\" sizes=\"{}\">", sources
+        ),
+        img,
+    )
+
+
+@register.simple_tag
+def thumbnail_img(source, loading: str = "lazy", **attrs):
+    """`<img>` con la miniatura de tamaño fijo de un `ImageField` (o el original)."""
+    if not source:
+        return ""
+    thumbnail = get_manifest(source.name).get("thumbnail")
+    if thumbnail:
+        width, height, path = thumbnail
+        return _img(default_storage.url(path), (width, height), loading, attrs)
+    return _img(source.url, THUMBNAIL_SIZE, loading, attrs)
@@ -1,7 +1,27 @@
-from django.test import TestCase
+import csv
+import json
+import shutil
+import tempfile
+from decimal import Decimal
+from io import BytesIO, StringIO
+from unittest import mock
+
+from PIL import Image
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.template import Context, Template
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from django.contrib.auth import get_user_model
-from .models import Product, Category
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from core.renditions import RENDITION_WIDTHS, THUMBNAIL_SIZE, manifest_name, rendition_name, thumbnail_name
+from . import related, stock, suggest
+from .cards import card_cache_stats
+from .models import Product, Category, RelatedProduct
+from .templatetags.responsive_images import static_dimensions
 
 class ProductModelTest(TestCase):
     def setUp(self):
@@ -51,3 +71,856 @@ class ProductViewTest(TestCase):
         self.client.login(username="staff", password="pass")
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
+
+    def test_csv_export_honours_search(self):
+        Product.objects.create(
+            title="Rayuela", author="Julio Cortázar", description="-", price=10, stock=1
+        )
+        response = self.client.get(reverse('product:product_export'), {"search": "arbol"})
+        self.assertTrue(response.streaming)
+        rows = list(csv.reader(
+            b"".join(response.streaming_content).decode("utf-8-sig").splitlines()
+        ))
+        self.assertEqual(rows[0][:3], ["ID", "Título", "Autor"])
+        self.assertEqual([row[1] for row in rows[1:]], ["El árbol generoso"])
+        self.assertEqual(rows[1][3], "Infantil")
+
+
+class CatalogPaginationTest(TestCase):
+    """Paginación por cursor del catálogo público."""
+
+    def setUp(self):
+        self.category = Category.objects.create(name="Aventura")
+        for i in range(14):
+            Product.objects.create(
+                title=f"Libro {i:02d}",
+                author="Autor",
+                description="-",
+                price=10,
+                stock=1,
+                category=self.category,
+            )
+
+    def test_walks_pages_without_offset_or_count(self):
+        url = reverse('product:catalog_view')
+        with CaptureQueriesContext(connection) as ctx:
+            first = self.client.get(url, {"search": "libro"})
+        page = first.context["page_obj"]
+        self.assertEqual(len(page), 12)
+        self.assertTrue(page.has_next)
+        self.assertFalse(page.has_previous)
+        self.assertIn("search=libro", page.next_query)
+
+        second = self.client.get(f"{url}?{page.next_query}")
+        titles = [p.title for p in second.context["products"]]
+        self.assertEqual(titles, ["Libro 12", "Libro 13"])
+        self.assertFalse(second.context["page_obj"].has_next)
+
+        back = self.client.get(f"{url}?{second.context['page_obj'].previous_query}")
+        self.assertEqual(back.context["products"][0].title, "Libro 00")
+        self.assertFalse(back.context["page_obj"].has_previous)
+
+        sql = " ".join(q["sql"] for q in ctx.captured_queries).upper()
+        self.assertNotIn("OFFSET", sql)
+        self.assertNotIn("COUNT(", sql)
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get(reverse('product:catalog_view'), {"cursor": "???"})
+        self.assertEqual(response.status_code, 404)
+
+
+class ProductSearchTest(TestCase):
+    """Búsqueda de texto completo (FTS5) del catálogo."""
+
+    def setUp(self):
+        self.category = Category.objects.create(name="Infantil")
+        self.tree = Product.objects.create(
+            title="El árbol generoso", author="Shel Silverstein",
+            description="-", price=10, stock=1, category=self.category,
+        )
+        self.other = Product.objects.create(
+            title="Cuentos de la selva", author="Horacio Quiroga",
+            description="-", price=10, stock=1, category=self.category,
+        )
+
+    def _search(self, query):
+        response = self.client.get(reverse('product:catalog_view'), {"search": query})
+        return [p.title for p in response.context["products"]]
+
+    def test_search_ignores_accents_and_matches_prefixes(self):
+        self.assertEqual(self._search("ARBOL gen"), ["El árbol generoso"])
+        self.assertEqual(self._search("quir"), ["Cuentos de la selva"])
+
+    def test_title_matches_rank_above_category_matches(self):
+        Product.objects.create(
+            title="Infantil ilustrado", author="Varios",
+            description="-", price=10, stock=1,
+        )
+        self.assertEqual(self._search("infantil")[0], "Infantil ilustrado")
+
+    def test_index_follows_saves_and_deletes(self):
+        self.category.name = "Clásicos"
+        self.category.save()
+        self.assertEqual(len(self._search("clasicos")), 2)
+
+        self.tree.title = "La higuera"
+        self.tree.save()
+        self.assertEqual(self._search("higuera"), ["La higuera"])
+
+        self.other.delete()
+        self.assertEqual(self._search("selva"), [])
+
+        self.category.delete()
+        self.assertEqual(self._search("clasicos"), [])
+
+
+class CatalogFacetTest(TestCase):
+    """Facetas del catálogo y sus conteos cacheados."""
+
+    def setUp(self):
+        cache.clear()
+        self.kids = Category.objects.create(name="Infantil")
+        self.comics = Category.objects.create(name="Historieta")
+        for title, price, stock, category in [
+            ("Cuentos", 15, 10, self.kids),
+            ("Fábulas", 30, 3, self.kids),
+            ("Mafalda", 35, 0, self.comics),
+        ]:
+            Product.objects.create(
+                title=title, author="Autor", description="-",
+                price=price, stock=stock, category=category,
+            )
+        self.url = reverse('product:catalog_view')
+
+    def _counts(self, response):
+        return {
+            (group.param, option.label): option.count
+            for group in response.context["facet_groups"]
+            for option in group.options
+        }
+
+    def test_filters_and_counts_respect_other_facets(self):
+        response = self.client.get(self.url, {"category": self.kids.pk})
+        self.assertEqual(
+            [p.title for p in response.context["products"]], ["Cuentos", "Fábulas"]
+        )
+        counts = self._counts(response)
+        self.assertEqual(counts[("category", "Infantil")], 2)
+        self.assertEqual(counts[("category", "Historieta")], 1)
+        self.assertEqual(counts[("stock", "Sin stock")], 0)  # filtrado por categoría
+        self.assertEqual(counts[("price", "$20 a $40")], 1)
+
+        response = self.client.get(self.url, {"stock": "ultimas"})
+        self.assertEqual([p.title for p in response.context["products"]], ["Fábulas"])
+
+    def test_counts_are_cached_until_catalog_changes(self):
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(self.url)
+        self.assertEqual(len(ctx.captured_queries), 1)  # solo la página
+
+        Product.objects.create(
+            title="Nuevo", author="Autor", description="-",
+            price=90, stock=1, category=self.comics,
+        )
+        counts = self._counts(self.client.get(self.url))
+        self.assertEqual(counts[("category", "Historieta")], 2)
+        self.assertEqual(counts[("price", "Más de $80")], 1)
+
+
+class CatalogCardCacheTest(TestCase):
+    """Caché de fragmentos de las tarjetas del catálogo."""
+
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name="Infantil")
+        self.first = Product.objects.create(
+            title="Cuentos", author="Autor", description="-",
+            price=10, stock=10, category=self.category,
+        )
+        self.second = Product.objects.create(
+            title="Fábulas", author="Autor", description="-",
+            price=10, stock=10, category=self.category,
+        )
+        self.url = reverse('product:catalog_view')
+
+    def test_edit_invalidates_only_that_card(self):
+        self.client.get(self.url)
+        self.assertEqual(card_cache_stats()["misses"], 2)
+
+        self.first.price = 99
+        self.first.save()
+        response = self.client.get(self.url)
+        self.assertContains(response, "$99")
+        stats = card_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 3))
+
+    def test_category_rename_invalidates_its_cards(self):
+        self.client.get(self.url)
+        self.category.name = "Clásicos"
+        self.category.save()
+        self.assertContains(self.client.get(self.url), "Categoría: Clásicos", count=2)
+
+    def test_stats_endpoint_is_staff_only(self):
+        url = reverse('product:card_cache_stats')
+        self.assertEqual(self.client.get(url).status_code, 302)
+        get_user_model().objects.create_user(username="staff", password="pass", is_staff=True)
+        self.client.login(username="staff", password="pass")
+        self.assertEqual(self.client.get(url).json()["hits"], 0)
+
+
+class ProductDetailConditionalGetTest(TestCase):
+    """GET condicional (ETag) en el detalle."""
+
+    def setUp(self):
+        self.product = Product.objects.create(
+            title="Cuentos", author="Autor", description="-", price=10, stock=1,
+        )
+        self.url = reverse('product:product_detail', args=[self.product.pk])
+
+    def test_revalidation_returns_304_with_one_query(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first.status_code, 200)
+        with self.assertNumQueries(1):
+            second = self.client.get(self.url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.content, b"")
+
+    def test_edit_changes_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.product.price = 20
+        self.product.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+
+@override_settings(RENDITIONS_ASYNC=False)
+class ProductRenditionTest(TestCase):
+    """Variantes WebP/AVIF de la portada y su uso en el catálogo."""
+
+    def setUp(self):
+        cache.clear()
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def _upload(self):
+        buffer = BytesIO()
+        Image.new("RGB", (1200, 1600), "navy").save(buffer, format="JPEG")
+        return SimpleUploadedFile("tapa.jpg", buffer.getvalue(), content_type="image/jpeg")
+
+    def test_renditions_are_generated_after_commit_and_used(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            product = Product.objects.create(
+                title="Cuentos", author="Autor", description="-",
+                price=10, stock=1, image=self._upload(),
+            )
+        # Antes de generar: la tarjeta usa el original, con sus dimensiones
+        response = self.client.get(reverse('product:catalog_view'))
+        self.assertNotContains(response, "<picture>")
+        self.assertContains(response, 'width="1200"')
+        self.assertContains(response, 'height="1600"')
+
+        for callback in callbacks:
+            callback()
+        name = rendition_name(product.image.name, RENDITION_WIDTHS["card"], "webp")
+        self.assertTrue(default_storage.exists(name))
+        with default_storage.open(name) as fh:
+            self.assertEqual(Image.open(fh).width, RENDITION_WIDTHS["card"])
+
+        response = self.client.get(reverse('product:catalog_view'))
+        self.assertContains(response, "<picture>")
+        self.assertContains(response, 'type="image/webp"')
+        # srcset con todos los anchos y dimensiones intrínsecas del original
+        self.assertContains(response, 'width="1200"')
+        self.assertContains(response, 'height="1600"')
+        self.assertContains(response, f'{RENDITION_WIDTHS["thumb"]}w, ')
+        self.assertContains(response, f'{RENDITION_WIDTHS["large"]}w"')
+        self.assertContains(response, 'loading="lazy"')
+
+    def test_tag_does_not_open_the_image_on_the_request_path(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            product = Product.objects.create(
+                title="Cuentos", author="Autor", description="-",
+                price=10, stock=1, image=self._upload(),
+            )
+        template = Template('{% load responsive_images %}{% responsive_img image loading="eager" %}')
+        with mock.patch.object(default_storage, "open", side_effect=AssertionError):
+            html = template.render(Context({"image": product.image}))
+        self.assertIn('width="1200"', html)
+        self.assertIn('height="1600"', html)
+        self.assertIn('fetchpriority="high"', html)
+
+    def test_fixed_size_thumbnail(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            product = Product.objects.create(
+                title="Cuentos", author="Autor", description="-",
+                price=10, stock=1, image=self._upload(),
+            )
+        with default_storage.open(thumbnail_name(product.image.name)) as fh:
+            self.assertEqual(Image.open(fh).size, THUMBNAIL_SIZE)
+        html = Template(
+            '{% load responsive_images %}{% thumbnail_img image alt="x" %}'
+        ).render(Context({"image": product.image}))
+        self.assertIn("thumb-", html)
+        self.assertIn(f'width="{THUMBNAIL_SIZE[0]}"', html)
+
+    def test_replaced_and_deleted_images_drop_their_renditions(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            product = Product.objects.create(
+                title="Cuentos", author="Autor", description="-",
+                price=10, stock=1, image=self._upload(),
+            )
+        first = product.image.name
+        with self.captureOnCommitCallbacks(execute=True):
+            product.image = self._upload()
+            product.save()
+        self.assertFalse(default_storage.exists(manifest_name(first)))
+        self.assertTrue(default_storage.exists(manifest_name(product.image.name)))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            product.delete()
+        self.assertFalse(default_storage.exists(manifest_name(product.image.name)))
+
+    def test_saves_that_keep_the_image_do_not_schedule_renditions(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            product = Product.objects.create(
+                title="Cuentos", author="Autor", description="-",
+                price=10, stock=1, image=self._upload(),
+            )
+        with mock.patch("product.signals.schedule_renditions") as schedule:
+            product.title = "Cuentos II"
+            product.save()
+            product.save(update_fields=["image"])
+            schedule.assert_not_called()
+            product.image = self._upload()
+            product.save()
+            schedule.assert_called_once()
+
+    def test_command_backfills_existing_images(self):
+        with self.captureOnCommitCallbacks(execute=False):  # subidas «antiguas»
+            product = Product.objects.create(
+                title="Cuentos", author="Autor", description="-",
+                price=10, stock=1, image=self._upload(),
+            )
+        out = StringIO()
+        call_command("generate_renditions", "--workers", "1", stdout=out)
+        self.assertIn("1 imágenes", out.getvalue())
+        self.assertTrue(default_storage.exists(manifest_name(product.image.name)))
+        self.assertContains(self.client.get(reverse('product:catalog_view')), "<picture>")
+
+
+class ResponsiveStaticImageTest(TestCase):
+    """`responsive_img` con rutas de `static`."""
+
+    def render(self, source, **context):
+        template = Template('{% load responsive_images %}{% responsive_img source fallback="tienda/img/no_image.jpg" alt="x" %}')
+        return template.render(Context({"source": source, **context}))
+
+    def test_static_path_gets_intrinsic_dimensions(self):
+        html = self.render("tienda/img/principito.jpg")
+        width, height = static_dimensions("tienda/img/principito.jpg")
+        self.assertIn(f'width="{width}"', html)
+        self.assertIn(f'height="{height}"', html)
+        self.assertIn('loading="lazy"', html)
+        self.assertNotIn("<picture>", html)
+
+    def test_avif_dimensions_without_pillow_support(self):
+        self.assertEqual(static_dimensions("tienda/img/Home_imagen.avif"), (2070, 1914))
+
+    def test_empty_source_uses_fallback(self):
+        self.assertIn("no_image.jpg", self.render(None))
+
+
+class ImportProductsCommandTest(TestCase):
+    """Comando `import_products`: upsert por bloques, rechazos e idempotencia."""
+
+    CSV = (
+        "title,author,description,price,stock,category\n"
+        "Rayuela,Julio Cortázar,Novela,25.50,3,Clásicos\n"
+        "Ficciones,Jorge Luis Borges,Cuentos,\"18,00\",0,Clásicos\n"
+        "Sin precio,Alguien,-,,4,Clásicos\n"
+        "Momo,Michael Ende,Fantasía,30,-2,Juvenil\n"
+    )
+
+    def setUp(self):
+        cache.clear()
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+
+    def write(self, name, content):
+        path = f"{self.tmp}/{name}"
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(content)
+        return path
+
+    def run_import(self, path, *args):
+        out = StringIO()
+        call_command("import_products", path, *args, stdout=out)
+        return out.getvalue()
+
+    def test_import_rejects_bad_rows_and_is_idempotent(self):
+        path = self.write("catalogo.csv", self.CSV)
+        output = self.run_import(path, "--chunk-size", "2")
+
+        self.assertIn("2 creados", output)
+        self.assertIn("2 rechazados", output)
+        self.assertIn("filas/s", output)
+        self.assertEqual(Category.objects.filter(name="Clásicos").count(), 1)
+        ficciones = Product.objects.get(title="Ficciones")
+        self.assertEqual(ficciones.price, Decimal("18.00"))
+        self.assertEqual(ficciones.author_norm, "jorge luis borges")
+
+        with open(f"{path}.rejects.csv", encoding="utf-8") as fh:
+            rejects = list(csv.DictReader(fh))
+        self.assertEqual([row["title"] for row in rejects], ["Sin precio", "Momo"])
+        self.assertTrue(all(row["error"] for row in rejects))
+
+        updated_at = ficciones.updated_at
+        output = self.run_import(path)
+        self.assertIn("0 creados, 0 actualizados, 2 sin cambios", output)
+        self.assertEqual(Product.objects.count(), 2)
+        ficciones.refresh_from_db()
+        self.assertEqual(ficciones.updated_at, updated_at)
+
+    def test_jsonl_updates_existing_products_and_search_index(self):
+        self.run_import(self.write("catalogo.csv", self.CSV))
+        path = self.write(
+            "cambios.jsonl",
+            '{"title": "Rayuela", "author": "Julio Cortázar", "price": "27", "stock": 9,'
+            ' "category": "Novela argentina"}\n'
+            "esto no es json\n",
+        )
+        output = self.run_import(path)
+        self.assertIn("0 creados, 1 actualizados", output)
+        rayuela = Product.objects.get(title="Rayuela")
+        self.assertEqual((rayuela.price, rayuela.stock), (Decimal("27"), 9))
+        self.assertEqual(rayuela.category.name, "Novela argentina")
+
+        with open(f"{path}.rejects.jsonl", encoding="utf-8") as fh:
+            self.assertEqual(json.loads(fh.readline())["line"], 2)
+        response = self.client.get(reverse('product:catalog_view'), {"search": "argentina"})
+        self.assertContains(response, "Rayuela")
+
+
+class StockServiceTest(TestCase):
+    """Reservas de stock con UPDATE condicional (`product/stock.py`)."""
+
+    def setUp(self):
+        self.a = Product.objects.create(title="A", author="X", description="-", price=1, stock=3)
+        self.b = Product.objects.create(title="B", author="X", description="-", price=1, stock=1)
+
+    def assertStock(self, product, stock_value, reserved):
+        product.refresh_from_db()
+        self.assertEqual((product.stock, product.reserved), (stock_value, reserved))
+
+    def test_reserve_release_and_commit(self):
+        stock.reserve({self.a.pk: 2})
+        self.assertStock(self.a, 1, 2)
+        stock.release({self.a.pk: 1})
+        self.assertStock(self.a, 2, 1)
+        stock.commit({self.a.pk: 1})
+        self.assertStock(self.a, 2, 0)
+        with self.assertRaises(stock.InsufficientStock):
+            stock.commit({self.a.pk: 1})
+
+    def test_batch_is_all_or_nothing(self):
+        with self.assertRaises(stock.InsufficientStock) as ctx:
+            stock.reserve({self.a.pk: 1, self.b.pk: 2})
+        self.assertEqual(ctx.exception.product_ids, [self.b.pk])
+        self.assertStock(self.a, 3, 0)
+        self.assertStock(self.b, 1, 0)
+
+    def test_reserve_is_a_single_conditional_update(self):
+        with CaptureQueriesContext(connection) as ctx:
+            stock.reserve({self.a.pk: 1})
+        sqls = [q["sql"] for q in ctx.captured_queries if not q["sql"].startswith(("SAVEPOINT", "RELEASE"))]
+        # Producto + contador de la categoría (condicional vía subconsulta)
+        self.assertTrue(all(sql.startswith("UPDATE") for sql in sqls), sqls)
+        self.assertEqual(sum(sql.startswith('UPDATE "product_product"') for sql in sqls), 1)
+
+    def test_edit_view_applies_stock_delta(self):
+        User = get_user_model()
+        User.objects.create_user(username="staff", password="pass", is_staff=True)
+        self.client.login(username="staff", password="pass")
+        url = reverse('product:product_edit', args=[self.a.pk])
+        category = Category.objects.create(name="Varios")
+        data = {
+            "title": "A", "author": "X", "description": "-", "price": "1",
+            "category": category.pk, "stock": "5", "stock_seen": "3",
+        }
+        stock.reserve({self.a.pk: 2})  # otra venta mientras el staff edita
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, 302)
+        self.assertStock(self.a, 3, 2)  # +2 sobre lo vigente, sin pisar la reserva
+
+        response = self.client.post(url, {**data, "stock": "0", "stock_seen": "5"})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "El stock cambió")
+        self.assertStock(self.a, 3, 2)
+
+
+class CatalogApiTest(TestCase):
+    """API JSON del catálogo: campos dispersos, cursor y ETag."""
+
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name="Cuentos")
+        for i in range(5):
+            Product.objects.create(
+                title=f"Libro {i}", author="Borges", description="Largo " * 50,
+                price=10 + i, stock=i, category=self.category,
+            )
+        self.url = reverse('product:catalog_api')
+
+    def test_sparse_fields_skip_description(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url, {"fields": "id,title,category"})
+        data = response.json()
+        self.assertEqual(set(data["results"][0]), {"id", "title", "category"})
+        self.assertEqual(data["results"][0]["category"], "Cuentos")
+        sql = " ".join(q["sql"] for q in ctx.captured_queries)
+        self.assertNotIn('"description"', sql)
+        self.assertNotIn('"price"', sql)
+
+    def test_cursor_pagination_and_search(self):
+        first = self.client.get(self.url, {"search": "libro", "limit": 2}).json()
+        self.assertEqual(len(first["results"]), 2)
+        self.assertIsNone(first["previous"])
+        second = self.client.get(first["next"]).json()
+        titles = [r["title"] for r in first["results"] + second["results"]]
+        self.assertEqual(len(set(titles)), 4)
+
+    def test_invalid_parameters_return_400(self):
+        self.assertEqual(self.client.get(self.url, {"fields": "password"}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"cursor": "xx"}).status_code, 400)
+
+    def test_etag_revalidation_skips_queries(self):
+        response = self.client.get(self.url)
+        etag = response["ETag"]
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        Product.objects.filter(title="Libro 0").first().save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+
+class SuggestIndexTest(TestCase):
+    """Índice de prefijos en memoria para sugerencias del buscador."""
+
+    def setUp(self):
+        cache.clear()
+        suggest._index = suggest.PrefixIndex()
+        self.category = Category.objects.create(name="Clásicos")
+        self.product = Product.objects.create(
+            title="El Principito", author="Antoine de Saint-Exupéry",
+            description="-", price=10, stock=1, category=self.category,
+        )
+
+    def texts(self, query):
+        return [s["text"] for s in suggest.suggest(query)]
+
+    def test_prefix_of_any_word_ignoring_accents(self):
+        self.assertEqual(self.texts("princ"), ["El Principito"])
+        self.assertEqual(self.texts("exup"), ["Antoine de Saint-Exupéry"])
+        self.assertEqual(self.texts("clasi"), ["Clásicos"])
+        self.assertEqual(self.texts("zzz"), [])
+
+    def test_changes_are_applied_incrementally_without_rebuild(self):
+        self.texts("x")  # construye el índice
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product.title = "Rayuela"
+            self.product.save()
+        with mock.patch.object(suggest.PrefixIndex, "rebuild") as rebuild:
+            self.assertEqual(self.texts("ray"), ["Rayuela"])
+            self.assertEqual(self.texts("princ"), [])
+        rebuild.assert_not_called()
+
+    def test_missing_change_log_triggers_rebuild(self):
+        self.texts("x")
+        Product.objects.filter(pk=self.product.pk).update(title="Momo")  # sin señales
+        suggest.invalidate()
+        self.assertEqual(self.texts("momo"), ["Momo"])
+
+    def test_endpoint(self):
+        response = self.client.get(reverse('product:catalog_suggest'), {"q": "el p"})
+        self.assertEqual(response.json()["suggestions"], [{"text": "El Principito", "kind": "title"}])
+
+
+class CategoryCountersTest(TestCase):
+    """Contadores desnormalizados de productos por categoría."""
+
+    def setUp(self):
+        cache.clear()
+        self.aventura = Category.objects.create(name="Aventura")
+        self.misterio = Category.objects.create(name="Misterio")
+
+    def assertCounters(self, category, total, in_stock):
+        category.refresh_from_db()
+        self.assertEqual((category.product_count, category.in_stock_count), (total, in_stock))
+
+    def make(self, stock_value=1, category=None):
+        return Product.objects.create(
+            title="Libro", author="Autor", description="-", price=1,
+            stock=stock_value, category=category or self.aventura,
+        )
+
+    def test_create_recategorize_and_delete(self):
+        product = self.make(stock_value=2)
+        self.make(stock_value=0)
+        self.assertCounters(self.aventura, 2, 1)
+
+        product.category = self.misterio
+        product.save()
+        self.assertCounters(self.aventura, 1, 0)
+        self.assertCounters(self.misterio, 1, 1)
+
+        product.delete()
+        self.assertCounters(self.misterio, 0, 0)
+
+    def test_stale_category_save_keeps_counters(self):
+        self.make(stock_value=1)
+        self.aventura.name = "Aventuras"  # instancia leída antes del alta
+        self.aventura.save()
+        self.assertCounters(self.aventura, 1, 1)
+
+    def test_stock_service_updates_in_stock_count_on_zero_crossing(self):
+        product = self.make(stock_value=2)
+        stock.reserve({product.pk: 1})
+        self.assertCounters(self.aventura, 1, 1)
+        stock.reserve({product.pk: 1})
+        self.assertCounters(self.aventura, 1, 0)
+        stock.release({product.pk: 2})
+        self.assertCounters(self.aventura, 1, 1)
+        stock.adjust(product.pk, -2)
+        self.assertCounters(self.aventura, 1, 0)
+
+    def test_edit_view_stock_delta_keeps_counters(self):
+        product = self.make(stock_value=0)
+        get_user_model().objects.create_user(username="staff", password="pass", is_staff=True)
+        self.client.login(username="staff", password="pass")
+        self.client.post(reverse('product:product_edit', args=[product.pk]), {
+            "title": "Libro", "author": "Autor", "description": "-", "price": "1",
+            "category": self.misterio.pk, "stock": "3", "stock_seen": "0",
+        })
+        self.assertCounters(self.aventura, 0, 0)
+        self.assertCounters(self.misterio, 1, 1)
+
+    def test_repair_command_fixes_drift(self):
+        self.make(stock_value=3)
+        Category.objects.filter(pk=self.aventura.pk).update(product_count=99, in_stock_count=0)
+        out = StringIO()
+        call_command("repair_category_counters", stdout=out)
+        self.assertIn("1 corregidas", out.getvalue())
+        self.assertCounters(self.aventura, 1, 1)
+
+    def test_navigation_shows_counters_without_group_by(self):
+        self.make()
+        self.client.get(reverse('core:home'))  # llena la caché
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('core:home'))
+        self.assertContains(response, "Aventura")
+        self.assertFalse(any("GROUP BY" in q["sql"] for q in ctx.captured_queries))
+
+
+class RelatedProductsTest(TestCase):
+    """Tiras precalculadas «más de este autor / esta categoría»."""
+
+    def setUp(self):
+        cache.clear()
+        self.aventura = Category.objects.create(name="Aventura")
+        self.misterio = Category.objects.create(name="Misterio")
+        self.verne = [self.make(f"Verne {i}", "Julio Verne") for i in range(3)]
+        self.others = [self.make(f"Otro {i}", f"Autor {i}") for i in range(3)]
+        related.refresh(full=True)
+
+    def make(self, title, author, category=None):
+        return Product.objects.create(
+            title=title, author=author, description="-", price=1, stock=1,
+            category=category or self.aventura,
+        )
+
+    def strip(self, product):
+        return list(
+            RelatedProduct.objects.filter(product=product).values_list("related_id", "reason")
+        )
+
+    def stale_ids(self):
+        return set(Product.objects.filter(related_stale=True).values_list("pk", flat=True))
+
+    def test_refresh_ranks_same_author_first(self):
+        first = self.verne[0]
+        strip = self.strip(first)
+        self.assertEqual(
+            [pk for pk, reason in strip if reason == RelatedProduct.REASON_AUTHOR],
+            [self.verne[2].pk, self.verne[1].pk],
+        )
+        self.assertEqual(len(strip), 5)  # el resto, de la categoría
+        self.assertNotIn(first.pk, [pk for pk, _ in strip])
+        self.assertFalse(self.stale_ids())
+
+    def test_author_edit_marks_only_the_affected_authors(self):
+        product = self.others[0]
+        product.author = "Julio Verne"
+        product.save()
+        # El producto, su autor viejo y nuevo y quienes lo mostraban; la
+        # categoría no cambió, pero todos lo mostraban en su tira.
+        self.assertIn(product.pk, self.stale_ids())
+        self.assertTrue({p.pk for p in self.verne} <= self.stale_ids())
+
+        Product.objects.update(related_stale=False)
+        RelatedProduct.objects.filter(related=product).delete()
+        product.author = "Otra Persona"
+        product.save()
+        self.assertEqual(self.stale_ids(), {product.pk, *(p.pk for p in self.verne)})
+
+        self.assertEqual(related.refresh(), 4)
+        self.assertFalse(self.stale_ids())
+        self.assertNotIn(
+            RelatedProduct.REASON_AUTHOR, [reason for _, reason in self.strip(product)]
+        )
+
+    def test_category_change_and_delete_mark_neighbours(self):
+        Product.objects.update(related_stale=False)
+        product = self.verne[0]
+        product.category = self.misterio
+        product.save()
+        self.assertTrue({p.pk for p in self.others} <= self.stale_ids())
+
+        Product.objects.update(related_stale=False)
+        self.others[1].delete()
+        self.assertTrue(self.stale_ids())
+        related.refresh()
+        self.assertFalse(
+            RelatedProduct.objects.filter(related_id=self.others[1].pk).exists()
+        )
+
+    def test_detail_reads_strip_with_two_queries(self):
+        product = Product.objects.select_related("category").get(pk=self.verne[0].pk)
+        with self.assertNumQueries(2):
+            products = related.related_products(product)
+        self.assertEqual(products[0].pk, self.verne[2].pk)
+
+        response = self.client.get(reverse('product:product_detail', args=[product.pk]))
+        self.assertContains(response, "Más de Julio Verne")
+        self.assertContains(response, "Más de Aventura")
+        self.assertContains(response, "Otro 2")
+
+    def test_command_refreshes_marked_products(self):
+        self.make("Nuevo", "Julio Verne")
+        out = StringIO()
+        call_command("compute_related_products", stdout=out)
+        self.assertIn("7 productos", out.getvalue())  # el nuevo + los 6 de su categoría
+        self.assertFalse(self.stale_ids())
+
+
+class ProductAdminTest(TestCase):
+    """Changelist sin N+1 ni COUNT(*) completo, y acciones masivas."""
+
+    def setUp(self):
+        cache.clear()
+        User = get_user_model()
+        User.objects.create_superuser(username="admin", password="pass", email="a@x.com")
+        self.client.login(username="admin", password="pass")
+        self.category = Category.objects.create(name="Aventura")
+        for i in range(30):
+            Product.objects.create(
+                title=f"Libro {i}", author="Autor", description="-",
+                price=Decimal("10.00"), stock=i % 2, category=self.category,
+            )
+        self.url = reverse("admin:product_product_changelist")
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        sqls = [q["sql"] for q in ctx.captured_queries]
+        self.assertLess(len(sqls), 15)
+        self.assertFalse([sql for sql in sqls if 'FROM "product_category" WHERE' in sql])
+        self.assertFalse(  # solo el conteo acotado (subconsulta con LIMIT)
+            [sql for sql in sqls if sql.startswith("SELECT COUNT(*)") and "LIMIT" not in sql]
+        )
+
+    def test_prefix_search_on_normalized_columns(self):
+        Product.objects.create(
+            title="Él Principito", author="Saint-Exupéry", description="-", price=1, stock=1,
+        )
+        response = self.client.get(self.url, {"q": "el princ"})
+        self.assertContains(response, "Él Principito")
+        self.assertNotContains(response, "Libro 1<")
+
+    def test_bulk_actions_are_single_updates_and_keep_counters(self):
+        ids = list(Product.objects.values_list("pk", flat=True))
+        data = {"action": "price_up_10", "_selected_action": ids}
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.post(self.url, data)
+        updates = [q for q in ctx.captured_queries if q["sql"].startswith('UPDATE "product_product"')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(Product.objects.filter(price=Decimal("11.00")).count(), 30)
+
+        self.client.post(self.url, {"action": "add_ten_units", "_selected_action": ids})
+        self.category.refresh_from_db()
+        self.assertEqual((self.category.product_count, self.category.in_stock_count), (30, 30))
+
+        self.client.post(self.url, {"action": "clear_stock", "_selected_action": ids[:10]})
+        self.category.refresh_from_db()
+        self.assertEqual(self.category.in_stock_count, 20)
+
+    def test_change_form_applies_stock_difference(self):
+        product = Product.objects.filter(stock=1).first()
+        url = reverse("admin:product_product_change", args=[product.pk])
+        response = self.client.get(url)
+        self.assertNotContains(response, 'name="stock"')
+        self.assertContains(response, 'name="new_stock"')
+
+        stock.reserve({product.pk: 1})  # una compra entre abrir y guardar
+        data = {
+            "title": "Otro título", "author": "Autor", "description": "-",
+            "price": "10.00", "category": self.category.pk,
+            "new_stock": "5", "stock_seen": "1",
+        }
+        self.assertEqual(self.client.post(url, data).status_code, 302)
+        product.refresh_from_db()
+        self.assertEqual((product.title, product.stock, product.reserved), ("Otro título", 4, 1))
+
+        response = self.client.post(url, {**data, "new_stock": "0", "stock_seen": "9"}, follow=True)
+        self.assertContains(response, "El stock no se modificó")
+        product.refresh_from_db()
+        self.assertEqual(product.stock, 4)
+
+
+class NewProductsFeedTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name="Novela")
+        self.old = Product.objects.create(
+            title="Viejo", author="A", description="-", price=1, stock=1, category=self.category
+        )
+        self.new = Product.objects.create(title="Nuevo", author="B", description="-", price=1, stock=1)
+        self.url = reverse("product:new_products_feed")
+
+    def test_feed_lists_newest_first_with_one_query_then_serves_cache(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response["Content-Type"], "application/rss+xml; charset=utf-8")
+        body = response.content.decode()
+        self.assertLess(body.index("Nuevo — B"), body.index("Viejo — A"))
+        self.assertIn("<category>Novela</category>", body)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url).content, response.content)
+
+    def test_conditional_get_and_invalidation(self):
+        first = self.client.get(self.url)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code, 304)
+        Product.objects.create(title="Recién llegado", author="C", description="-", price=1, stock=1)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Recién llegado")
+        atom = self.client.get(reverse("product:new_products_atom_feed"))
+        self.assertEqual(atom["Content-Type"], "application/atom+xml; charset=utf-8")
@@ -7,8 +7,12 @@ interno y la visualización pública de productos.
 Secciones
 ─────────
 • Catálogo público (`catalog_view`)
-• CRUD para personal autorizado (`product_*`)
+• CRUD y exportación CSV para personal autorizado (`product_*`)
+• Métricas de caché de tarjetas para staff (`card_cache_stats`)
 • Detalle de producto sin autenticación (`product_detail`)
+• API JSON de solo lectura del catálogo (`catalog_api`)
+• Sugerencias del buscador del catálogo (`catalog_suggest`)
+• Feeds RSS/Atom de novedades (`new_products_feed`, `new_products_atom_feed`)
 
 Notas
 ─────
@@ -18,13 +22,18 @@ Notas
 
 from django.urls import path
 
+from .feeds import NewProductsAtomFeed, NewProductsFeed
 from .views import (
     CatalogListView,
     ProductListView,
+    ProductExportView,
     ProductCreateView,
     ProductUpdateView,
     ProductDeleteView,
     ProductDetailView,
+    CardCacheStatsView,
+    CatalogApiView,
+    SuggestView,
 )
 
 app_name = "product"
@@ -32,12 +41,18 @@ app_name = "product"
 urlpatterns = [
     # Catálogo público
     path("catalogo/", CatalogListView.as_view(), name="catalog_view"),
+    path("api/", CatalogApiView.as_view(), name="catalog_api"),
+    path("sugerencias/", SuggestView.as_view(), name="catalog_suggest"),
+    path("novedades/feed/", NewProductsFeed(), name="new_products_feed"),
+    path("novedades/feed/atom/", NewProductsAtomFeed(), name="new_products_atom_feed"),
 
     # CRUD interno (requiere autenticación y permisos staff)
     path("list/", ProductListView.as_view(), name="product_list"),
+    path("export/", ProductExportView.as_view(), name="product_export"),
     path("create/", ProductCreateView.as_view(), name="product_create"),
     path("<int:pk>/edit/", ProductUpdateView.as_view(), name="product_edit"),
     path("<int:pk>/delete/", ProductDeleteView.as_view(), name="product_delete"),
+    path("cache/cards/", CardCacheStatsView.as_view(), name="card_cache_stats"),
 
     # Detalle público (accesible sin login)
     path("<int:pk>/", ProductDetailView.as_view(), name="product_detail"),
@@ -5,36 +5,51 @@ Class-Based Views (CBV) para la app **Product**.
 
 Secciones
 ─────────
-1. CRUD interno (solo personal `is_staff`)
+1. CRUD interno y exportación CSV (solo personal `is_staff`)
 2. Catálogo público sin autenticación
 3. Detalle de producto
+4. API JSON de solo lectura del catálogo
 
 Convenciones
 ────────────
 - Identificadores en inglés; docstrings y textos de interfaz en español.
 - Se reutiliza `StaffRequiredMixin` para restringir acceso interno.
-- Todos los listados incluyen búsqueda por título, autor o categoría.
+- Todos los listados incluyen búsqueda por título, autor o categoría,
+  resuelta con el índice FTS5 de `product/search.py` (ranking BM25).
+- Los listados se paginan por cursor (`KeysetPaginationMixin`): nunca se
+  emite `OFFSET` ni `COUNT(*)`.
 """
 
-from typing import Any, Dict
+import hashlib
+import json
+from typing import Any, Dict, List
 
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.messages.views import SuccessMessageMixin
-from django.db.models import Q, QuerySet
-from django.http import HttpResponseRedirect
+from django.db import transaction
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import QuerySet
+from django.http import HttpResponse, HttpResponseRedirect, JsonResponse
 from django.urls import reverse_lazy
+from django.utils.cache import get_conditional_response, patch_cache_control
 from django.views.generic import (
     ListView,
     CreateView,
     UpdateView,
     DeleteView,
     DetailView,
+    View,
 )
 
-from .models import Product
+from . import cards, facets, related, search, stock, suggest
+from .cache import CATALOG_TAG, catalog_version
+from .models import Product, RelatedProduct
 from .forms import ProductForm
-from core.view_mixins import StaffRequiredMixin
+from core.pagination import InvalidCursor, KeysetPaginationMixin, KeysetPaginator
+from core.text import normalize_text, prefix_q
+from core.view_mixins import ConditionalGetMixin, CsvExportMixin, StaffRequiredMixin
 
 # ─────────────────────────────────────────
 # Mensajes reutilizables
@@ -42,17 +57,29 @@ from core.view_mixins import StaffRequiredMixin
 MSG_CREATED = "Producto creado correctamente."
 MSG_UPDATED = "Producto actualizado correctamente."
 MSG_DELETED = "Producto eliminado correctamente."
+MSG_STOCK_CONFLICT = (
+    "El stock cambió mientras editabas (ahora hay {stock} unidades disponibles). "
+    "Revisá la cantidad y volvé a guardar."
+)
 
 # ------------------------------------------------------------------
 # Helpers
 # ------------------------------------------------------------------
 def _filter_products(qs: "QuerySet[Product]", query: str) -> "QuerySet[Product]":
-    """Aplica filtro por título, autor o categoría (case-insensitive)."""
+    """
+    Aplica filtro por título, autor o categoría.
+
+    Con SQLite usa el índice de texto completo y ordena por relevancia;
+    en otros motores busca por prefijo sobre las columnas normalizadas
+    (sin tildes ni mayúsculas), resuelto como rango sobre sus índices.
+    """
+    if query and search.search_available():
+        return search.filter_products_fts(qs, query)
     if query:
         qs = qs.filter(
-            Q(title__icontains=query)
-            | Q(author__icontains=query)
-            | Q(category__name__icontains=query)
+            prefix_q("title_norm", query)
+            | prefix_q("author_norm", query)
+            | prefix_q("category__name_norm", query)
         )
     return qs
 
@@ -60,13 +87,19 @@ def _filter_products(qs: "QuerySet[Product]", query: str) -> "QuerySet[Product]"
 # ─────────────────────────────────────────
 # 1. CRUD interno (solo staff)
 # ─────────────────────────────────────────
-class ProductListView(LoginRequiredMixin, StaffRequiredMixin, ListView):
+class ProductListView(
+    LoginRequiredMixin,
+    StaffRequiredMixin,
+    KeysetPaginationMixin,
+    ListView,
+):
     """Listado interno con buscador (solo staff)."""
 
     model = Product
     template_name = "product/product_list.html"
     context_object_name = "products"
     ordering = ["title"]
+    paginate_by = 25
 
     def get_queryset(self) -> "QuerySet[Product]":  # type: ignore[override]
         query = self.request.GET.get("search", "").strip()
@@ -79,6 +112,32 @@ class ProductListView(LoginRequiredMixin, StaffRequiredMixin, ListView):
         return ctx
 
 
+class ProductExportView(LoginRequiredMixin, StaffRequiredMixin, CsvExportMixin, View):
+    """
+    Exporta a CSV (en streaming) los productos del listado interno.
+
+    Respeta el mismo parámetro `search` que `ProductListView`.
+
+    URL:
+        /productos/export/?search=<cadena>
+    """
+
+    export_filename = "productos"
+    export_columns = [
+        ("ID", "id"),
+        ("Título", "title"),
+        ("Autor", "author"),
+        ("Categoría", "category__name"),
+        ("Precio", "price"),
+        ("Stock", "stock"),
+        ("Alta", "created_at"),
+    ]
+
+    def get_export_queryset(self) -> "QuerySet[Product]":
+        query = self.request.GET.get("search", "").strip()
+        return _filter_products(Product.objects.order_by("title", "id"), query)
+
+
 class ProductCreateView(
     LoginRequiredMixin,
     StaffRequiredMixin,
@@ -100,7 +159,14 @@ class ProductUpdateView(
     SuccessMessageMixin,
     UpdateView,
 ):
-    """Editar producto (solo staff)."""
+    """
+    Editar producto (solo staff).
+
+    El stock no se sobrescribe: se aplica la diferencia entre lo que el
+    formulario mostraba (`stock_seen`) y lo ingresado, con un UPDATE
+    condicional (`stock.adjust`). Así no se pierden reservas ni ediciones
+    concurrentes de otro miembro del staff.
+    """
 
     model = Product
     form_class = ProductForm
@@ -108,6 +174,27 @@ class ProductUpdateView(
     success_url = reverse_lazy("product:product_list")
     success_message = MSG_UPDATED
 
+    def form_valid(self, form: ProductForm) -> HttpResponseRedirect:  # type: ignore[override]
+        seen = form.cleaned_data.get("stock_seen")
+        if seen is None:
+            seen = form.initial["stock"]
+        delta = form.cleaned_data["stock"] - seen
+        try:
+            with transaction.atomic():
+                self.object = form.save(commit=False)
+                self.object.save(update_fields=[
+                    name for name in form.fields if name not in ("stock", "stock_seen")
+                ] + ["updated_at"])
+                stock.adjust(self.object.pk, delta)
+        except stock.InsufficientStock:
+            current = Product.objects.values_list("stock", flat=True).get(pk=self.object.pk)
+            form.data = form.data.copy()
+            form.data["stock_seen"] = current  # el reintento parte del valor vigente
+            form.add_error("stock", MSG_STOCK_CONFLICT.format(stock=current))
+            return self.form_invalid(form)
+        messages.success(self.request, self.get_success_message(form.cleaned_data))
+        return HttpResponseRedirect(self.get_success_url())
+
 
 class ProductDeleteView(
     LoginRequiredMixin,
@@ -133,31 +220,230 @@ class ProductDeleteView(
 # ─────────────────────────────────────────
 # 2. Catálogo público
 # ─────────────────────────────────────────
-class CatalogListView(ListView):
-    """Catálogo público con buscador."""
+class CatalogListView(KeysetPaginationMixin, ListView):
+    """
+    Catálogo público con buscador y facetas, paginado por cursor.
+
+    Facetas (GET): `category`, `price`, `stock` (ver `product/facets.py`).
+    Los conteos por faceta salen de una sola consulta agregada, cacheada
+    hasta el próximo cambio del catálogo; las tarjetas se sirven desde la
+    caché de fragmentos de `product/cards.py`.
+    """
 
     model = Product
     template_name = "product/product_catalog.html"
     context_object_name = "products"
     ordering = ["title"]
+    paginate_by = 12
 
     def get_queryset(self) -> "QuerySet[Product]":  # type: ignore[override]
         query = self.request.GET.get("search", "").strip()
-        base_qs = super().get_queryset().select_related("category")
-        return _filter_products(base_qs, query)
+        self.selected_facets = facets.parse_facets(self.request.GET)
+        self.search_queryset = _filter_products(
+            super().get_queryset().select_related("category"), query
+        )
+        return facets.apply_facets(self.search_queryset, self.selected_facets)
 
     def get_context_data(self, **kwargs: Any) -> Dict[str, Any]:  # type: ignore[override]
         ctx = super().get_context_data(**kwargs)
         ctx["search"] = self.request.GET.get("search", "").strip()
+        ctx["facet_groups"] = facets.facet_groups(
+            self.search_queryset,
+            self.selected_facets,
+            cache_key=normalize_text(ctx["search"]),
+        )
+        ctx["product_cards"] = cards.render_cards(ctx["products"])
         return ctx
 
 
+class SuggestView(View):
+    """
+    Sugerencias para el buscador del catálogo (búsqueda mientras se escribe).
+
+    Se resuelven en memoria con el índice de prefijos de
+    `product/suggest.py`, sin consultar la base por cada tecla.
+
+    URL:
+        /productos/sugerencias/?q=<prefijo>&limit=<1-20>
+    """
+
+    max_limit = 20
+
+    def get(self, request, *args: Any, **kwargs: Any) -> JsonResponse:
+        raw = request.GET.get("limit", "")
+        limit = int(raw) if raw.isdigit() and int(raw) > 0 else suggest.DEFAULT_LIMIT
+        limit = min(limit, self.max_limit)
+        response = JsonResponse(
+            {"suggestions": suggest.suggest(request.GET.get("q", ""), limit)}
+        )
+        patch_cache_control(response, public=True, max_age=30)
+        return response
+
+
+class CardCacheStatsView(LoginRequiredMixin, StaffRequiredMixin, View):
+    """Contadores de la caché de tarjetas del catálogo en JSON (solo staff)."""
+
+    def get(self, request, *args: Any, **kwargs: Any) -> JsonResponse:
+        return JsonResponse(cards.card_cache_stats())
+
+
 # ─────────────────────────────────────────
 # 3. Detalle público
 # ─────────────────────────────────────────
-class ProductDetailView(DetailView):
-    """Detalle público de producto."""
+class ProductDetailView(ConditionalGetMixin, DetailView):
+    """
+    Detalle público de producto.
+
+    Soporta GET condicional: si el navegador o el proxy ya tienen la versión
+    vigente (según `updated_at`) se responde 304 sin renderizar.
+
+    Incluye las tiras «más de este autor / esta categoría», precalculadas
+    por `product/related.py` y dibujadas con las tarjetas cacheadas. Como
+    dependen de otros productos, la ETag suma la versión del catálogo
+    (que además cubre los conteos de la barra de navegación).
+    """
 
     model = Product
     template_name = "product/product_detail.html"
     context_object_name = "product"
+    etag_version_tags = (CATALOG_TAG,)
+
+    def get_queryset(self) -> "QuerySet[Product]":  # type: ignore[override]
+        return super().get_queryset().select_related("category")
+
+    def get_context_data(self, **kwargs: Any) -> Dict[str, Any]:  # type: ignore[override]
+        ctx = super().get_context_data(**kwargs)
+        products = related.related_products(self.object)
+        strips = [
+            (f"Más de {self.object.author}", RelatedProduct.REASON_AUTHOR),
+            (f"Más de {self.object.category}", RelatedProduct.REASON_CATEGORY),
+        ]
+        ctx["related_strips"] = [
+            (title, cards.render_cards(p for p in products if p.related_reason == reason))
+            for title, reason in strips
+            if any(p.related_reason == reason for p in products)
+        ]
+        return ctx
+
+
+# ─────────────────────────────────────────
+# 4. API JSON de solo lectura
+# ─────────────────────────────────────────
+# nombre público → lookup de `values()`
+API_FIELDS: Dict[str, str] = {
+    "id": "id",
+    "title": "title",
+    "author": "author",
+    "description": "description",
+    "price": "price",
+    "stock": "stock",
+    "category": "category__name",
+    "image": "image",
+    "updated_at": "updated_at",
+}
+API_DEFAULT_FIELDS = ("id", "title", "author", "price", "stock", "category")
+API_PAGE_SIZE = 24
+API_MAX_PAGE_SIZE = 100
+
+
+class CatalogApiView(View):
+    """
+    Catálogo público en JSON, paginado por cursor.
+
+    Parámetros GET:
+        search   – mismo buscador que el catálogo HTML.
+        category / price / stock – mismas facetas (`product/facets.py`).
+        fields   – columnas a devolver, separadas por coma (por defecto
+                   `API_DEFAULT_FIELDS`; disponibles en `API_FIELDS`).
+        limit    – filas por página (1 a 100, por defecto 24).
+        cursor   – cursor opaco de `next` / `previous`.
+
+    Solo se leen las columnas pedidas (`values()`): la descripción no se
+    trae de la base salvo que se pida, y no se construyen instancias de
+    modelo. La ETag deriva de la versión del catálogo y de los parámetros,
+    así que un `If-None-Match` vigente responde 304 sin consultar la base.
+
+    URL:
+        /productos/api/?search=borges&fields=id,title,price
+    """
+
+    def get(self, request, *args: Any, **kwargs: Any) -> HttpResponse:
+        params = request.GET
+        try:
+            fields = self._parse_fields(params.get("fields", ""))
+            limit = self._parse_limit(params.get("limit", ""))
+        except ValueError as exc:
+            return JsonResponse({"error": str(exc)}, status=400)
+
+        # ETag sin tocar la base: versión del catálogo + parámetros
+        raw = f"{catalog_version()}|{sorted(params.lists())}"
+        etag = '"%s"' % hashlib.md5(raw.encode()).hexdigest()
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            try:
+                response = self._render(fields, limit)
+            except InvalidCursor:
+                return JsonResponse({"error": "Cursor de paginación inválido."}, status=400)
+        response.headers.setdefault("ETag", etag)
+        patch_cache_control(response, public=True, max_age=0, must_revalidate=True)
+        return response
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _parse_fields(raw: str) -> List[str]:
+        fields = [name.strip() for name in raw.split(",") if name.strip()]
+        unknown = [name for name in fields if name not in API_FIELDS]
+        if unknown:
+            raise ValueError(
+                f"Campos desconocidos: {', '.join(unknown)}. "
+                f"Disponibles: {', '.join(API_FIELDS)}."
+            )
+        return list(dict.fromkeys(fields)) or list(API_DEFAULT_FIELDS)
+
+    @staticmethod
+    def _parse_limit(raw: str) -> int:
+        if not raw:
+            return API_PAGE_SIZE
+        if not raw.isdigit() or not 1 <= int(raw) <= API_MAX_PAGE_SIZE:
+            raise ValueError(f"limit debe ser un entero entre 1 y {API_MAX_PAGE_SIZE}.")
+        return int(raw)
+
+    def _render(self, fields: List[str], limit: int) -> HttpResponse:
+        params = self.request.GET
+        qs = _filter_products(
+            Product.objects.order_by("title"), params.get("search", "").strip()
+        )
+        qs = facets.apply_facets(qs, facets.parse_facets(params))
+
+        # Columnas pedidas + claves de orden (el cursor las necesita)
+        keys = [name for name, _ in KeysetPaginator(qs, limit).keys]
+        lookups = list(dict.fromkeys([API_FIELDS[name] for name in fields] + keys))
+        page = KeysetPaginator(qs.values(*lookups), limit).page(params.get("cursor"))
+
+        results = []
+        for row in page.object_list:
+            item = {name: row[API_FIELDS[name]] for name in fields}
+            if item.get("image"):
+                item["image"] = default_storage.url(item["image"])
+            elif "image" in item:
+                item["image"] = None
+            results.append(item)
+
+        body = {
+            "results": results,
+            "next": self._page_url(page.next_cursor),
+            "previous": self._page_url(page.previous_cursor),
+        }
+        return HttpResponse(
+            json.dumps(body, cls=DjangoJSONEncoder, ensure_ascii=False),
+            content_type="application/json",
+        )
+
+    def _page_url(self, cursor) -> Any:
+        if not cursor:
+            return None
+        params = self.request.GET.copy()
+        params["cursor"] = cursor
+        return f"{self.request.path}?{params.urlencode()}"